@@ -0,0 +1,69 @@
+"""In-process ASGI client so benchmarks measure the app rather than the network stack"""
+
+import asyncio
+import json
+from typing import Dict, Optional, Tuple
+
+
+class AsgiClient:
+
+    def __init__(self, app):
+        self.app = app
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        json_body: Optional[dict] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        path, _, query = path.partition('?')
+        body = json.dumps(json_body).encode('utf-8') if json_body is not None else b''
+        raw_headers = [(b'host', b'benchmark'), (b'content-type', b'application/json')]
+        raw_headers += [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in (headers or {}).items()]
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': method,
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode('utf-8'),
+            'root_path': '',
+            'query_string': query.encode('utf-8'),
+            'headers': raw_headers,
+            'client': ('127.0.0.1', 50000),
+            'server': ('benchmark', 80),
+        }
+        request_sent = False
+        disconnect = asyncio.Event()
+        status = 500
+        response_headers: Dict[str, str] = {}
+        chunks = []
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+            await disconnect.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                response_headers.update(
+                    (k.decode('latin-1'), v.decode('latin-1')) for k, v in message.get('headers', [])
+                )
+            elif message['type'] == 'http.response.body':
+                chunks.append(message.get('body', b''))
+
+        try:
+            await self.app(scope, receive, send)
+        except Exception:
+            # A server would answer 500 for an unhandled error; the benchmark counts it instead of aborting
+            status = 500
+        finally:
+            disconnect.set()
+        return status, response_headers, b''.join(chunks)
@@ -0,0 +1,276 @@
+"""End-to-end load benchmark for the submission pipeline.
+
+Starts the FastAPI app in-process with the repository and consumer chosen
+through the usual environment variables, drives POST/GET load at a fixed
+concurrency and request rate, waits for every submission to reach a terminal
+status and writes a JSON report so runs can be compared.
+
+    cd backend
+    python -m benchmarks.load_benchmark --submissions 1000 --concurrency 32 --rate 500 \
+        --output results/poll.json
+    python -m benchmarks.load_benchmark --env USE_KAFKA=true --env KAFKA_BACKEND=memory --output results/kafka.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+from datetime import datetime
+from time import perf_counter
+from typing import Dict, List, Optional
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--submissions', type=int, default=500, help='number of POST requests')
+    parser.add_argument('--concurrency', type=int, default=16, help='concurrent client tasks')
+    parser.add_argument('--rate', type=float, default=0, help='target POST rate per second (0 = unthrottled)')
+    parser.add_argument('--gets-per-post', type=int, default=2, help='GET /api/submissions/{id} calls per POST')
+    parser.add_argument('--content-size', type=int, default=256, help='characters of content per submission')
+    parser.add_argument('--invalid-ratio', type=float, default=0.2, help='share of submissions that fail validation')
+    parser.add_argument('--priority-mix', default='NORMAL=1',
+                        help="relative share of each priority, e.g. 'HIGH=1,LOW=9' for a batch load")
+    parser.add_argument('--duplicate-ratio', type=float, default=0.0, help='share of submissions reusing content')
+    parser.add_argument('--database-url', default=None, help='defaults to a fresh SQLite file in a temp dir')
+    parser.add_argument('--poll-interval', type=float, default=0.1, help='POLL_INTERVAL_SECONDS for poll mode')
+    parser.add_argument('--processing-delay', type=float, default=0.0, help='POLL_PROCESSING_DELAY_SECONDS')
+    parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE', help='extra config override')
+    parser.add_argument('--timeout', type=float, default=120, help='seconds to wait for terminal statuses')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', default=None, help='write the JSON report here instead of stdout')
+    return parser.parse_args(argv)
+
+
+def configure_environment(args: argparse.Namespace) -> Dict[str, str]:
+    # processor_app.config reads the environment at import time, so this must run before the app is imported
+    overrides = {
+        'DATABASE_URL': args.database_url or (
+            f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(prefix='load-bench-'), 'submissions.db')}"
+        ),
+        'POLL_INTERVAL_SECONDS': str(args.poll_interval),
+        'POLL_PROCESSING_DELAY_SECONDS': str(args.processing_delay),
+        'LOG_LEVEL': os.environ.get('LOG_LEVEL', 'WARNING'),
+    }
+    for item in args.env:
+        key, _, value = item.partition('=')
+        overrides[key] = value
+    os.environ.update(overrides)
+    return overrides
+
+
+def percentile(values: List[float], quantile: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(quantile * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def latency_summary(seconds: List[float], duration: float) -> dict:
+    return {
+        'count': len(seconds),
+        'throughput_per_second': round(len(seconds) / duration, 2) if duration else None,
+        'p50_ms': _ms(percentile(seconds, 0.50)),
+        'p99_ms': _ms(percentile(seconds, 0.99)),
+        'max_ms': _ms(max(seconds) if seconds else None),
+    }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 3) if seconds is not None else None
+
+
+class ContentGenerator:
+
+    def __init__(self, size: int, invalid_ratio: float, duplicate_ratio: float, seed: int):
+        self.size = size
+        self.invalid_ratio = invalid_ratio
+        self.duplicate_ratio = duplicate_ratio
+        self.random = random.Random(seed)
+        self._issued: List[str] = []
+
+    def next(self, index: int) -> str:
+        if self._issued and self.random.random() < self.duplicate_ratio:
+            return self.random.choice(self._issued)
+        if self.random.random() < self.invalid_ratio:
+            content = ("no digits here " * (self.size // 15 + 1))[:max(self.size, 1)]
+        else:
+            prefix = f"submission {index} "
+            content = (prefix + "lorem ipsum 42 " * (self.size // 15 + 1))[:max(self.size, 10)]
+        self._issued.append(content)
+        return content
+
+
+async def run_benchmark(args: argparse.Namespace, overrides: Dict[str, str]) -> dict:
+    from sqlalchemy import event, select
+
+    import main
+    from benchmarks.asgi_client import AsgiClient
+    from processor_app.content_processor_service.schema import Submission, SubmissionStatus
+    from processor_app.infra.factory import Factory
+
+    app = main.app
+    client = AsgiClient(app)
+    await app.router.startup()
+
+    repository = Factory.get_repository()
+    counting = {'enabled': True, 'statements': 0}
+
+    def count_statement(*_):
+        if counting['enabled']:
+            counting['statements'] += 1
+
+    event.listen(repository.engine.sync_engine, 'before_cursor_execute', count_statement)
+
+    generator = ContentGenerator(args.content_size, args.invalid_ratio, args.duplicate_ratio, args.seed)
+    picker = random.Random(args.seed + 1)
+    priority_mix = [part.split('=') for part in args.priority_mix.split(',') if part]
+    priorities = [name.strip().upper() for name, _ in priority_mix]
+    priority_weights = [float(weight) for _, weight in priority_mix]
+    post_latencies: List[float] = []
+    get_latencies: List[float] = []
+    submission_ids: List[str] = []
+    errors = {'post': 0, 'get': 0}
+    indexes = itertools.count()
+    interval = 1.0 / args.rate if args.rate > 0 else 0.0
+
+    load_start = perf_counter()
+
+    async def client_task() -> None:
+        while True:
+            index = next(indexes)
+            if index >= args.submissions:
+                return
+            if interval:
+                delay = load_start + index * interval - perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            started = perf_counter()
+            priority = picker.choices(priorities, priority_weights)[0]
+            status, _, body = await client.request(
+                'POST', '/api/submissions/', {'content': generator.next(index), 'priority': priority}
+            )
+            post_latencies.append(perf_counter() - started)
+            if status != 200:
+                errors['post'] += 1
+                continue
+            submission_ids.append(json.loads(body)['id'])
+
+            for _ in range(args.gets_per_post):
+                started = perf_counter()
+                status, _, _ = await client.request('GET', f"/api/submissions/{picker.choice(submission_ids)}")
+                get_latencies.append(perf_counter() - started)
+                if status != 200:
+                    errors['get'] += 1
+
+    await asyncio.gather(*(client_task() for _ in range(args.concurrency)))
+    load_duration = perf_counter() - load_start
+
+    # Wait for verdicts; these lookups are harness overhead and excluded from the statement count
+    terminal = {SubmissionStatus.PASSED, SubmissionStatus.FAILED}
+    rows = {}
+    deadline = perf_counter() + args.timeout
+    while True:
+        counting['enabled'] = False
+        rows = {}
+        async with repository.get_session() as session:
+            for offset in range(0, len(submission_ids), 500):
+                chunk = submission_ids[offset:offset + 500]
+                result = await session.execute(
+                    select(
+                        Submission.id, Submission.status, Submission.created_at, Submission.processed_at,
+                        Submission.priority
+                    )
+                    .filter(Submission.id.in_(chunk))
+                )
+                rows.update({row[0]: row[1:] for row in result.all()})
+        counting['enabled'] = True
+        pending = sum(1 for status, *_ in rows.values() if status not in terminal)
+        if not pending or perf_counter() > deadline:
+            break
+        await asyncio.sleep(0.05)
+    counting['enabled'] = False
+    total_duration = perf_counter() - load_start
+
+    await app.router.shutdown()
+
+    completed = [(created, processed) for status, created, processed, _ in rows.values() if status in terminal]
+    verdict_latencies = [(processed - created).total_seconds() for created, processed in completed]
+    by_priority: Dict[str, List[float]] = {}
+    for status, created, processed, priority in rows.values():
+        if status in terminal:
+            by_priority.setdefault(priority.value, []).append((processed - created).total_seconds())
+    pipeline_span = (
+        (max(p for _, p in completed) - min(c for c, _ in completed)).total_seconds() if completed else 0
+    )
+    by_status: Dict[str, int] = {}
+    for status, *_ in rows.values():
+        by_status[status.value] = by_status.get(status.value, 0) + 1
+
+    return {
+        'timestamp': datetime.utcnow().isoformat(),
+        'python': sys.version.split()[0],
+        'config': {
+            'submissions': args.submissions,
+            'concurrency': args.concurrency,
+            'rate': args.rate,
+            'gets_per_post': args.gets_per_post,
+            'content_size': args.content_size,
+            'invalid_ratio': args.invalid_ratio,
+            'duplicate_ratio': args.duplicate_ratio,
+            'priority_mix': args.priority_mix,
+            'environment': overrides,
+        },
+        'duration_seconds': round(total_duration, 3),
+        'timed_out': len(completed) < len(submission_ids),
+        'errors': errors,
+        'statuses': by_status,
+        'http': {
+            'post': latency_summary(post_latencies, load_duration),
+            'get': latency_summary(get_latencies, load_duration),
+        },
+        'pipeline': {
+            'completed': len(completed),
+            'throughput_per_second': round(len(completed) / pipeline_span, 2) if pipeline_span else None,
+            'verdict_latency_ms': {
+                'p50': _ms(percentile(verdict_latencies, 0.50)),
+                'p99': _ms(percentile(verdict_latencies, 0.99)),
+                'max': _ms(max(verdict_latencies) if verdict_latencies else None),
+            },
+            'verdict_latency_ms_by_priority': {
+                priority: {'count': len(values), 'p50': _ms(percentile(values, 0.50)), 'p99': _ms(percentile(values, 0.99))}
+                for priority, values in sorted(by_priority.items())
+            },
+        },
+        'db': {
+            'statements': counting['statements'],
+            'statements_per_submission': (
+                round(counting['statements'] / len(submission_ids), 2) if submission_ids else None
+            ),
+        },
+        # ru_maxrss is reported in KiB on Linux
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    overrides = configure_environment(args)
+    report = asyncio.run(run_benchmark(args, overrides))
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
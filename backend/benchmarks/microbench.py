@@ -0,0 +1,470 @@
+"""Microbenchmarks for the submission hot path with stored baselines.
+
+Each benchmark is timed as `repeats` samples of `number` operations on an
+in-memory SQLite database; a sample is the mean seconds per operation.
+
+    cd backend
+    python -m benchmarks.microbench                          # print results
+    python -m benchmarks.microbench --save-baseline main     # write baselines/main.json
+    python -m benchmarks.microbench --compare main           # exit 1 on a significant slowdown
+    python -m benchmarks.microbench --filter repository. --compare main
+
+A benchmark is reported as a regression when Welch's t-test rejects "not
+slower" at --alpha and the mean slowed down by more than --threshold.
+Baselines are machine specific; compare against one recorded on the same host.
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import math
+import os
+import statistics
+import sys
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+# name -> (setup(context, total_ops) -> operation, fixed number of ops per sample or None to calibrate)
+BENCHMARKS: Dict[str, Tuple[Callable, Optional[int]]] = {}
+
+
+def benchmark(name: str, number: Optional[int] = None):
+    def register(setup):
+        BENCHMARKS[name] = (setup, number)
+        return setup
+    return register
+
+
+class BenchContext:
+    """Shared fixtures: one in-memory database seeded with a realistic mix of rows"""
+
+    SEED_ROWS = 200
+
+    async def open(self) -> None:
+        from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+        from processor_app.repositories.processor_repository import ProcessorRepository
+
+        self.database = ProcessorRepository("sqlite+aiosqlite:///:memory:")
+        await self.database.init_db()
+        self.repository = ContentProcessorRepository(self.database)
+        await self.repository.backfill_status_counters()
+        self.seed_ids = await self.create_submissions(self.SEED_ROWS)
+
+    async def create_submissions(self, count: int, size: int = 256) -> List[str]:
+        from processor_app.content_processor_service.request.content_request import ContentSubmissionRequest
+
+        ids = []
+        for index in range(count):
+            created = await self.repository.create(ContentSubmissionRequest(content=make_content(index, size)))
+            ids.append(created.id)
+        return ids
+
+    async def close(self) -> None:
+        await self.database.engine.dispose()
+
+
+def make_content(index: int, size: int) -> str:
+    return (f"submission {index} " + "lorem ipsum 42 " * (size // 15 + 1))[:max(size, 10)]
+
+
+# Validator
+
+
+def _validator_benchmark(size: int):
+    async def setup(ctx: BenchContext, total_ops: int):
+        from processor_app.validators.content_validator import ContentValidator
+        validator = ContentValidator()
+        # Digits only at the end so the regex scans the whole string
+        content = "x" * (size - 1) + "7"
+        return lambda: validator.validate(content)
+    return setup
+
+
+for _size in (64, 1024, 16384, 262144):
+    benchmark(f"validator.validate[{_size}]")(_validator_benchmark(_size))
+
+
+# Submission processing
+
+
+@benchmark("processor.process_submission", number=20)
+async def _process_submission(ctx: BenchContext, total_ops: int):
+    from processor_app.consumers.submission_processor import SubmissionProcessor
+    from processor_app.validators.content_validator import ContentValidator
+
+    processor = SubmissionProcessor(ctx.repository, ContentValidator())
+    pending = await ctx.create_submissions(total_ops)
+    contents = await ctx.repository.get_contents(pending)
+    queue = iter(pending)
+
+    async def operation():
+        submission_id = next(queue)
+        await processor.process_submission(submission_id, contents[submission_id])
+    return operation
+
+
+# Repository
+
+
+@benchmark("repository.create", number=50)
+async def _create(ctx: BenchContext, total_ops: int):
+    from processor_app.content_processor_service.request.content_request import ContentSubmissionRequest
+    request = ContentSubmissionRequest(content=make_content(0, 256))
+    return lambda: ctx.repository.create(request)
+
+
+@benchmark("repository.get_by_id")
+async def _get_by_id(ctx: BenchContext, total_ops: int):
+    submission_id = ctx.seed_ids[len(ctx.seed_ids) // 2]
+    return lambda: ctx.repository.get_by_id(submission_id)
+
+
+@benchmark("repository.update_status")
+async def _update_status(ctx: BenchContext, total_ops: int):
+    from processor_app.content_processor_service.schema import SubmissionStatus
+    submission_id = ctx.seed_ids[0]
+    return lambda: ctx.repository.update_status(submission_id, SubmissionStatus.PENDING)
+
+
+@benchmark("repository.list_all")
+async def _list_all(ctx: BenchContext, total_ops: int):
+    return ctx.repository.list_all
+
+
+@benchmark("repository.get_pending")
+async def _get_pending(ctx: BenchContext, total_ops: int):
+    return ctx.repository.get_pending
+
+
+@benchmark("repository.get_contents[50]")
+async def _get_contents(ctx: BenchContext, total_ops: int):
+    ids = ctx.seed_ids[:50]
+    return lambda: ctx.repository.get_contents(ids)
+
+
+@benchmark("repository.count_by_status")
+async def _count_by_status(ctx: BenchContext, total_ops: int):
+    return ctx.repository.count_by_status
+
+
+@benchmark("repository.status_counts")
+async def _status_counts(ctx: BenchContext, total_ops: int):
+    return ctx.repository.status_counts
+
+
+@benchmark("repository.reap_stale")
+async def _reap_stale(ctx: BenchContext, total_ops: int):
+    # Nothing is stale, so this measures the scan rather than the update
+    started_before = datetime.utcnow() - timedelta(minutes=5)
+    return lambda: ctx.repository.reap_stale(started_before)
+
+
+@benchmark("repository.get_cached_verdict")
+async def _get_cached_verdict(ctx: BenchContext, total_ops: int):
+    await ctx.repository.save_verdict("bench-digest", "1", True)
+    return lambda: ctx.repository.get_cached_verdict("bench-digest", "1")
+
+
+@benchmark("repository.save_verdict")
+async def _save_verdict(ctx: BenchContext, total_ops: int):
+    return lambda: ctx.repository.save_verdict("bench-digest", "1", True)
+
+
+# Kafka message serialization
+
+
+def _serializer_benchmark(format_name: str, size: int, direction: str):
+    async def setup(ctx: BenchContext, total_ops: int):
+        from processor_app.serializers import deserialize_message, get_serializer
+        serializer = get_serializer(format_name)
+        message = {
+            'id': ctx.seed_ids[0],
+            'digest': 'a' * 64,
+            'content': make_content(0, size),
+            'published_at': 1700000000000,
+        }
+        if direction == 'serialize':
+            return lambda: serializer.serialize(message)
+        payload = serializer.serialize(message)
+        return lambda: deserialize_message(payload)
+    return setup
+
+
+for _format in ('json', 'binary'):
+    for _size in (256, 65536):
+        for _direction in ('serialize', 'deserialize'):
+            benchmark(f"serializer.{_format}.{_direction}[{_size}]")(
+                _serializer_benchmark(_format, _size, _direction)
+            )
+
+
+# Pydantic response construction
+
+
+@benchmark("service.response.create")
+async def _create_response(ctx: BenchContext, total_ops: int):
+    from processor_app.content_processor_service.response.create_response import ContentSubmissionResponse
+    submission = await ctx.repository.get_by_id(ctx.seed_ids[0])
+    return lambda: ContentSubmissionResponse.model_validate(submission)
+
+
+@benchmark("service.response.get")
+async def _get_response(ctx: BenchContext, total_ops: int):
+    from processor_app.content_processor_service.response.trace_response import ContentSubmissionTraceResponse
+    submission = await ctx.repository.get_by_id(ctx.seed_ids[0])
+    return lambda: ContentSubmissionTraceResponse.model_validate(submission)
+
+
+@benchmark("service.response.list[200]")
+async def _list_response(ctx: BenchContext, total_ops: int):
+    from processor_app.content_processor_service.response.create_response import ContentSubmissionResponse
+    submissions = await ctx.repository.list_all()
+    return lambda: [ContentSubmissionResponse.model_validate(s) for s in submissions]
+
+
+# Direct row encoding used by the get/list endpoints
+
+
+@benchmark("service.encode.get")
+async def _get_encode(ctx: BenchContext, total_ops: int):
+    from processor_app.content_processor_service.response.json_encoding import encode_submission
+    submission = await ctx.repository.get_by_id(ctx.seed_ids[0])
+    return lambda: encode_submission(submission, include_trace=True)
+
+
+@benchmark("service.encode.list[200]")
+async def _list_encode(ctx: BenchContext, total_ops: int):
+    from processor_app.content_processor_service.response.json_encoding import encode_submissions
+    submissions = await ctx.repository.list_all()
+    return lambda: encode_submissions(submissions)
+
+
+# Runner
+
+
+async def _call(operation) -> None:
+    result = operation()
+    if inspect.isawaitable(result):
+        await result
+
+
+async def _time(operation, number: int) -> float:
+    started = perf_counter()
+    for _ in range(number):
+        await _call(operation)
+    return (perf_counter() - started) / number
+
+
+async def _calibrate(operation, min_sample_time: float) -> int:
+    number = 1
+    while True:
+        elapsed = await _time(operation, number) * number
+        if elapsed >= min_sample_time or number >= 1_000_000:
+            return number
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_sample_time / elapsed) + 1))
+
+
+async def run_benchmarks(names: List[str], repeats: int, min_sample_time: float) -> Dict[str, dict]:
+    results = {}
+    for name in names:
+        setup, fixed_number = BENCHMARKS[name]
+        # A fresh database per benchmark keeps earlier writes from skewing later reads
+        ctx = BenchContext()
+        await ctx.open()
+        try:
+            total_ops = (repeats + 1) * fixed_number if fixed_number else 0
+            operation = await setup(ctx, total_ops)
+            if fixed_number:
+                number = fixed_number
+                await _time(operation, number)  # warmup
+            else:
+                number = await _calibrate(operation, min_sample_time)
+            samples = [await _time(operation, number) for _ in range(repeats)]
+        finally:
+            await ctx.close()
+        results[name] = {
+            'number': number,
+            'mean': statistics.fmean(samples),
+            'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            'min': min(samples),
+            'samples': samples,
+        }
+    return results
+
+
+# Statistics
+
+
+def welch_t_test(baseline: List[float], current: List[float]) -> Tuple[float, float, float]:
+    """One-sided Welch's t-test for current being slower; returns (t, degrees of freedom, p-value)"""
+    n1, n2 = len(baseline), len(current)
+    m1, m2 = statistics.fmean(baseline), statistics.fmean(current)
+    v1, v2 = statistics.variance(baseline), statistics.variance(current)
+    se2 = v1 / n1 + v2 / n2
+    if se2 == 0:
+        return (math.inf if m2 > m1 else 0.0), float(n1 + n2 - 2), (0.0 if m2 > m1 else 1.0)
+    t = (m2 - m1) / math.sqrt(se2)
+    df = se2 ** 2 / ((v1 / n1) ** 2 / (n1 - 1) + (v2 / n2) ** 2 / (n2 - 1))
+    return t, df, _student_t_sf(t, df)
+
+
+def _student_t_sf(t: float, df: float) -> float:
+    # P(T > t) via the regularized incomplete beta function
+    tail = 0.5 * _betainc(df / 2, 0.5, df / (df + t * t))
+    return tail if t > 0 else 1 - tail
+
+
+def _betainc(a: float, b: float, x: float) -> float:
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    front = math.exp(
+        math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1 - x)
+    )
+    if x < (a + 1) / (a + b + 2):
+        return front * _betacf(a, b, x) / a
+    return 1 - front * _betacf(b, a, 1 - x) / b
+
+
+def _betacf(a: float, b: float, x: float, iterations: int = 200, eps: float = 1e-12) -> float:
+    # Lentz's continued fraction for the incomplete beta function
+    tiny = 1e-300
+    c, d = 1.0, 1 - (a + b) * x / (a + 1)
+    d = 1 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, iterations + 1):
+        m2 = 2 * m
+        for numerator in (
+            m * (b - m) * x / ((a + m2 - 1) * (a + m2)),
+            -(a + m) * (a + b + m) * x / ((a + m2) * (a + m2 + 1)),
+        ):
+            d = 1 + numerator * d
+            d = 1 / (d if abs(d) > tiny else tiny)
+            c = 1 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1) < eps:
+            break
+    return h
+
+
+def compare(
+    baseline: Dict[str, dict],
+    current: Dict[str, dict],
+    threshold: float,
+    alpha: float
+) -> List[dict]:
+    rows = []
+    for name, result in current.items():
+        reference = baseline.get(name)
+        if reference is None:
+            rows.append({'name': name, 'verdict': 'new', 'mean': result['mean']})
+            continue
+        ratio = result['mean'] / reference['mean'] if reference['mean'] else math.inf
+        _, _, p_value = welch_t_test(reference['samples'], result['samples'])
+        if ratio > 1 + threshold and p_value < alpha:
+            verdict = 'regressed'
+        elif ratio < 1 - threshold and 1 - p_value < alpha:
+            verdict = 'improved'
+        else:
+            verdict = 'unchanged'
+        rows.append({
+            'name': name,
+            'verdict': verdict,
+            'mean': result['mean'],
+            'baseline_mean': reference['mean'],
+            'ratio': ratio,
+            'p_value': p_value,
+        })
+    return rows
+
+
+# CLI
+
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def baseline_path(name: str) -> str:
+    return name if name.endswith('.json') else os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def load_baseline(name: str) -> Dict[str, dict]:
+    with open(baseline_path(name)) as f:
+        return json.load(f)['results']
+
+
+def save_baseline(name: str, results: Dict[str, dict]) -> str:
+    path = baseline_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({
+            'created_at': datetime.utcnow().isoformat(),
+            'python': sys.version.split()[0],
+            'results': results,
+        }, f, indent=2)
+        f.write("\n")
+    return path
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filter', default=None, help='only run benchmarks whose name contains this')
+    parser.add_argument('--repeats', type=int, default=20, help='samples per benchmark')
+    parser.add_argument('--min-sample-time', type=float, default=0.02, help='seconds per calibrated sample')
+    parser.add_argument('--save-baseline', metavar='NAME', default=None)
+    parser.add_argument('--compare', metavar='NAME', default=None, help='baseline name or path')
+    parser.add_argument('--threshold', type=float, default=0.20, help='minimum relative slowdown to flag')
+    parser.add_argument('--alpha', type=float, default=0.01, help='significance level')
+    parser.add_argument('--list', action='store_true', help='list benchmark names and exit')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    names = [name for name in BENCHMARKS if not args.filter or args.filter in name]
+    if args.list:
+        print("\n".join(names))
+        return 0
+    if args.repeats < 2:
+        raise SystemExit("--repeats must be at least 2 for the t-test")
+
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    results = asyncio.run(run_benchmarks(names, args.repeats, args.min_sample_time))
+
+    if args.compare:
+        rows = compare(load_baseline(args.compare), results, args.threshold, args.alpha)
+        for row in rows:
+            if row['verdict'] == 'new':
+                print(f"{row['name']:<48} {_format_seconds(row['mean'])}   (no baseline)")
+                continue
+            print(
+                f"{row['name']:<48} {_format_seconds(row['mean'])}  "
+                f"x{row['ratio']:5.2f}  p={row['p_value']:.4f}  {row['verdict']}"
+            )
+    else:
+        for name, result in results.items():
+            print(
+                f"{name:<48} {_format_seconds(result['mean'])} "
+                f"± {_format_seconds(result['stdev']).strip()}  (n={result['number']})"
+            )
+
+    if args.save_baseline:
+        print(f"Baseline written to {save_baseline(args.save_baseline, results)}")
+
+    if args.compare and any(row['verdict'] == 'regressed' for row in rows):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
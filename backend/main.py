@@ -1,10 +1,36 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import PlainTextResponse
 from processor_app.content_processor_service.content_processor_route import router as content_processor_router
+from processor_app.admin_service.admin_route import router as admin_router, is_admin_token
+from processor_app.admin_service.admin_service import AdminService
 from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.content_processor_service.content_processor_service import ContentProcessorService
+from processor_app.content_processor_service.response.json_encoding import FastJSONResponse
 from processor_app.infra.factory import Factory
 from processor_app.validators import ContentValidator
-from processor_app.config import LOG_LEVEL
+from processor_app.jobs.stale_reaper import StaleSubmissionReaper
+from processor_app.jobs.archiver import SubmissionArchiver
+from processor_app.jobs.revalidator import SubmissionRevalidator
+from processor_app.metrics.pipeline_metrics import SUBMISSIONS_BACKLOG, render_metrics
+from processor_app.admission import AdmissionController, BacklogMonitor, TokenBucketLimiter
+from processor_app.profiling import PROFILER, ProfilingMiddleware
+from processor_app.config import (
+    LOG_LEVEL,
+    REAPER_INTERVAL_SECONDS,
+    ARCHIVE_AFTER_DAYS,
+    RUN_CONSUMERS,
+    ADMISSION_RATE_PER_SECOND,
+    ADMISSION_BURST,
+    ADMISSION_MAX_KEYS_PER_ADDRESS,
+    ADMISSION_MAX_BACKLOG,
+    ADMISSION_BACKLOG_REFRESH_SECONDS,
+    ADMISSION_BACKLOG_RETRY_AFTER_SECONDS,
+    GZIP_MINIMUM_SIZE,
+    ADMIN_TOKEN,
+    PROFILE_REQUEST_SAMPLE_RATE
+)
 import logging
 
 # Configure logging
@@ -16,7 +42,8 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="Content Processor API",
-    description="API for submitting and tracking content processing"
+    description="API for submitting and tracking content processing",
+    default_response_class=FastJSONResponse
 )
 
 # Configure CORS
@@ -26,10 +53,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+if GZIP_MINIMUM_SIZE > 0:
+    app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+
+# Outermost, so a profile covers the other middleware too; X-Profile needs an admin token
+if ADMIN_TOKEN or PROFILE_REQUEST_SAMPLE_RATE > 0:
+    app.add_middleware(
+        ProfilingMiddleware,
+        profiler=PROFILER,
+        authorize=is_admin_token,
+        sample_rate=PROFILE_REQUEST_SAMPLE_RATE
+    )
+
 # Include routes
 app.include_router(content_processor_router)
+app.include_router(admin_router)
 
 
 @app.on_event("startup")
@@ -44,27 +85,70 @@ async def startup_event():
         repo = Factory.get_repository()
         content_repo = ContentProcessorRepository(repo)
         await repo.init_db()
+        await content_repo.backfill_status_counters()
+        await content_repo.init_search_index()
+        app.state.content_repo = content_repo
         logger.info("2. Repository initialized")
         
         # Detect if using Kafka
         
         validator = ContentValidator()
         producer = Factory.get_producer()
-        consumer = Factory.get_consumer(content_repo, validator)
         
         app.state.producer = producer
         content_repo.producer = producer
+        app.state.content_service = ContentProcessorService(content_repo)
+        # Revalidation jobs only run when started through the admin API
+        app.state.revalidator = SubmissionRevalidator(content_repo, validator)
+        app.state.admin_service = AdminService(content_repo, app.state.revalidator)
         
-        await consumer.start()
-        
-        app.state.consumer = consumer
-        
+        if RUN_CONSUMERS:
+            consumer = Factory.get_consumer(content_repo, validator)
+            await consumer.start()
+            app.state.consumer = consumer
+        else:
+            logger.info("4. Consumers disabled, processing is left to processor_app.worker")
+
+        if REAPER_INTERVAL_SECONDS > 0:
+            reaper = StaleSubmissionReaper(content_repo)
+            await reaper.start()
+            app.state.reaper = reaper
+            logger.info("5. Stale submission reaper started")
+
+        if ARCHIVE_AFTER_DAYS > 0:
+            archiver = SubmissionArchiver(content_repo)
+            await archiver.start()
+            app.state.archiver = archiver
+
+        limiter = None
+        if ADMISSION_RATE_PER_SECOND > 0:
+            limiter = TokenBucketLimiter(
+                ADMISSION_RATE_PER_SECOND, ADMISSION_BURST, max_keys_per_owner=ADMISSION_MAX_KEYS_PER_ADDRESS
+            )
+        backlog_monitor = None
+        if ADMISSION_MAX_BACKLOG > 0:
+            consumer = getattr(app.state, 'consumer', None)
+            backlog_monitor = BacklogMonitor(
+                content_repo,
+                ADMISSION_BACKLOG_REFRESH_SECONDS,
+                lag_provider=(lambda: getattr(consumer, 'lag', None)) if consumer else None
+            )
+            await backlog_monitor.start()
+        app.state.admission = AdmissionController(
+            limiter, backlog_monitor, ADMISSION_MAX_BACKLOG, ADMISSION_BACKLOG_RETRY_AFTER_SECONDS
+        )
+        if limiter or backlog_monitor:
+            logger.info("6. Admission control enabled")
+
         logger.info("=" * 60)
         logger.info("Application startup complete")
         logger.info("=" * 60)
         
     except Exception as e:
+        # Re-raised so uvicorn refuses to start instead of serving without a repository or consumers,
+        # e.g. on a database whose dialect the upserts do not support
         logger.error(f"STARTUP ERROR: {str(e)}", exc_info=True)
+        raise
 
 
 @app.on_event("shutdown")
@@ -75,7 +159,30 @@ async def shutdown_event():
         await app.state.consumer.shutdown()
         logger.info("Consumer shut down successfully")
 
+    if hasattr(app.state, 'reaper'):
+        await app.state.reaper.shutdown()
+
+    if hasattr(app.state, 'archiver'):
+        await app.state.archiver.shutdown()
+
+    if hasattr(app.state, 'revalidator'):
+        await app.state.revalidator.shutdown()
+
+    if hasattr(app.state, 'admission') and app.state.admission.backlog_monitor:
+        await app.state.admission.backlog_monitor.shutdown()
+
 
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    if hasattr(app.state, 'content_repo'):
+        try:
+            for status, count in (await app.state.content_repo.status_counts()).items():
+                SUBMISSIONS_BACKLOG.labels(status.value).set(count)
+        except Exception as e:
+            logger.error(f"Failed to refresh backlog metrics: {e}")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
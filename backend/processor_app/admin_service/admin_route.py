@@ -0,0 +1,107 @@
+import hmac
+import logging
+import os
+from processor_app.admin_service.admin_service import AdminService
+from processor_app.admin_service.response.revalidation_response import RevalidationJobResponse
+from processor_app.admin_service.response.sql_stats_response import SqlStatsResponse
+from processor_app.admin_service.response.profile_response import ProfileResponse
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.infra.factory import Factory
+from processor_app.jobs.revalidator import SubmissionRevalidator
+from processor_app.validators import ContentValidator
+from processor_app.config import ADMIN_TOKEN
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse
+logger = logging.getLogger(__name__)
+
+def is_admin_token(supplied: str) -> bool:
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(supplied.encode('utf-8'), ADMIN_TOKEN.encode('utf-8'))
+
+def require_admin(request: Request):
+    if not ADMIN_TOKEN:
+        # Without a configured token the admin API does not exist
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not is_admin_token(request.headers.get('x-admin-token', '')):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+def get_admin_service(request: Request) -> AdminService:
+    # Built once at startup so the process has a single revalidator; the fallback mirrors content_service
+    service = getattr(request.app.state, 'admin_service', None)
+    if service is None:
+        content_repo = ContentProcessorRepository(Factory.get_repository())
+        service = AdminService(content_repo, SubmissionRevalidator(content_repo, ContentValidator()))
+        request.app.state.admin_service = service
+    return service
+
+@router.post("/revalidations", response_model=RevalidationJobResponse, status_code=202)
+async def start_revalidation(admin_service: AdminService = Depends(get_admin_service)):
+    job = await admin_service.start_revalidation()
+    if job is None:
+        raise HTTPException(status_code=409, detail="A revalidation job is already running")
+    return job
+
+@router.get("/revalidations", response_model=list[RevalidationJobResponse])
+async def list_revalidations(
+    limit: int = Query(20, ge=1, le=100),
+    admin_service: AdminService = Depends(get_admin_service)
+):
+    return await admin_service.list_revalidations(limit)
+
+@router.get("/revalidations/{job_id}", response_model=RevalidationJobResponse)
+async def get_revalidation(job_id: str, admin_service: AdminService = Depends(get_admin_service)):
+    job = await admin_service.get_revalidation(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Revalidation job not found")
+    return job
+
+@router.post("/revalidations/{job_id}/pause", response_model=RevalidationJobResponse)
+async def pause_revalidation(job_id: str, admin_service: AdminService = Depends(get_admin_service)):
+    exists, job = await admin_service.pause_revalidation(job_id)
+    if not exists:
+        raise HTTPException(status_code=404, detail="Revalidation job not found")
+    if job is None:
+        raise HTTPException(status_code=409, detail="Revalidation job is not running")
+    return job
+
+@router.post("/revalidations/{job_id}/resume", response_model=RevalidationJobResponse, status_code=202)
+async def resume_revalidation(job_id: str, admin_service: AdminService = Depends(get_admin_service)):
+    exists, job = await admin_service.resume_revalidation(job_id)
+    if not exists:
+        raise HTTPException(status_code=404, detail="Revalidation job not found")
+    if job is None:
+        raise HTTPException(
+            status_code=409,
+            detail="Revalidation job cannot be resumed here: it is running, completed, "
+                   "or was started for another validator version"
+        )
+    return job
+
+@router.get("/sql/top", response_model=SqlStatsResponse)
+async def top_sql(
+    limit: int = Query(10, ge=1, le=100),
+    order_by: str = Query("total", pattern="^(total|p99|count)$"),
+    admin_service: AdminService = Depends(get_admin_service)
+):
+    return admin_service.top_sql(limit, order_by)
+
+@router.delete("/sql/stats", status_code=204)
+async def reset_sql_stats(admin_service: AdminService = Depends(get_admin_service)):
+    admin_service.reset_sql_stats()
+
+@router.get("/profiles", response_model=list[ProfileResponse])
+async def list_profiles(
+    limit: int = Query(50, ge=1, le=1000),
+    admin_service: AdminService = Depends(get_admin_service)
+):
+    return await admin_service.list_profiles(limit)
+
+@router.get("/profiles/{name}")
+async def download_profile(name: str, admin_service: AdminService = Depends(get_admin_service)):
+    path = await admin_service.get_profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    # .folded is text for flamegraph.pl/speedscope, .prof is pstats' binary format
+    media_type = "text/plain" if path.endswith('.folded') else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=os.path.basename(path))
@@ -0,0 +1,71 @@
+import logging
+import asyncio
+from typing import List, Optional, Tuple
+from processor_app.admin_service.response.revalidation_response import RevalidationJobResponse
+from processor_app.admin_service.response.sql_stats_response import SqlStatsResponse
+from processor_app.admin_service.response.profile_response import ProfileResponse
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.jobs.revalidator import SubmissionRevalidator
+from processor_app.metrics.sql_instrumentation import SQL_STATS, SqlStatementStats
+from processor_app.profiling.profiler import PROFILER, Profiler
+
+logger = logging.getLogger(__name__)
+
+
+class AdminService:
+    def __init__(
+        self,
+        repo: ContentProcessorRepository,
+        revalidator: SubmissionRevalidator,
+        sql_stats: SqlStatementStats = SQL_STATS,
+        profiler: Profiler = PROFILER
+    ) -> None:
+        self._repository = repo
+        self._revalidator = revalidator
+        self._sql_stats = sql_stats
+        self._profiler = profiler
+
+    async def start_revalidation(self) -> Optional[RevalidationJobResponse]:
+        job = await self._revalidator.start()
+        return RevalidationJobResponse.model_validate(job) if job else None
+
+    async def resume_revalidation(self, job_id: str) -> Tuple[bool, Optional[RevalidationJobResponse]]:
+        """(job exists, resumed job)"""
+        if await self._repository.get_revalidation_job(job_id) is None:
+            return False, None
+        job = await self._revalidator.resume(job_id)
+        return True, RevalidationJobResponse.model_validate(job) if job else None
+
+    async def pause_revalidation(self, job_id: str) -> Tuple[bool, Optional[RevalidationJobResponse]]:
+        """(job exists, job after pausing, None if it was not running)"""
+        if await self._repository.get_revalidation_job(job_id) is None:
+            return False, None
+        if not await self._revalidator.pause(job_id):
+            return True, None
+        return True, await self.get_revalidation(job_id)
+
+    async def get_revalidation(self, job_id: str) -> Optional[RevalidationJobResponse]:
+        job = await self._repository.get_revalidation_job(job_id)
+        return RevalidationJobResponse.model_validate(job) if job else None
+
+    async def list_revalidations(self, limit: int = 20) -> List[RevalidationJobResponse]:
+        jobs = await self._repository.list_revalidation_jobs(limit)
+        return [RevalidationJobResponse.model_validate(job) for job in jobs]
+
+    def top_sql(self, limit: int = 10, order_by: str = "total") -> SqlStatsResponse:
+        return SqlStatsResponse(
+            order_by=order_by,
+            slow_query_ms=self._sql_stats.slow_query_ms,
+            statements=self._sql_stats.top(limit, order_by),
+            pool=self._sql_stats.pool()
+        )
+
+    def reset_sql_stats(self) -> None:
+        self._sql_stats.reset()
+
+    async def list_profiles(self, limit: int = 50) -> List[ProfileResponse]:
+        profiles = await asyncio.to_thread(self._profiler.store.list, limit)
+        return [ProfileResponse.model_validate(profile) for profile in profiles]
+
+    async def get_profile_path(self, name: str) -> Optional[str]:
+        return await asyncio.to_thread(self._profiler.store.path, name)
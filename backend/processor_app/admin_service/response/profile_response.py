@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class ProfileResponse(BaseModel):
+    name: str
+    kind: str
+    label: str
+    mode: str
+    duration_ms: float
+    samples: Optional[int] = None
+    size_bytes: int
+    created_at: datetime
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class RevalidationJobResponse(BaseModel):
+    id: str
+    validator_version: str
+    status: str
+    holder: Optional[str] = None
+    last_id: str
+    scanned: int
+    changed: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import List
+
+class SqlStatementResponse(BaseModel):
+    fingerprint: str
+    count: int
+    total_ms: float
+    mean_ms: float
+    p50_ms: float
+    p99_ms: float
+    max_ms: float
+
+class SqlPoolResponse(BaseModel):
+    checkouts: int
+    wait_p50_ms: float
+    wait_p99_ms: float
+    connections_in_use: int
+
+class SqlStatsResponse(BaseModel):
+    order_by: str
+    slow_query_ms: float
+    statements: List[SqlStatementResponse]
+    pool: SqlPoolResponse
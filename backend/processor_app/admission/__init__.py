@@ -0,0 +1,7 @@
+"""Admission control for the submission endpoint"""
+
+from processor_app.admission.token_bucket import TokenBucket, TokenBucketLimiter
+from processor_app.admission.backlog_monitor import BacklogMonitor
+from processor_app.admission.admission_controller import AdmissionController
+
+__all__ = ["TokenBucket", "TokenBucketLimiter", "BacklogMonitor", "AdmissionController"]
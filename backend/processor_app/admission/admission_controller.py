@@ -0,0 +1,35 @@
+import logging
+from typing import Hashable, Optional, Tuple
+
+from processor_app.admission.backlog_monitor import BacklogMonitor
+from processor_app.admission.token_bucket import TokenBucketLimiter
+from processor_app.metrics.pipeline_metrics import ADMISSION_REJECTED
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionController:
+
+    def __init__(
+        self,
+        limiter: Optional[TokenBucketLimiter] = None,
+        backlog_monitor: Optional[BacklogMonitor] = None,
+        max_backlog: int = 0,
+        backlog_retry_after: int = 5
+    ):
+        self.limiter = limiter
+        self.backlog_monitor = backlog_monitor
+        self.max_backlog = max_backlog
+        self.backlog_retry_after = backlog_retry_after
+
+    def check(self, client_key: Hashable, owner: Optional[Hashable] = None) -> Optional[Tuple[str, int]]:
+        """Returns None to admit, otherwise (reason, retry_after_seconds); only reads in-memory state"""
+        if self.backlog_monitor and self.max_backlog and self.backlog_monitor.backlog >= self.max_backlog:
+            ADMISSION_REJECTED.labels("backlog").inc()
+            return "backlog", self.backlog_retry_after
+        if self.limiter:
+            retry_after = self.limiter.acquire(client_key, owner)
+            if retry_after is not None:
+                ADMISSION_REJECTED.labels("rate_limit").inc()
+                return "rate_limit", retry_after
+        return None
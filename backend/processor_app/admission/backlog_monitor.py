@@ -0,0 +1,60 @@
+import asyncio
+import logging
+from typing import Callable, Optional
+
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.content_processor_service.schema import SubmissionStatus
+
+logger = logging.getLogger(__name__)
+
+
+class BacklogMonitor:
+    # Refreshes the backlog in the background so admission checks never touch the database
+
+    def __init__(
+        self,
+        repository: ContentProcessorRepository,
+        refresh_seconds: float = 2,
+        lag_provider: Optional[Callable[[], Optional[int]]] = None
+    ):
+        self.repository = repository
+        self.refresh_seconds = refresh_seconds
+        self.lag_provider = lag_provider
+        self.pending = 0
+        self.lag = 0
+        self.running = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def backlog(self) -> int:
+        # In Kafka mode unconsumed records are also PENDING rows, so take the larger signal instead of the sum
+        return max(self.pending, self.lag)
+
+    async def start(self) -> None:
+        self.running = True
+        await self.refresh()
+        self._task = asyncio.create_task(self._run())
+
+    async def shutdown(self) -> None:
+        self.running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def refresh(self) -> None:
+        try:
+            counts = await self.repository.status_counts()
+            self.pending = counts[SubmissionStatus.PENDING] + counts[SubmissionStatus.PROCESSING]
+        except Exception as e:
+            # Keep the last known value; admission should not flap on a transient DB error
+            logger.error(f"Failed to refresh backlog: {e}")
+        if self.lag_provider:
+            self.lag = self.lag_provider() or 0
+
+    async def _run(self) -> None:
+        while self.running:
+            await asyncio.sleep(self.refresh_seconds)
+            await self.refresh()
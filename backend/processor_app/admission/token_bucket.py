@@ -0,0 +1,76 @@
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Set
+
+
+class TokenBucket:
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated_at')
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = now
+
+    def take(self, now: float) -> float:
+        """Consume one token; returns 0 when admitted, otherwise seconds until a token is available"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class TokenBucketLimiter:
+    # One bucket per client key; least recently seen clients are forgotten past max_clients.
+    # A key used from an owner (the client address) counts against that owner's max_keys_per_owner,
+    # so one address cannot fill the table with fresh keys and push everyone else out
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        max_clients: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+        max_keys_per_owner: int = 4
+    ):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.max_clients = max_clients
+        self.max_keys_per_owner = max_keys_per_owner
+        self._clock = clock
+        self._buckets: "OrderedDict[Hashable, TokenBucket]" = OrderedDict()
+        self._owner_of: Dict[Hashable, Hashable] = {}
+        self._owned: Dict[Hashable, Set[Hashable]] = {}
+
+    def acquire(self, key: Hashable, owner: Optional[Hashable] = None) -> Optional[int]:
+        """Returns None when admitted, otherwise a Retry-After in whole seconds"""
+        now = self._clock()
+        bucket = self._buckets.get(key)
+        if bucket is None and owner is not None and key != owner:
+            if len(self._owned.get(owner, ())) >= self.max_keys_per_owner:
+                # The owner already holds its share of key buckets; charge its own bucket instead
+                key = owner
+                bucket = self._buckets.get(key)
+            else:
+                self._owner_of[key] = owner
+                self._owned.setdefault(owner, set()).add(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst, now)
+            if len(self._buckets) > self.max_clients:
+                self._forget(self._buckets.popitem(last=False)[0])
+        else:
+            self._buckets.move_to_end(key)
+        wait = bucket.take(now)
+        return None if wait == 0 else max(1, math.ceil(wait))
+
+    def _forget(self, key: Hashable) -> None:
+        owner = self._owner_of.pop(key, None)
+        if owner is not None:
+            owned = self._owned[owner]
+            owned.discard(key)
+            if not owned:
+                del self._owned[owner]
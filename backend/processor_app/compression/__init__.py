@@ -0,0 +1,7 @@
+"""Content compression codecs"""
+
+from processor_app.compression.content_codec import get_codec, pack_content, unpack_content
+from processor_app.compression.lzma_codec import LzmaCodec
+from processor_app.compression.zlib_codec import ZlibCodec
+
+__all__ = ["get_codec", "pack_content", "unpack_content", "LzmaCodec", "ZlibCodec"]
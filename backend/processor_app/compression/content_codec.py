@@ -0,0 +1,41 @@
+"""Content compression helpers shared by DB storage and Kafka payloads"""
+
+from typing import Dict, Optional, Tuple, Union
+
+from processor_app.interfaces.codec import ICodec
+from processor_app.compression.zlib_codec import ZlibCodec
+from processor_app.compression.lzma_codec import LzmaCodec
+
+_CODECS: Dict[str, ICodec] = {codec.name: codec for codec in (ZlibCodec(), LzmaCodec())}
+
+
+def get_codec(name: str) -> ICodec:
+    try:
+        return _CODECS[name]
+    except KeyError:
+        raise ValueError(f"Unknown compression codec '{name}'. Available: {sorted(_CODECS)}")
+
+
+def pack_content(
+    content: str,
+    codec_name: Optional[str],
+    threshold: int
+) -> Tuple[Optional[str], Union[str, bytes]]:
+    # Returns (codec, compressed bytes) or (None, content) when compression does not pay off
+    if not codec_name:
+        return None, content
+    encoded = content.encode('utf-8')
+    if len(encoded) < threshold:
+        return None, content
+    compressed = get_codec(codec_name).compress(encoded)
+    if len(compressed) >= len(encoded):
+        return None, content
+    return codec_name, compressed
+
+
+def unpack_content(codec_name: Optional[str], data: Union[str, bytes, memoryview]) -> str:
+    if isinstance(data, str):
+        return data
+    if not codec_name:
+        return str(data, 'utf-8')
+    return get_codec(codec_name).decompress(data).decode('utf-8')
@@ -0,0 +1,16 @@
+import zlib
+
+from processor_app.interfaces.codec import ICodec
+
+
+class ZlibCodec(ICodec):
+    name = "zlib"
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from typing import List
 
 USE_KAFKA = os.getenv('USE_KAFKA', '').lower() in ('true', '1', 'yes')
@@ -9,12 +10,159 @@ KAFKA_BOOTSTRAP_SERVERS: List[str] = os.getenv(
 ).split(',')
 
 KAFKA_TOPIC = os.getenv('KAFKA_TOPIC', 'submissions')
+# 'kafka' talks to KAFKA_BOOTSTRAP_SERVERS; 'memory' uses the in-process broker in infra/memory_broker.py
+KAFKA_BACKEND = os.getenv('KAFKA_BACKEND', 'kafka').lower()
 KAFKA_GROUP_ID = os.getenv('KAFKA_GROUP_ID', 'submission-processor')
 
 DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite+aiosqlite:///./submissions.db')
 
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
 
+# Validation verdicts are memoized by (content digest, validator version); 0 disables the cache
+VALIDATION_CACHE_SIZE = int(os.getenv('VALIDATION_CACHE_SIZE', '10000'))
+
+# Store identical content once and let duplicate submissions reference it by digest
+CONTENT_DEDUP_ENABLED = os.getenv('CONTENT_DEDUP_ENABLED', '').lower() in ('true', '1', 'yes')
+
+# Opt-in compression ('zlib' or 'lzma') for content at or above the threshold in bytes
+CONTENT_COMPRESSION_CODEC = os.getenv('CONTENT_COMPRESSION_CODEC', '')
+CONTENT_COMPRESSION_THRESHOLD = int(os.getenv('CONTENT_COMPRESSION_THRESHOLD', '1024'))
+
+# Per-status submission counts are spread over this many rows so concurrent transitions rarely collide
+STATUS_COUNTER_SHARDS = int(os.getenv('STATUS_COUNTER_SHARDS', '8'))
+
+# Same codecs for the content field of Kafka messages
+KAFKA_PAYLOAD_CODEC = os.getenv('KAFKA_PAYLOAD_CODEC', '')
+KAFKA_PAYLOAD_COMPRESSION_THRESHOLD = int(os.getenv('KAFKA_PAYLOAD_COMPRESSION_THRESHOLD', '1024'))
+
+# Kafka messages for content longer than this carry only the id and digest (0 disables claim-check)
+KAFKA_CLAIM_CHECK_THRESHOLD = int(os.getenv('KAFKA_CLAIM_CHECK_THRESHOLD', '65536'))
+KAFKA_MAX_POLL_RECORDS = int(os.getenv('KAFKA_MAX_POLL_RECORDS', '100'))
+
+# Kafka message encoding for producers ('json' or 'binary'); consumers accept both
+KAFKA_MESSAGE_FORMAT = os.getenv('KAFKA_MESSAGE_FORMAT', 'json')
+
+# Failed messages are republished to the retry topic with exponential backoff and moved to the
+# dead-letter topic after KAFKA_MAX_RETRIES attempts; an empty retry topic disables retries
+KAFKA_RETRY_TOPIC = os.getenv('KAFKA_RETRY_TOPIC', f'{KAFKA_TOPIC}-retry')
+KAFKA_DLQ_TOPIC = os.getenv('KAFKA_DLQ_TOPIC', f'{KAFKA_TOPIC}-dlq')
+KAFKA_MAX_RETRIES = int(os.getenv('KAFKA_MAX_RETRIES', '5'))
+KAFKA_RETRY_BACKOFF_MS = int(os.getenv('KAFKA_RETRY_BACKOFF_MS', '1000'))
+KAFKA_RETRY_MAX_BACKOFF_MS = int(os.getenv('KAFKA_RETRY_MAX_BACKOFF_MS', '60000'))
+KAFKA_RETRY_JITTER = float(os.getenv('KAFKA_RETRY_JITTER', '0.5'))
+
+# Submissions stuck in PROCESSING longer than this are reset by the reaper
+PROCESSING_TIMEOUT_MINUTES = float(os.getenv('PROCESSING_TIMEOUT_MINUTES', '5'))
+REAPER_INTERVAL_SECONDS = float(os.getenv('REAPER_INTERVAL_SECONDS', '60'))  # 0 disables the reaper
+REAPER_BATCH_SIZE = int(os.getenv('REAPER_BATCH_SIZE', '500'))
+REAPER_RESET_STATUS = os.getenv('REAPER_RESET_STATUS', 'PENDING')  # PENDING retries, FAILED gives up
+
+# Responses at least this many bytes are gzip-compressed for clients that accept it (0 disables)
+GZIP_MINIMUM_SIZE = int(os.getenv('GZIP_MINIMUM_SIZE', '1024'))
+
+# PASSED/FAILED submissions older than ARCHIVE_AFTER_DAYS move to submissions_archive (0 disables).
+# Batches run in their own short transactions with a pause in between so foreground writes get the lock
+ARCHIVE_AFTER_DAYS = float(os.getenv('ARCHIVE_AFTER_DAYS', '0'))
+ARCHIVE_INTERVAL_SECONDS = float(os.getenv('ARCHIVE_INTERVAL_SECONDS', '300'))
+ARCHIVE_BATCH_SIZE = int(os.getenv('ARCHIVE_BATCH_SIZE', '500'))
+ARCHIVE_BATCH_PAUSE_SECONDS = float(os.getenv('ARCHIVE_BATCH_PAUSE_SECONDS', '0.2'))
+
+# Bulk revalidation of PASSED/FAILED submissions after a validator rule change (POST /api/admin/revalidations).
+# Each chunk is read in id order and written in one transaction with the job checkpoint; 0 disables the throttle.
+# A RUNNING job that has not checkpointed for REVALIDATION_STALE_SECONDS can be resumed by another process.
+REVALIDATION_CHUNK_SIZE = int(os.getenv('REVALIDATION_CHUNK_SIZE', '1000'))
+REVALIDATION_ROWS_PER_SECOND = float(os.getenv('REVALIDATION_ROWS_PER_SECOND', '5000'))
+REVALIDATION_STALE_SECONDS = float(os.getenv('REVALIDATION_STALE_SECONDS', '120'))
+
+# Per-statement SQL timing by normalized fingerprint (GET /api/admin/sql/top). Statements at or above
+# SQL_SLOW_QUERY_MS are logged as warnings (0 disables the log); percentiles use the last SQL_STATS_SAMPLES
+# executions of each fingerprint
+SQL_INSTRUMENTATION = os.getenv('SQL_INSTRUMENTATION', 'true').lower() in ('true', '1', 'yes')
+SQL_SLOW_QUERY_MS = float(os.getenv('SQL_SLOW_QUERY_MS', '200'))
+SQL_STATS_SAMPLES = int(os.getenv('SQL_STATS_SAMPLES', '1000'))
+SQL_STATS_MAX_FINGERPRINTS = int(os.getenv('SQL_STATS_MAX_FINGERPRINTS', '500'))
+
+# Endpoints under /api/admin require this value in the X-Admin-Token header; empty disables them
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
+
+# On-demand profiling (GET /api/admin/profiles). A request is profiled when it sends X-Profile: 1 with a valid
+# X-Admin-Token, or at random at PROFILE_REQUEST_SAMPLE_RATE; consumers profile PROFILE_CONSUMER_SAMPLE_RATE of
+# submissions. PROFILE_MODE 'sample' walks the task's await chain every PROFILE_SAMPLE_INTERVAL_MS, so awaited
+# DB time is attributed; 'cprofile' records deterministic per-function CPU time for the whole event loop.
+# The newest PROFILE_MAX_FILES profiles are kept in PROFILE_DIR
+PROFILE_MODE = os.getenv('PROFILE_MODE', 'sample')
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv('PROFILE_SAMPLE_INTERVAL_MS', '5'))
+PROFILE_REQUEST_SAMPLE_RATE = float(os.getenv('PROFILE_REQUEST_SAMPLE_RATE', '0'))
+PROFILE_CONSUMER_SAMPLE_RATE = float(os.getenv('PROFILE_CONSUMER_SAMPLE_RATE', '0'))
+PROFILE_DIR = os.getenv('PROFILE_DIR', './profiles')
+PROFILE_MAX_FILES = int(os.getenv('PROFILE_MAX_FILES', '50'))
+
+# Full-text search over submission content (SQLite FTS5 only). Off by default: the index stores another plain
+# text copy of every submission, which undoes the savings of dedup and compression. Archived rows leave the index
+SEARCH_ENABLED = os.getenv('SEARCH_ENABLED', 'false').lower() in ('true', '1', 'yes')
+SEARCH_MAX_LIMIT = int(os.getenv('SEARCH_MAX_LIMIT', '100'))
+SEARCH_SNIPPET_TOKENS = int(os.getenv('SEARCH_SNIPPET_TOKENS', '16'))  # FTS5 caps this at 64
+
+# Sliding window for the per-stage latency percentiles at /api/submissions/trace-stats
+TRACE_WINDOW_SECONDS = float(os.getenv('TRACE_WINDOW_SECONDS', '300'))
+TRACE_WINDOW_MAX_SAMPLES = int(os.getenv('TRACE_WINDOW_MAX_SAMPLES', '10000'))
+
+# FastAPI poll consumer pacing
+POLL_INTERVAL_SECONDS = float(os.getenv('POLL_INTERVAL_SECONDS', '1'))
+POLL_PROCESSING_DELAY_SECONDS = float(os.getenv('POLL_PROCESSING_DELAY_SECONDS', '5'))
+
+# Lock timeouts and pool exhaustion put a polled submission back to PENDING and retry it after
+# POLL_OVERLOAD_BACKOFF_MS, doubling each time; it is only marked FAILED after POLL_OVERLOAD_RETRIES
+POLL_OVERLOAD_RETRIES = int(os.getenv('POLL_OVERLOAD_RETRIES', '3'))
+POLL_OVERLOAD_BACKOFF_MS = float(os.getenv('POLL_OVERLOAD_BACKOFF_MS', '200'))
+
+# Poll consumer scheduling: pending rows are fetched per priority lane (up to POLL_BATCH_SIZE each)
+# and dispatched by weighted fair queuing with at most POLL_MAX_CONCURRENCY submissions in flight
+POLL_BATCH_SIZE = int(os.getenv('POLL_BATCH_SIZE', '100'))
+POLL_MAX_CONCURRENCY = int(os.getenv('POLL_MAX_CONCURRENCY', '32'))
+POLL_LANE_WEIGHTS = os.getenv('POLL_LANE_WEIGHTS', 'HIGH=8,NORMAL=3,LOW=1')
+
+# AIMD limit on concurrent process_submission calls per consumer: grows by about one per round while
+# completions stay under the target latency, shrinks by the backoff ratio on slow completions or lock errors.
+# The poll consumer additionally never exceeds POLL_MAX_CONCURRENCY.
+ADAPTIVE_CONCURRENCY = os.getenv('ADAPTIVE_CONCURRENCY', 'true').lower() in ('true', '1', 'yes')
+ADAPTIVE_INITIAL_LIMIT = int(os.getenv('ADAPTIVE_INITIAL_LIMIT', '4'))
+ADAPTIVE_MIN_LIMIT = int(os.getenv('ADAPTIVE_MIN_LIMIT', '1'))
+ADAPTIVE_MAX_LIMIT = int(os.getenv('ADAPTIVE_MAX_LIMIT', '64'))
+ADAPTIVE_TARGET_LATENCY_MS = float(os.getenv('ADAPTIVE_TARGET_LATENCY_MS', '500'))
+ADAPTIVE_BACKOFF_RATIO = float(os.getenv('ADAPTIVE_BACKOFF_RATIO', '0.75'))
+
+# Which process polls when several share a database: 'none' (all of them), 'lease' (row in
+# poller_leases, works across hosts) or 'file' (flock on POLL_LOCK_FILE, same host only)
+POLL_COORDINATION = os.getenv('POLL_COORDINATION', 'none').lower()
+POLL_LEASE_SECONDS = float(os.getenv('POLL_LEASE_SECONDS', '15'))
+POLL_LOCK_FILE = os.getenv('POLL_LOCK_FILE', os.path.join(tempfile.gettempdir(), 'content-processor-poll.lock'))
+
+# In-process broker settings, only used when KAFKA_BACKEND=memory
+MEMORY_BROKER_PARTITIONS = int(os.getenv('MEMORY_BROKER_PARTITIONS', '3'))
+MEMORY_BROKER_LATENCY_MS = float(os.getenv('MEMORY_BROKER_LATENCY_MS', '0'))
+MEMORY_BROKER_FAILURE_RATE = float(os.getenv('MEMORY_BROKER_FAILURE_RATE', '0'))
+
+# Set to false to serve only the API and leave processing to `python -m processor_app.worker`
+RUN_CONSUMERS = os.getenv('RUN_CONSUMERS', 'true').lower() in ('true', '1', 'yes')
+
+# Standalone worker
+WORKER_PROCESSES = int(os.getenv('WORKER_PROCESSES', '1'))
+WORKER_CONCURRENCY = int(os.getenv('WORKER_CONCURRENCY', '1'))  # consumer loops per process
+WORKER_HEALTH_PORT = int(os.getenv('WORKER_HEALTH_PORT', '8081'))  # 0 disables; process i listens on port + i
+WORKER_DRAIN_TIMEOUT_SECONDS = float(os.getenv('WORKER_DRAIN_TIMEOUT_SECONDS', '30'))
+
+# Admission control on POST /api/submissions/ (0 disables each check). Rate limits are per API process and
+# per client address, or per X-API-Key when the header carries one of ADMISSION_API_KEYS (comma separated).
+# One address gets at most ADMISSION_MAX_KEYS_PER_ADDRESS key buckets; further keys share its address bucket.
+ADMISSION_RATE_PER_SECOND = float(os.getenv('ADMISSION_RATE_PER_SECOND', '0'))
+ADMISSION_BURST = float(os.getenv('ADMISSION_BURST', '20'))
+ADMISSION_API_KEYS = frozenset(key.strip() for key in os.getenv('ADMISSION_API_KEYS', '').split(',') if key.strip())
+ADMISSION_MAX_KEYS_PER_ADDRESS = int(os.getenv('ADMISSION_MAX_KEYS_PER_ADDRESS', '4'))
+ADMISSION_MAX_BACKLOG = int(os.getenv('ADMISSION_MAX_BACKLOG', '0'))  # PENDING + PROCESSING, or consumer lag
+ADMISSION_BACKLOG_REFRESH_SECONDS = float(os.getenv('ADMISSION_BACKLOG_REFRESH_SECONDS', '2'))
+ADMISSION_BACKLOG_RETRY_AFTER_SECONDS = int(os.getenv('ADMISSION_BACKLOG_RETRY_AFTER_SECONDS', '5'))
+
 __all__ = [
     'USE_KAFKA',
     'KAFKA_BOOTSTRAP_SERVERS',
@@ -22,4 +170,80 @@ __all__ = [
     'KAFKA_GROUP_ID',
     'DATABASE_URL',
     'LOG_LEVEL',
+    'VALIDATION_CACHE_SIZE',
+    'CONTENT_DEDUP_ENABLED',
+    'STATUS_COUNTER_SHARDS',
+    'CONTENT_COMPRESSION_CODEC',
+    'CONTENT_COMPRESSION_THRESHOLD',
+    'KAFKA_PAYLOAD_CODEC',
+    'KAFKA_PAYLOAD_COMPRESSION_THRESHOLD',
+    'KAFKA_CLAIM_CHECK_THRESHOLD',
+    'KAFKA_MAX_POLL_RECORDS',
+    'KAFKA_MESSAGE_FORMAT',
+    'KAFKA_RETRY_TOPIC',
+    'KAFKA_DLQ_TOPIC',
+    'KAFKA_MAX_RETRIES',
+    'KAFKA_RETRY_BACKOFF_MS',
+    'KAFKA_RETRY_MAX_BACKOFF_MS',
+    'KAFKA_RETRY_JITTER',
+    'PROCESSING_TIMEOUT_MINUTES',
+    'REAPER_INTERVAL_SECONDS',
+    'REAPER_BATCH_SIZE',
+    'REAPER_RESET_STATUS',
+    'GZIP_MINIMUM_SIZE',
+    'ARCHIVE_AFTER_DAYS',
+    'ARCHIVE_INTERVAL_SECONDS',
+    'ARCHIVE_BATCH_SIZE',
+    'ARCHIVE_BATCH_PAUSE_SECONDS',
+    'REVALIDATION_CHUNK_SIZE',
+    'REVALIDATION_ROWS_PER_SECOND',
+    'REVALIDATION_STALE_SECONDS',
+    'SQL_INSTRUMENTATION',
+    'SQL_SLOW_QUERY_MS',
+    'SQL_STATS_SAMPLES',
+    'SQL_STATS_MAX_FINGERPRINTS',
+    'ADMIN_TOKEN',
+    'PROFILE_MODE',
+    'PROFILE_SAMPLE_INTERVAL_MS',
+    'PROFILE_REQUEST_SAMPLE_RATE',
+    'PROFILE_CONSUMER_SAMPLE_RATE',
+    'PROFILE_DIR',
+    'PROFILE_MAX_FILES',
+    'SEARCH_ENABLED',
+    'SEARCH_MAX_LIMIT',
+    'SEARCH_SNIPPET_TOKENS',
+    'TRACE_WINDOW_SECONDS',
+    'TRACE_WINDOW_MAX_SAMPLES',
+    'POLL_INTERVAL_SECONDS',
+    'POLL_PROCESSING_DELAY_SECONDS',
+    'POLL_OVERLOAD_RETRIES',
+    'POLL_OVERLOAD_BACKOFF_MS',
+    'POLL_BATCH_SIZE',
+    'POLL_MAX_CONCURRENCY',
+    'POLL_LANE_WEIGHTS',
+    'ADAPTIVE_CONCURRENCY',
+    'ADAPTIVE_INITIAL_LIMIT',
+    'ADAPTIVE_MIN_LIMIT',
+    'ADAPTIVE_MAX_LIMIT',
+    'ADAPTIVE_TARGET_LATENCY_MS',
+    'ADAPTIVE_BACKOFF_RATIO',
+    'POLL_COORDINATION',
+    'POLL_LEASE_SECONDS',
+    'POLL_LOCK_FILE',
+    'KAFKA_BACKEND',
+    'MEMORY_BROKER_PARTITIONS',
+    'MEMORY_BROKER_LATENCY_MS',
+    'MEMORY_BROKER_FAILURE_RATE',
+    'RUN_CONSUMERS',
+    'WORKER_PROCESSES',
+    'WORKER_CONCURRENCY',
+    'WORKER_HEALTH_PORT',
+    'WORKER_DRAIN_TIMEOUT_SECONDS',
+    'ADMISSION_RATE_PER_SECOND',
+    'ADMISSION_BURST',
+    'ADMISSION_API_KEYS',
+    'ADMISSION_MAX_KEYS_PER_ADDRESS',
+    'ADMISSION_MAX_BACKLOG',
+    'ADMISSION_BACKLOG_REFRESH_SECONDS',
+    'ADMISSION_BACKLOG_RETRY_AFTER_SECONDS',
 ]
@@ -0,0 +1,121 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from time import monotonic, perf_counter
+from typing import AsyncIterator, Deque, Optional
+
+import sqlalchemy
+
+from processor_app.metrics.pipeline_metrics import CONSUMER_CONCURRENCY_LIMIT
+
+# Substrings of driver errors that mean the database is saturated rather than the submission being bad
+_OVERLOAD_MARKERS = ("database is locked", "database is busy", "timeout", "too many connections")
+
+
+def is_overload_error(error: BaseException) -> bool:
+    if isinstance(error, (asyncio.TimeoutError, sqlalchemy.exc.TimeoutError)):
+        return True
+    if isinstance(error, sqlalchemy.exc.OperationalError):
+        message = str(error.orig if error.orig is not None else error).lower()
+        return any(marker in message for marker in _OVERLOAD_MARKERS)
+    return False
+
+
+class LimiterSlot:
+    __slots__ = ('overloaded',)
+
+    def __init__(self):
+        self.overloaded = False
+
+
+class AdaptiveConcurrencyLimiter:
+    # AIMD, as in TCP congestion control: every fast completion adds 1/limit (about +1 per round of
+    # limit completions) while the limit is actually in use; a slow completion or a lock/timeout error
+    # multiplies it by backoff_ratio, at most once per target_latency so one congested round counts once.
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        target_latency: float = 0.5,
+        backoff_ratio: float = 0.75,
+        name: str = "default"
+    ):
+        if not 0 < backoff_ratio < 1:
+            raise ValueError("backoff_ratio must be between 0 and 1")
+        self.min_limit = max(min_limit, 1)
+        self.max_limit = max(max_limit, self.min_limit)
+        self.target_latency = target_latency
+        self.backoff_ratio = backoff_ratio
+        self.name = name
+        self.in_flight = 0
+        self.increases_total = 0
+        self.decreases_total = 0
+        self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self._last_decrease = float('-inf')
+        self._waiters: Deque[asyncio.Future] = deque()
+        CONSUMER_CONCURRENCY_LIMIT.labels(name).set(self.limit)
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    async def acquire(self) -> None:
+        if not self._waiters and self.in_flight < self.limit:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we were cancelled; pass it on
+                self.in_flight -= 1
+                self._wake()
+            raise
+
+    def release(self, latency: Optional[float] = None, overloaded: bool = False, in_flight: int = 0) -> None:
+        self.in_flight -= 1
+        if latency is not None or overloaded:
+            self.on_sample(latency or 0.0, overloaded, in_flight)
+        self._wake()
+
+    def on_sample(self, latency: float, overloaded: bool = False, in_flight: int = 0) -> None:
+        if overloaded or latency > self.target_latency:
+            now = monotonic()
+            if now - self._last_decrease >= self.target_latency:
+                self._last_decrease = now
+                self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+                self.decreases_total += 1
+        elif in_flight * 2 >= self._limit:
+            # Only grow while at least half the limit is used, so an idle consumer does not drift to max
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            self.increases_total += 1
+        CONSUMER_CONCURRENCY_LIMIT.labels(self.name).set(self.limit)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[LimiterSlot]:
+        """Holds one slot; the caller sets slot.overloaded for errors it handles itself"""
+        await self.acquire()
+        slot = LimiterSlot()
+        in_flight = self.in_flight
+        started = perf_counter()
+        try:
+            yield slot
+        except asyncio.CancelledError:
+            self.release()
+            raise
+        except Exception as e:
+            self.release(perf_counter() - started, slot.overloaded or is_overload_error(e), in_flight)
+            raise
+        else:
+            self.release(perf_counter() - started, slot.overloaded, in_flight)
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
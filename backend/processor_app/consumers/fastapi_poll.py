@@ -1,10 +1,19 @@
 import logging
 import asyncio
+from functools import partial
+from typing import Dict, Optional
 
 from processor_app.interfaces.consumer import IConsumer
 from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
 from processor_app.interfaces.validator import IContentValidator
 from processor_app.consumers.submission_processor import SubmissionProcessor
+from processor_app.validators.validation_cache import ValidationCache
+from processor_app.metrics.stage_trace import now_ms
+from processor_app.metrics.pipeline_metrics import POLL_LEADER, POLL_LANE_DEPTH
+from processor_app.interfaces.leader_election import ILeaderElection
+from processor_app.consumers.lane_scheduler import WeightedFairScheduler
+from processor_app.consumers.adaptive_limiter import AdaptiveConcurrencyLimiter
+from processor_app.content_processor_service.schema import SubmissionPriority
 
 logger = logging.getLogger(__name__)
 
@@ -14,14 +23,43 @@ class FastAPIPoll(IConsumer):
         self,
         repository: ContentProcessorRepository,
         validator: IContentValidator,
-        poll_interval: int = 1
+        poll_interval: float = 1,
+        validation_cache: Optional[ValidationCache] = None,
+        processing_delay: float = 5,
+        leader_election: Optional[ILeaderElection] = None,
+        lane_weights: Optional[Dict[str, int]] = None,
+        batch_size: int = 100,
+        max_concurrency: int = 32,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        overload_retries: int = 3,
+        overload_backoff: float = 0.2
     ):
         self.repository = repository
         self.validator = validator
         self.poll_interval = poll_interval
+        self.processing_delay = processing_delay
+        self.leader_election = leader_election
         self.running = False
         self._poll_task = None
-        self.processor = SubmissionProcessor(repository, validator)
+        self._in_flight = set()
+        self._queued_ids = set()  # queued or in flight, so later polls do not pick them up again
+        self._delaying = set()  # in-flight tasks still sleeping through processing_delay
+        self._is_leader = leader_election is None
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        weights = lane_weights or {'HIGH': 8, 'NORMAL': 3, 'LOW': 1}
+        # Only weighted lanes are polled, so a lane left out would keep its submissions PENDING forever
+        missing = [lane.value for lane in SubmissionPriority if lane.value not in weights]
+        if missing:
+            raise ValueError(f"Lane weights missing for {', '.join(missing)}")
+        self.scheduler = WeightedFairScheduler(
+            {SubmissionPriority(lane): weight for lane, weight in weights.items()}
+        )
+        self.concurrency_limiter = concurrency_limiter
+        self.processor = SubmissionProcessor(
+            repository, validator, validation_cache, concurrency_limiter,
+            overload_retries=overload_retries, overload_backoff=overload_backoff
+        )
 
     async def start(self) -> None:
         self.running = True
@@ -36,19 +74,37 @@ class FastAPIPoll(IConsumer):
                 await self._poll_task
             except asyncio.CancelledError:
                 pass
+        if self.leader_election:
+            await self.leader_election.release()
+            POLL_LEADER.set(0)
         logger.info("FastAPI poll consumer shut down")
 
+    async def drain(self, timeout: float) -> None:
+        await self.shutdown()
+        if self._in_flight:
+            _, pending = await asyncio.wait(set(self._in_flight), timeout=timeout)
+            if pending:
+                logger.warning(f"{len(pending)} submissions still processing after {timeout}s drain")
+
     async def is_running(self) -> bool:
         return self.running and self._poll_task is not None and not self._poll_task.done()
 
     async def _poll(self) -> None:
         while self.running:
             try:
-                submissions = await self.repository.get_pending()
-                
-                for submission in submissions:
-                    logger.info(f"[{submission.id}] Found pending submission, processing...")
-                    asyncio.create_task(self._process_with_delay(submission))
+                if self.leader_election:
+                    # Followers only serve HTTP; they keep trying so they take over when the lease expires
+                    is_leader = await self.leader_election.try_acquire()
+                    POLL_LEADER.set(1 if is_leader else 0)
+                    if self._is_leader and not is_leader:
+                        self._step_down()
+                    self._is_leader = is_leader
+                    if not is_leader:
+                        await asyncio.sleep(self.poll_interval)
+                        continue
+
+                await self._fetch_pending()
+                self._dispatch()
                 
                 await asyncio.sleep(self.poll_interval)
                 
@@ -56,10 +112,73 @@ class FastAPIPoll(IConsumer):
                 logger.error(f"Error in polling loop: {e}")
                 await asyncio.sleep(self.poll_interval)
 
-    async def _process_with_delay(self, submission) -> None:
+    async def _fetch_pending(self) -> None:
+        for lane in self.scheduler.weights:
+            room = self.batch_size - self.scheduler.depth(lane)
+            if room <= 0:
+                continue
+            for submission in await self.repository.get_pending(priority=lane, limit=room):
+                if submission.id in self._queued_ids:
+                    continue
+                logger.info(f"[{submission.id}] Found pending submission in lane {lane.value}")
+                self._queued_ids.add(submission.id)
+                self.scheduler.enqueue(lane, (submission, now_ms()))
+        self._report_depth()
+
+    def _has_room(self) -> bool:
+        # max_concurrency stays a hard ceiling on tasks; within it the adaptive limiter decides, counting
+        # only tasks past processing_delay since the sleep holds no database resources
+        if 0 < self.max_concurrency <= len(self._in_flight):
+            return False
+        if self.concurrency_limiter is None:
+            return True
+        return len(self._in_flight) - len(self._delaying) < self.concurrency_limiter.limit
+
+    def _dispatch(self) -> None:
+        while self._has_room():
+            entry = self.scheduler.dequeue()
+            if entry is None:
+                break
+            _, (submission, received_at_ms) = entry
+            task = asyncio.create_task(self._process_with_delay(submission, received_at_ms))
+            self._in_flight.add(task)
+            self._delaying.add(task)
+            task.add_done_callback(partial(self._on_done, submission.id))
+        self._report_depth()
+
+    def _on_done(self, submission_id: str, task: asyncio.Task) -> None:
+        self._in_flight.discard(task)
+        self._delaying.discard(task)
+        self._queued_ids.discard(submission_id)
+        if self.running and self._is_leader:
+            # A freed slot goes to the next lane in line rather than waiting for the next poll
+            self._dispatch()
+
+    def _step_down(self) -> None:
+        # The new leader polls the same PENDING rows, so queued work is dropped rather than processed twice.
+        # Tasks still sleeping through processing_delay have not claimed their row yet and are cancelled too;
+        # the rest are past the claim and finish normally.
+        dropped = self.scheduler.clear()
+        for submission, _ in dropped:
+            self._queued_ids.discard(submission.id)
+        for task in list(self._delaying):
+            task.cancel()
+        self._report_depth()
+        logger.warning(
+            f"Lost poll leadership, dropped {len(dropped)} queued and {len(self._delaying)} delayed submissions"
+        )
+
+    def _report_depth(self) -> None:
+        for lane in self.scheduler.weights:
+            POLL_LANE_DEPTH.labels(lane.value).set(self.scheduler.depth(lane))
+
+    async def _process_with_delay(self, submission, received_at_ms: int) -> None:
         try:
-            await asyncio.sleep(5)
-            await self.processor.process_submission(submission.id, submission.content)
+            await asyncio.sleep(self.processing_delay)
+            self._delaying.discard(asyncio.current_task())
+            await self.processor.process_submission(
+                submission.id, submission.content, {'received': received_at_ms}
+            )
         except Exception as e:
             logger.error(f"Error processing submission {submission.id}: {e}")
          
@@ -1,50 +1,87 @@
-import json
 import logging
 import asyncio
-from typing import Callable, Optional
+import time
+from typing import Callable, Dict, Optional
 
 from kafka import KafkaConsumer as KafkaConsumerClient
+from kafka.structs import OffsetAndMetadata
 
 from processor_app.interfaces.consumer import IConsumer
+from processor_app.compression import unpack_content
+from processor_app.serializers import deserialize_message
+from processor_app.metrics.pipeline_metrics import (
+    KAFKA_COMMIT_SECONDS, KAFKA_RETRIES, KAFKA_DEAD_LETTERED, KAFKA_DROPPED
+)
+from processor_app.metrics.stage_trace import now_ms
 from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
 from processor_app.interfaces.validator import IContentValidator
 from processor_app.consumers.submission_processor import SubmissionProcessor
+from processor_app.validators.validation_cache import ValidationCache
+from processor_app.consumers.retry_policy import RetryPolicy
+from processor_app.consumers.adaptive_limiter import AdaptiveConcurrencyLimiter
+from processor_app.producers.kafka_producer import KafkaProducerImpl
 
 logger = logging.getLogger(__name__)
 
 
 class KafkaConsumer(IConsumer):
-    
+    LAG_REFRESH_SECONDS = 5
+
     def __init__(
         self,
         repository: ContentProcessorRepository,
         validator: IContentValidator,
         bootstrap_servers: list,
         topic: str = "submissions",
-        group_id: str = "submission-processor"
+        group_id: str = "submission-processor",
+        validation_cache: Optional[ValidationCache] = None,
+        max_poll_records: int = 1,
+        client_factory: Optional[Callable] = None,
+        retry_producer: Optional[KafkaProducerImpl] = None,
+        retry_topic: Optional[str] = None,
+        dlq_topic: Optional[str] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None
     ):
         self.repository = repository
         self.validator = validator
         self.bootstrap_servers = bootstrap_servers
         self.topic = topic
         self.group_id = group_id
+        self.max_poll_records = max_poll_records
+        # Anything with the kafka-python KafkaConsumer constructor and poll/commit/close
+        self.client_factory = client_factory or KafkaConsumerClient
         self.consumer = None
         self.running = False
         self._task = None
+        self._poll_future = None
+        self.retry_producer = retry_producer
+        self.retry_topic = retry_topic
+        self.dlq_topic = dlq_topic
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._delayed: Dict[object, int] = {}  # paused retry partitions -> resume time (epoch ms)
+        self.retried_total = 0
+        self.lag = 0  # uncommitted records on the assigned partitions, read by admission control
+        self._lag_measured_at = 0.0
+        self.dead_lettered_total = 0
+        self.dropped_total = 0
         self.on_complete_callback: Optional[Callable] = None
-        self.processor = SubmissionProcessor(repository, validator)
+        # With a limiter, records of a poll batch are processed concurrently; commits stay in offset order
+        self.concurrency_limiter = concurrency_limiter
+        self.processor = SubmissionProcessor(repository, validator, validation_cache, concurrency_limiter)
 
     async def start(self) -> None:
         try:
-            self.consumer = KafkaConsumerClient(
-                self.topic,
+            topics = [self.topic, self.retry_topic] if self.retries_enabled else [self.topic]
+            self.consumer = self.client_factory(
+                *topics,
                 bootstrap_servers=self.bootstrap_servers,
                 group_id=self.group_id,
                 auto_offset_reset='earliest',
                 enable_auto_commit=False,
-                value_deserializer=lambda m: json.loads(m.decode('utf-8')) if m else None,
+                value_deserializer=deserialize_message,
             )
-            logger.info(f"Kafka consumer initialized on topic '{self.topic}'")
+            logger.info(f"Kafka consumer initialized on {', '.join(repr(t) for t in topics)}")
             
             self.running = True
             self._task = asyncio.create_task(self._consume_messages())
@@ -63,51 +100,240 @@ class KafkaConsumer(IConsumer):
                 await self._task
             except asyncio.CancelledError:
                 pass
+        if self._poll_future and not self._poll_future.done():
+            # The client is not thread-safe; let the in-flight poll return before closing it
+            await asyncio.wait([self._poll_future])
         if self.consumer:
             self.consumer.close()
         logger.info("Kafka consumer shut down")
 
+    async def drain(self, timeout: float) -> None:
+        # The loop exits after the record (or concurrent batch) in hand; offsets are committed before the client closes
+        self.running = False
+        if self._task:
+            done, _ = await asyncio.wait([self._task], timeout=timeout)
+            if not done:
+                logger.warning(f"Kafka consumer did not drain within {timeout}s, cancelling")
+        await self.shutdown()
+
     async def is_running(self) -> bool:
         return self.running and self._task is not None and not self._task.done()
 
     def set_on_complete_callback(self, callback: Callable[[str, bool], None]) -> None:
         self.on_complete_callback = callback
 
+    @staticmethod
+    def _decode_content(submission_data: dict) -> Optional[str]:
+        content = submission_data.get('content')
+        if content is None:
+            return None
+        return unpack_content(submission_data.get('codec'), content)
+
+    @staticmethod
+    def _trace_marks(submission_data: dict, message) -> dict:
+        marks = {'received': now_ms()}
+        # Fall back to the broker CreateTime for producers that predate published_at
+        published_at = submission_data.get('published_at') or getattr(message, 'timestamp', None)
+        if isinstance(published_at, int) and published_at > 0:
+            marks['published'] = published_at
+        return marks
+
+    async def _fetch_claimed_contents(self, messages: dict) -> Dict[str, str]:
+        # Claim-check messages carry no content; load the whole poll batch in one query
+        submission_ids = [
+            message.value.get('id')
+            for records in messages.values()
+            for message in records
+            if message.value and message.value.get('content') is None
+        ]
+        if not submission_ids:
+            return {}
+        try:
+            return await self.repository.get_contents(submission_ids)
+        except Exception as e:
+            logger.error(f"Failed to load claim-checked content for {len(submission_ids)} submissions: {e}")
+            return {}
+
     async def _consume_messages(self) -> None:
         while self.running:
             try:
-                # Poll messages with timeout
-                messages = self.consumer.poll(timeout_ms=1000, max_records=1)
-                
+                self._resume_due_partitions()
+                # poll blocks up to timeout_ms; keep it off the event loop so the API stays responsive
+                self._poll_future = asyncio.ensure_future(asyncio.to_thread(
+                    self._poll_batch, self._poll_timeout_ms()
+                ))
+                messages = await asyncio.shield(self._poll_future)
+                claimed_contents = await self._fetch_claimed_contents(messages)
+
+                if self.concurrency_limiter:
+                    await asyncio.gather(*(
+                        self._handle_partition_batch(topic_partition, records, claimed_contents)
+                        for topic_partition, records in messages.items()
+                    ))
+                    continue
+
                 for topic_partition, records in messages.items():
                     for message in records:
                         if not self.running:
                             break
+                        # False means the partition was rewound; the rest of its batch is redelivered later
+                        if not await self._handle_record(topic_partition, message, claimed_contents):
+                            break
 
-                        try:
-                            submission_data = message.value
-                            submission_id = submission_data.get('id')
-                            content = submission_data.get('content')
+            except Exception as e:
+                logger.error(f"Kafka consumer error: {e}")
+                await asyncio.sleep(1)
 
-                            logger.info(f"[{submission_id}] Received submission from Kafka")
+    def _poll_batch(self, timeout_ms: int) -> dict:
+        # Runs in a worker thread; the client is only ever touched by one thread at a time
+        messages = self.consumer.poll(timeout_ms=timeout_ms, max_records=self.max_poll_records)
+        now = time.monotonic()
+        if now - self._lag_measured_at >= self.LAG_REFRESH_SECONDS:
+            self._lag_measured_at = now
+            try:
+                end_offsets = self.consumer.end_offsets(list(self.consumer.assignment()))
+                self.lag = sum(
+                    max(0, end - (self.consumer.committed(tp) or 0)) for tp, end in end_offsets.items()
+                )
+            except Exception as e:
+                logger.debug(f"Failed to measure consumer lag: {e}")
+        return messages
 
-                            success = await self.processor.process_submission(submission_id, content)
+    async def _handle_record(self, topic_partition, message, claimed_contents: Dict[str, str]) -> bool:
+        if self._park_if_not_due(topic_partition, message):
+            return False
+        success = await self._process_record(message, claimed_contents)
+        return self._finalize_record(topic_partition, message, success)
 
-                            if success:
-                                self.consumer.commit()
-                                logger.info(f"[{submission_id}] Offset committed")
-                                if self.on_complete_callback:
-                                    self.on_complete_callback(submission_id, True)
-                            else:
-                                logger.warning(f"[{submission_id}] Processing failed - will retry")
-                                if self.on_complete_callback:
-                                    self.on_complete_callback(submission_id, False)
+    async def _handle_partition_batch(self, topic_partition, records, claimed_contents: Dict[str, str]) -> None:
+        # Process the due prefix of the batch concurrently (the limiter bounds it), then hand off
+        # failures and commit in offset order so a crash never skips an unfinished record
+        due = []
+        for message in records:
+            if not self.running or self._park_if_not_due(topic_partition, message):
+                break
+            due.append(message)
+        if not due:
+            return
+        results = await asyncio.gather(*(self._process_record(message, claimed_contents) for message in due))
 
-                        except Exception as e:
-                            logger.error(f"Error processing message: {e}")
-                
-                await asyncio.sleep(0.1)
+        committed = None
+        for message, success in zip(due, results):
+            # False means the partition was rewound; the rest of its batch is redelivered later
+            if not self._finalize_record(topic_partition, message, success, commit=False):
+                break
+            committed = message
+        if committed is not None:
+            self._commit(topic_partition, committed)
 
-            except Exception as e:
-                logger.error(f"Kafka consumer error: {e}")
-                await asyncio.sleep(1)
+    def _park_if_not_due(self, topic_partition, message) -> bool:
+        retry_at = message.value.get('retry_at') if topic_partition.topic == self.retry_topic else None
+        if retry_at and retry_at > now_ms():
+            # Not due yet: park the retry partition at this record, the main topic keeps flowing
+            self.consumer.seek(topic_partition, message.offset)
+            self.consumer.pause(topic_partition)
+            self._delayed[topic_partition] = retry_at
+            return True
+        return False
+
+    async def _process_record(self, message, claimed_contents: Dict[str, str]) -> bool:
+        submission_data = message.value
+        submission_id = submission_data.get('id')
+        try:
+            content = self._decode_content(submission_data)
+            if content is None:
+                content = claimed_contents.get(submission_id)
+
+            logger.info(f"[{submission_id}] Received submission from Kafka")
+
+            success = await self.processor.process_submission(
+                submission_id, content, self._trace_marks(submission_data, message),
+                retry_on_error=self._will_retry(submission_data)
+            )
+        except Exception as e:
+            logger.error(f"[{submission_id}] Error processing message: {e}")
+            success = False
+
+        if self.on_complete_callback:
+            self.on_complete_callback(submission_id, success)
+        return success
+
+    def _finalize_record(self, topic_partition, message, success: bool, commit: bool = True) -> bool:
+        submission_data = message.value
+        if not success:
+            if not self.retries_enabled:
+                # Nothing would redeliver it: the consumer position has already moved past this record
+                self.dropped_total += 1
+                KAFKA_DROPPED.inc()
+                logger.error(
+                    f"[{submission_data.get('id')}] Processing failed and no retry topic is configured, "
+                    f"dropping message"
+                )
+            elif not self._schedule_retry(submission_data):
+                # Could not hand the message off; rewind so it is not skipped by the next commit
+                self.consumer.seek(topic_partition, message.offset)
+                return False
+
+        if commit:
+            # Commit only up to this record; the rest of the batch is still in flight
+            self._commit(topic_partition, message)
+        return True
+
+    def _commit(self, topic_partition, message) -> None:
+        with KAFKA_COMMIT_SECONDS.time():
+            self.consumer.commit({topic_partition: OffsetAndMetadata(message.offset + 1, None)})
+        logger.info(f"[{message.value.get('id')}] Offset committed")
+
+    @property
+    def retries_enabled(self) -> bool:
+        return bool(self.retry_producer and self.retry_topic)
+
+    def _will_retry(self, submission_data: dict) -> bool:
+        # Whether a failure of this delivery goes to the retry topic rather than the DLQ (or nowhere)
+        attempt = (submission_data.get('attempt') or 0) + 1
+        return self.retries_enabled and not self.retry_policy.should_dead_letter(attempt)
+
+    def _schedule_retry(self, submission_data: dict) -> bool:
+        attempt = (submission_data.get('attempt') or 0) + 1
+        message = dict(submission_data)
+        content = message.get('content')
+        if isinstance(content, memoryview):
+            # The binary format hands plain text over as bytes too. The retry producer may write JSON,
+            # which only base64-decodes codec payloads on the way back, so plain text goes out as text.
+            message['content'] = bytes(content) if message.get('codec') else unpack_content(None, content)
+
+        if self.retry_policy.should_dead_letter(attempt):
+            message.pop('retry_at', None)
+            if self.dlq_topic and not self.retry_producer.publish(self.dlq_topic, message):
+                return False
+            self.dead_lettered_total += 1
+            KAFKA_DEAD_LETTERED.inc()
+            logger.error(
+                f"[{message['id']}] Giving up after {attempt - 1} retries"
+                + (f", moved to '{self.dlq_topic}'" if self.dlq_topic else "")
+            )
+            return True
+
+        delay_ms = self.retry_policy.delay_ms(attempt)
+        message['attempt'] = attempt
+        message['retry_at'] = now_ms() + delay_ms
+        if not self.retry_producer.publish(self.retry_topic, message):
+            return False
+        self.retried_total += 1
+        KAFKA_RETRIES.inc()
+        logger.warning(f"[{message['id']}] Processing failed, retry {attempt} in {delay_ms}ms")
+        return True
+
+    def _resume_due_partitions(self) -> None:
+        now = now_ms()
+        due = [tp for tp, retry_at in self._delayed.items() if retry_at <= now]
+        if due:
+            self.consumer.resume(*due)
+            for tp in due:
+                del self._delayed[tp]
+
+    def _poll_timeout_ms(self) -> int:
+        # Wake up in time to resume the next parked retry partition
+        if not self._delayed:
+            return 1000
+        return max(0, min(1000, min(self._delayed.values()) - now_ms()))
@@ -0,0 +1,28 @@
+import random
+from typing import Optional
+
+
+class RetryPolicy:
+    # Exponential backoff with jitter: attempt n waits base * 2^(n-1), capped, then scaled by a random factor
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        backoff_ms: int = 1000,
+        max_backoff_ms: int = 60000,
+        jitter: float = 0.5,
+        rng: Optional[random.Random] = None
+    ):
+        self.max_retries = max_retries
+        self.backoff_ms = backoff_ms
+        self.max_backoff_ms = max_backoff_ms
+        self.jitter = jitter
+        self._random = rng or random.Random()
+
+    def should_dead_letter(self, attempt: int) -> bool:
+        return attempt > self.max_retries
+
+    def delay_ms(self, attempt: int) -> int:
+        delay = min(self.max_backoff_ms, self.backoff_ms * 2 ** max(attempt - 1, 0))
+        # Jitter spreads retries of messages that failed together, e.g. during a database outage
+        return int(delay * (1 - self.jitter * self._random.random()))
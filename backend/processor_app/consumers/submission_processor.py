@@ -1,28 +1,109 @@
+import asyncio
 import logging
 from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Optional
 
 from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
 from processor_app.content_processor_service.schema import SubmissionStatus
 from processor_app.interfaces.validator import IContentValidator
+from processor_app.validators.validation_cache import ValidationCache
+from processor_app.consumers.adaptive_limiter import AdaptiveConcurrencyLimiter, LimiterSlot, is_overload_error
+from processor_app.config import PROCESSING_TIMEOUT_MINUTES, PROFILE_CONSUMER_SAMPLE_RATE
+from processor_app.metrics.pipeline_metrics import (
+    SUBMISSIONS_COMPLETED,
+    VALIDATION_CACHE_LOOKUPS,
+    VALIDATOR_SECONDS,
+    observe_since
+)
+from processor_app.metrics.stage_trace import STAGE_LATENCY, StageTrace
+from processor_app.profiling.profiler import PROFILER, Profiler
 
 logger = logging.getLogger(__name__)
 
-PROCESSING_TIMEOUT_MINUTES = 5
-
 
 class SubmissionProcessor:
     
     def __init__(
         self,
         repository: ContentProcessorRepository,
-        validator: IContentValidator
+        validator: IContentValidator,
+        validation_cache: Optional[ValidationCache] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        profiler: Profiler = PROFILER,
+        profile_sample_rate: float = PROFILE_CONSUMER_SAMPLE_RATE,
+        overload_retries: int = 0,
+        overload_backoff: float = 0.2
     ):
         self.repository = repository
         self.validator = validator
+        self.validation_cache = validation_cache
+        self.concurrency_limiter = concurrency_limiter
+        self.profiler = profiler
+        self.profile_sample_rate = profile_sample_rate
+        # Lock timeouts and pool exhaustion say nothing about the content, so instead of failing the
+        # submission it is released and tried again after overload_backoff * 2**attempt seconds
+        self.overload_retries = overload_retries
+        self.overload_backoff = overload_backoff
+
+    async def process_submission(
+        self,
+        submission_id: str,
+        content: Optional[str],
+        trace: Optional[dict] = None,
+        retry_on_error: bool = False
+    ) -> bool:
+        """False when processing failed. With retry_on_error the caller will deliver the submission
+        again, so a claimed row goes back to PENDING instead of being marked FAILED."""
+        # Consumer loop iterations hand each submission to this call, inline or in a task of its own,
+        # so profiling here covers the DB round trips and validation of one iteration
+        if self.profiler.sampled(self.profile_sample_rate):
+            async with self.profiler.profile('consumer', f"process_submission {submission_id}"):
+                return await self._process_in_slot(submission_id, content, trace, retry_on_error)
+        return await self._process_in_slot(submission_id, content, trace, retry_on_error)
 
-    async def process_submission(self, submission_id: str, content: str) -> bool:
+    async def _process_in_slot(
+        self,
+        submission_id: str,
+        content: Optional[str],
+        trace: Optional[dict],
+        retry_on_error: bool
+    ) -> bool:
+        attempt = 0
+        while True:
+            release_on_overload = attempt < self.overload_retries
+            if self.concurrency_limiter is None:
+                outcome = await self._process_submission(
+                    submission_id, content, trace,
+                    retry_on_error=retry_on_error, release_on_overload=release_on_overload
+                )
+            else:
+                # The limiter times the whole call (DB round trips and validation) after a slot is granted
+                async with self.concurrency_limiter.slot() as slot:
+                    outcome = await self._process_submission(
+                        submission_id, content, trace, slot, retry_on_error, release_on_overload
+                    )
+            if outcome is not None:
+                return outcome
+            # Outside the slot, so a backing-off submission does not hold concurrency
+            delay = self.overload_backoff * 2 ** attempt
+            attempt += 1
+            logger.info(f"[{submission_id}] Database overloaded, retrying in {delay:.2f}s (attempt {attempt})")
+            await asyncio.sleep(delay)
+
+    async def _process_submission(
+        self,
+        submission_id: str,
+        content: Optional[str],
+        trace: Optional[dict] = None,
+        slot: Optional[LimiterSlot] = None,
+        retry_on_error: bool = False,
+        release_on_overload: bool = False
+    ) -> Optional[bool]:
+        """None when an overload error released the submission for another attempt"""
         try:
-            submission = await self.repository.get_by_id(submission_id)
+            # Content handed in by the consumer is not read again
+            submission = await self.repository.get_by_id(submission_id, with_content=content is None)
             if not submission:
                 logger.warning(f"[{submission_id}] Submission not found")
                 return False
@@ -48,18 +129,53 @@ class SubmissionProcessor:
                 logger.info(f"[{submission_id}] Already processed (status: {submission.status}), skipping")
                 return True
 
+            if content is None:
+                content = submission.content
+
+            # trace carries epoch-ms marks from upstream (published, received)
+            stage_trace = StageTrace(submission.created_at)
+            for stage, at_ms in (trace or {}).items():
+                stage_trace.mark(stage, at_ms)
+
+            digest = submission.content_digest if self.validation_cache else None
+            if digest:
+                cached = await self.validation_cache.get(digest, self.validator.version)
+                VALIDATION_CACHE_LOOKUPS.labels("miss" if cached is None else "hit").inc()
+                if cached is not None:
+                    final_status = SubmissionStatus.PASSED if cached else SubmissionStatus.FAILED
+                    processed_at = datetime.utcnow()
+                    stage_trace.mark('completed')
+                    await self._finish(submission_id, final_status, processed_at, stage_trace)
+                    self._record_completion(submission, final_status, processed_at, processed_at)
+                    logger.info(f"[{submission_id}] Status: PENDING → {final_status.value} (cached verdict)")
+                    return True
+
+            processing_started_at = datetime.utcnow()
+            claim_start = perf_counter()
             await self.repository.update_status(
                 submission_id,
                 SubmissionStatus.PROCESSING,
-                processing_started_at=datetime.utcnow()
+                processing_started_at=processing_started_at
             )
+            stage_trace.duration('db_claim', perf_counter() - claim_start)
+            stage_trace.mark('claimed')
             logger.info(f"[{submission_id}] Status: PENDING → PROCESSING")
 
             logger.info(f"[{submission_id}] Processing content...")
+            validate_start = perf_counter()
             is_valid = self.validator.validate(content)
+            validate_seconds = perf_counter() - validate_start
+            VALIDATOR_SECONDS.observe(validate_seconds)
+            stage_trace.duration('validate', validate_seconds)
+            stage_trace.mark('validated')
+            if digest:
+                await self.validation_cache.put(digest, self.validator.version, is_valid)
 
             final_status = SubmissionStatus.PASSED if is_valid else SubmissionStatus.FAILED
-            await self.repository.update_status(submission_id, final_status, datetime.utcnow())
+            processed_at = datetime.utcnow()
+            stage_trace.mark('completed')
+            await self._finish(submission_id, final_status, processed_at, stage_trace)
+            self._record_completion(submission, final_status, processing_started_at, processed_at)
 
             result = "PASSED" if is_valid else "FAILED"
             logger.info(f"[{submission_id}] Status: PROCESSING → {result}")
@@ -67,8 +183,20 @@ class SubmissionProcessor:
 
         except Exception as e:
             logger.error(f"[{submission_id}] Error during processing: {e}")
+            overloaded = is_overload_error(e)
+            if slot is not None and overloaded:
+                slot.overloaded = True
             try:
-                submission = await self.repository.get_by_id(submission_id)
+                if release_on_overload and overloaded:
+                    # Still PENDING when the error came before the claim; either way the next attempt can claim it
+                    await self.repository.release_claim(submission_id)
+                    return None
+                if retry_on_error:
+                    # A FAILED row would look already processed when the retry arrives
+                    if await self.repository.release_claim(submission_id):
+                        logger.info(f"[{submission_id}] Released back to PENDING for retry")
+                    return False
+                submission = await self.repository.get_by_id(submission_id, with_content=False)
                 if submission and submission.status == SubmissionStatus.PROCESSING:
                     await self.repository.update_status(
                         submission_id,
@@ -79,3 +207,31 @@ class SubmissionProcessor:
             except Exception as db_error:
                 logger.error(f"[{submission_id}] Failed to update error status: {db_error}")
             return False
+
+    async def _finish(
+        self,
+        submission_id: str,
+        final_status: SubmissionStatus,
+        processed_at: datetime,
+        stage_trace: StageTrace
+    ) -> None:
+        # The trace is persisted with the final write, so that write can only be timed in memory
+        write_start = perf_counter()
+        await self.repository.update_status(
+            submission_id, final_status, processed_at,
+            trace=stage_trace.as_dict(), validator_version=self.validator.version
+        )
+        stage_trace.duration('db_final', perf_counter() - write_start)
+        STAGE_LATENCY.record_trace(stage_trace.stages)
+
+    @staticmethod
+    def _record_completion(
+        submission,
+        final_status: SubmissionStatus,
+        processing_started_at: datetime,
+        processed_at: datetime
+    ) -> None:
+        SUBMISSIONS_COMPLETED.labels(final_status.value).inc()
+        observe_since("queued", submission.created_at, processing_started_at)
+        observe_since("processing", processing_started_at, processed_at)
+        observe_since("total", submission.created_at, processed_at)
@@ -0,0 +1,5 @@
+import hashlib
+
+
+def compute_digest(content: str) -> str:
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
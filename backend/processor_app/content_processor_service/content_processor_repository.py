@@ -1,107 +1,970 @@
-from typing import Optional, List
-from datetime import datetime
+from typing import Optional, List, Dict, Tuple
+from datetime import datetime, timedelta
+import random
 import uuid
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, delete, func, literal, union_all, or_, and_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import defer, load_only
+from sqlalchemy.sql.expression import UnaryExpression
+from sqlalchemy.sql.operators import custom_op
+from sqlalchemy.orm.attributes import set_committed_value
 import sqlalchemy
-from processor_app.content_processor_service.schema import Submission, SubmissionStatus
+from processor_app.content_processor_service.schema import (
+    Submission,
+    SubmissionArchive,
+    SubmissionStatus,
+    SubmissionPriority,
+    ContentBlob,
+    ValidationResult,
+    PollerLease,
+    SubmissionStatusCounter,
+    RevalidationJob,
+    RevalidationStatus
+)
+from processor_app.content_processor_service.content_digest import compute_digest
+from processor_app.content_processor_service.search_index import (
+    CREATE_SEARCH_TABLE,
+    SEARCH_TABLE,
+    SEARCH_TABLE_EXISTS,
+    SEARCH_TABLE_ANY_ROW,
+    INSERT_SEARCH_ROW,
+    CLEAR_SEARCH_TABLE,
+    DELETE_SEARCH_ROWS,
+    SearchUnavailableError,
+    SNIPPET_START,
+    SNIPPET_END,
+    SNIPPET_ELLIPSIS,
+    match_expression,
+    search_statement
+)
 from processor_app.repositories.repository import Repository
 from processor_app.content_processor_service.request.content_request import ContentSubmissionRequest
 from processor_app.interfaces.producer import IProducer
+from processor_app.compression import pack_content
+from processor_app.metrics.pipeline_metrics import SUBMISSIONS_CREATED, repository_timer
+from processor_app.config import (
+    CONTENT_DEDUP_ENABLED,
+    CONTENT_COMPRESSION_CODEC,
+    CONTENT_COMPRESSION_THRESHOLD,
+    STATUS_COUNTER_SHARDS,
+    SEARCH_ENABLED,
+    SEARCH_SNIPPET_TOKENS
+)
 
 logger = logging.getLogger(__name__)
 
+# Rows per statement when an empty search index is filled from existing submissions
+SEARCH_BACKFILL_BATCH_SIZE = 1000
+
 class ContentProcessorRepository:
 
-    def __init__(self, repository: Repository, producer: Optional[IProducer] = None):
+    def __init__(
+        self,
+        repository: Repository,
+        producer: Optional[IProducer] = None,
+        dedup_enabled: bool = CONTENT_DEDUP_ENABLED,
+        compression_codec: Optional[str] = CONTENT_COMPRESSION_CODEC,
+        compression_threshold: int = CONTENT_COMPRESSION_THRESHOLD,
+        counter_shards: int = STATUS_COUNTER_SHARDS,
+        search_enabled: bool = SEARCH_ENABLED
+    ):
         self.repo = repository
         self.producer = producer
+        self.dedup_enabled = dedup_enabled
+        self.compression_codec = compression_codec
+        self.compression_threshold = compression_threshold
+        self.counter_shards = max(counter_shards, 1)
+        self.search_enabled = search_enabled
+        # None until the first session tells us whether the FTS5 table exists
+        self._search_ready: Optional[bool] = None
 
     def _get_session(self) -> AsyncSession:
         return self.repo.get_session()
-    
+
+    @repository_timer("create")
     async def create(self, submission: ContentSubmissionRequest) -> Submission:
         try:
+            content = submission.content
+            digest = compute_digest(content)
             async with self._get_session() as session:
                 async with session.begin():
                     submission_id = str(uuid.uuid4())
                     submission = Submission(
                         id=submission_id,
-                        content=submission.content,
-                        status=SubmissionStatus.PENDING
+                        content_digest=digest,
+                        status=SubmissionStatus.PENDING,
+                        priority=submission.priority
                     )
+                    if self.dedup_enabled:
+                        await self._store_blob(session, digest, content)
+                    else:
+                        submission.store_content(content, self.compression_codec, self.compression_threshold)
                     session.add(submission)
+                    if await self._search_available(session):
+                        await session.execute(INSERT_SEARCH_ROW, {'submission_id': submission_id, 'content': content})
+                    await self._bump_status_counters(session, {SubmissionStatus.PENDING: 1})
                     await session.commit()
-            
+
+            SUBMISSIONS_CREATED.inc()
+            if submission._content is None:
+                set_committed_value(submission, '_content', content)
+
             if self.producer and self.producer.is_available():
                 logger.info(f"[{submission_id}] Triggering producer for submission")
-                self.producer.produce(submission_id, submission.content)
-            
+                self.producer.produce(submission_id, submission.content, digest)
+
             return submission
         except sqlalchemy.exc.IntegrityError as e:
             raise e
 
-    async def get_by_id(self, submission_id: str) -> Optional[Submission]:
+    @repository_timer("get_by_id")
+    async def get_by_id(self, submission_id: str, with_content: bool = True) -> Optional[Submission]:
+        # Archived rows come back as SubmissionArchive, which has the same columns
+        # with_content=False leaves the content columns and the blob lookup out for callers that already hold it
         try:
             async with self._get_session() as session:
                 async with session.begin():
-                    return await self._get_by_id(session, submission_id)
+                    submission = await self._get_by_id(session, submission_id, with_content=with_content)
+                    if submission is None:
+                        query = select(SubmissionArchive).filter(SubmissionArchive.id == submission_id)
+                        if not with_content:
+                            query = query.options(*self._defer_content(SubmissionArchive))
+                        result = await session.execute(query)
+                        submission = result.scalars().first()
+                    if submission and with_content:
+                        await self._hydrate_content(session, [submission])
+                    return submission
         except sqlalchemy.exc.SQLAlchemyError as e:
             raise e
-        
 
+
+    @repository_timer("update_status")
     async def update_status(
         self,
         submission_id: str,
         status: SubmissionStatus,
         processed_at: Optional[datetime] = None,
-        processing_started_at: Optional[datetime] = None
+        processing_started_at: Optional[datetime] = None,
+        trace: Optional[dict] = None,
+        validator_version: Optional[str] = None
     ) -> Optional[Submission]:
         try:
             async with self._get_session() as session:
                 async with session.begin():
-                    submission = await self._get_by_id(session, submission_id)
+                    # Lock the row so the counter moves from the status we actually replace
+                    submission = await self._get_by_id(session, submission_id, for_update=True)
                     if submission:
+                        if submission.status != status:
+                            await self._bump_status_counters(session, {submission.status: -1, status: 1})
                         submission.status = status
                         if processed_at:
                             submission.processed_at = processed_at
                         if processing_started_at:
                             submission.processing_started_at = processing_started_at
+                        if trace:
+                            submission.trace = trace
+                        if validator_version:
+                            submission.validator_version = validator_version
                         await session.commit()
                     return submission
         except sqlalchemy.exc.IntegrityError as e:
             raise e
-        
+
+    @repository_timer("list_all")
     async def list_all(self) -> List[Submission]:
         try:
             async with self._get_session() as session:
                 async with session.begin():
-                    return await self._list_all(session)
+                    submissions = await self._list_all(session)
+                    await self._hydrate_content(session, submissions)
+                    return submissions
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            raise e
+
+    @repository_timer("reap_stale")
+    async def reap_stale(
+        self,
+        started_before: datetime,
+        reset_status: SubmissionStatus = SubmissionStatus.PENDING,
+        limit: int = 500
+    ) -> List[str]:
+        try:
+            async with self._get_session() as session:
+                async with session.begin():
+                    stale_ids = (
+                        select(Submission.id)
+                        .filter(
+                            Submission.status == SubmissionStatus.PROCESSING,
+                            Submission.processing_started_at < started_before
+                        )
+                        .limit(limit)
+                        .scalar_subquery()
+                    )
+                    values = {'status': reset_status}
+                    if reset_status in (SubmissionStatus.PASSED, SubmissionStatus.FAILED):
+                        values['processed_at'] = datetime.utcnow()
+                    result = await session.execute(
+                        update(Submission)
+                        .where(Submission.id.in_(stale_ids), Submission.status == SubmissionStatus.PROCESSING)
+                        .values(**values)
+                        .returning(Submission.id)
+                        .execution_options(synchronize_session=False)
+                    )
+                    reaped = result.scalars().all()
+                    if reaped and reset_status != SubmissionStatus.PROCESSING:
+                        await self._bump_status_counters(
+                            session, {SubmissionStatus.PROCESSING: -len(reaped), reset_status: len(reaped)}
+                        )
+                    return reaped
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            raise e
+
+    @repository_timer("release_claim")
+    async def release_claim(self, submission_id: str) -> bool:
+        """Puts a PROCESSING submission back to PENDING so a later attempt can claim it again"""
+        try:
+            async with self._get_session() as session:
+                async with session.begin():
+                    result = await session.execute(
+                        update(Submission)
+                        .where(Submission.id == submission_id, Submission.status == SubmissionStatus.PROCESSING)
+                        .values(status=SubmissionStatus.PENDING, processing_started_at=None)
+                        .execution_options(synchronize_session=False)
+                    )
+                    if not result.rowcount:
+                        return False
+                    await self._bump_status_counters(
+                        session, {SubmissionStatus.PROCESSING: -1, SubmissionStatus.PENDING: 1}
+                    )
+                    return True
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            raise e
+
+    @repository_timer("archive_terminal")
+    async def archive_terminal(self, processed_before: datetime, limit: int = 500) -> int:
+        """Moves up to limit PASSED/FAILED rows processed before the cutoff into submissions_archive"""
+        try:
+            async with self._get_session() as session:
+                async with session.begin():
+                    result = await session.execute(
+                        select(Submission.id)
+                        .filter(
+                            Submission.status.in_((SubmissionStatus.PASSED, SubmissionStatus.FAILED)),
+                            Submission.processed_at < processed_before
+                        )
+                        .limit(limit)
+                    )
+                    submission_ids = result.scalars().all()
+                    if not submission_ids:
+                        return 0
+                    # Copy and delete in one transaction: a row is always in exactly one of the tables.
+                    # Status counters cover both tables, so they do not change. The search index only
+                    # covers the hot table, so the rows leave it here too.
+                    columns = list(Submission.__table__.columns)
+                    insert = self._insert_for(session)
+                    await session.execute(
+                        insert(SubmissionArchive)
+                        .from_select(
+                            [column.name for column in columns] + ['archived_at'],
+                            select(*columns, literal(datetime.utcnow())).where(Submission.id.in_(submission_ids))
+                        )
+                        .on_conflict_do_nothing(index_elements=[SubmissionArchive.id])
+                    )
+                    await session.execute(
+                        delete(Submission)
+                        .where(Submission.id.in_(submission_ids))
+                        .execution_options(synchronize_session=False)
+                    )
+                    # Checked on every batch rather than via search_enabled: an index built while search
+                    # was on must not keep pointing at archived rows after it is turned off
+                    if await self._search_table_exists(session):
+                        await session.execute(DELETE_SEARCH_ROWS, {'submission_ids': submission_ids})
+                    # The rows left the list endpoint, so list ETags must change
+                    await self._bump_status_counters(session, {SubmissionStatus.PASSED: 0})
+                    return len(submission_ids)
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            raise e
+
+    async def requeue(self, submission_ids: List[str]) -> None:
+        if not (self.producer and self.producer.is_available()) or not submission_ids:
+            return
+        contents = await self.get_contents(submission_ids)
+        for submission_id, content in contents.items():
+            self.producer.produce(submission_id, content)
+
+    @repository_timer("get_contents")
+    async def get_contents(self, submission_ids: List[str]) -> Dict[str, str]:
+        try:
+            async with self._get_session() as session:
+                async with session.begin():
+                    result = await session.execute(
+                        select(Submission).filter(Submission.id.in_(submission_ids))
+                    )
+                    submissions = result.scalars().all()
+                    await self._hydrate_content(session, submissions)
+                    return {s.id: s.content for s in submissions}
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            raise e
+
+    @repository_timer("count_by_status")
+    async def count_by_status(self) -> Dict[SubmissionStatus, int]:
+        try:
+            async with self._get_session() as session:
+                async with session.begin():
+                    result = await session.execute(
+                        select(Submission.status, func.count()).group_by(Submission.status)
+                    )
+                    counts = {status: 0 for status in SubmissionStatus}
+                    counts.update(dict(result.all()))
+                    return counts
         except sqlalchemy.exc.SQLAlchemyError as e:
             raise e
-    
+
+    @repository_timer("status_counts")
+    async def status_counts(self) -> Dict[SubmissionStatus, int]:
+        # Reads at most len(SubmissionStatus) * counter_shards rows, independent of table size
+        try:
+            async with self._get_session() as session:
+                async with session.begin():
+                    result = await session.execute(
+                        select(SubmissionStatusCounter.status, func.sum(SubmissionStatusCounter.count))
+                        .group_by(SubmissionStatusCounter.status)
+                    )
+                    counts = {status: 0 for status in SubmissionStatus}
+                    counts.update({status: int(total or 0) for status, total in result.all()})
+                    return counts
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            raise e
+
+    @repository_timer("change_watermark")
+    async def change_watermark(self) -> int:
+        """Sum of counter changes; grows with every create, status change and archival batch"""
+        try:
+            async with self._get_session() as session:
+                async with session.begin():
+                    result = await session.execute(select(func.sum(SubmissionStatusCounter.changes)))
+                    return int(result.scalar() or 0)
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            raise e
+
+    @repository_timer("get_version")
+    async def get_version(self, submission_id: str) -> Optional[Tuple[SubmissionStatus, Optional[datetime]]]:
+        """(status, processed_at) without loading content, from the hot table or the archive"""
+        try:
+            async with self._get_session() as session:
+                async with session.begin():
+                    for model in (Submission, SubmissionArchive):
+                        result = await session.execute(
+                            select(model.status, model.processed_at).filter(model.id == submission_id)
+                        )
+                        row = result.first()
+                        if row is not None:
+                            return tuple(row)
+                    return None
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            raise e
+
+    @repository_timer("backfill_status_counters")
+    async def backfill_status_counters(self, rebuild: bool = False) -> bool:
+        """Seeds the counters from a full count when they are empty (or always with rebuild=True)
+        and makes sure every (status, shard) row exists; returns whether a count was taken"""
+        try:
+            async with self._get_session() as session:
+                async with session.begin():
+                    watermark = 0
+                    if rebuild:
+                        # The list ETag is derived from the change watermark, so it must not go back
+                        watermark = (
+                            await session.execute(select(func.sum(SubmissionStatusCounter.changes)))
+                        ).scalar() or 0
+                        await session.execute(delete(SubmissionStatusCounter))
+                    seeded = False
+                    if rebuild or not (await session.execute(select(SubmissionStatusCounter.status).limit(1))).first():
+                        # Same transaction as the count, so no transition can slip in between.
+                        # Archived rows still count towards their status.
+                        statuses = union_all(
+                            select(Submission.status), select(SubmissionArchive.status)
+                        ).subquery()
+                        await session.execute(
+                            sqlalchemy.insert(SubmissionStatusCounter).from_select(
+                                ['status', 'shard', 'count', 'changes'],
+                                select(statuses.c.status, literal(0), func.count(), literal(0))
+                                .group_by(statuses.c.status)
+                            )
+                        )
+                        seeded = True
+                    insert = self._insert_for(session)
+                    await session.execute(
+                        insert(SubmissionStatusCounter)
+                        .values([
+                            {'status': status, 'shard': shard, 'count': 0, 'changes': 0}
+                            for status in SubmissionStatus for shard in range(self.counter_shards)
+                        ])
+                        .on_conflict_do_nothing(
+                            index_elements=[SubmissionStatusCounter.status, SubmissionStatusCounter.shard]
+                        )
+                    )
+                    if watermark:
+                        await session.execute(
+                            update(SubmissionStatusCounter)
+                            .where(
+                                SubmissionStatusCounter.status == SubmissionStatus.PENDING,
+                                SubmissionStatusCounter.shard == 0
+                            )
+                            .values(changes=SubmissionStatusCounter.changes + watermark)
+                        )
+                    return seeded
+        except sqlalchemy.exc.IntegrityError:
+            # Another process seeded the counters first
+            return False
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            raise e
+
+    @repository_timer("init_search_index")
+    async def init_search_index(self, rebuild: bool = False) -> bool:
+        """Creates the FTS5 table on SQLite and indexes existing submissions while it is empty
+        (or always with rebuild=True); returns whether existing rows were indexed"""
+        if not self.search_enabled:
+            self._search_ready = False
+            return False
+        try:
+            async with self._get_session() as session:
+                async with session.begin():
+                    if session.bind.dialect.name != 'sqlite':
+                        self._search_ready = False
+                        return False
+                    # Creating first takes the write lock, so a second process starting at the same
+                    # time waits here and then finds the index already filled
+                    await session.execute(CREATE_SEARCH_TABLE)
+                    if rebuild:
+                        await session.execute(CLEAR_SEARCH_TABLE)
+                    empty = (await session.execute(SEARCH_TABLE_ANY_ROW)).first() is None
+                    indexed = 0
+                    if empty:
+                        indexed = await self._index_existing(session)
+                    self._search_ready = True
+                    if indexed:
+                        logger.info(f"Indexed {indexed} existing submissions for search")
+                    return indexed > 0
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            raise e
+
+    @repository_timer("search")
+    async def search(
+        self,
+        query: str,
+        status: Optional[SubmissionStatus] = None,
+        limit: int = 20,
+        offset: int = 0,
+        snippet_tokens: int = SEARCH_SNIPPET_TOKENS
+    ) -> List[Tuple[str, SubmissionStatus, str, float]]:
+        """(id, status, snippet, bm25 rank) of submissions containing every term of query, best first"""
+        expression = match_expression(query)
+        if expression is None:
+            return []
+        try:
+            async with self._get_session() as session:
+                async with session.begin():
+                    if not await self._search_available(session):
+                        raise SearchUnavailableError("Full-text search is disabled or needs the SQLite FTS5 index")
+                    result = await session.execute(
+                        search_statement(status is not None),
+                        {
+                            'query': expression,
+                            'status': status.value if status is not None else None,
+                            'snippet_start': SNIPPET_START,
+                            'snippet_end': SNIPPET_END,
+                            'snippet_ellipsis': SNIPPET_ELLIPSIS,
+                            'snippet_tokens': min(max(snippet_tokens, 1), 64),
+                            'limit': limit,
+                            'offset': offset,
+                        }
+                    )
+                    return [
+                        (submission_id, SubmissionStatus(row_status), snippet, rank)
+                        for submission_id, row_status, snippet, rank in result.all()
+                    ]
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            raise e
+
+    @repository_timer("create_revalidation_job")
+    async def create_revalidation_job(
+        self, validator_version: str, holder: str, stale_before: datetime
+    ) -> Optional[RevalidationJob]:
+        """New RUNNING job, or None while another job has checkpointed since stale_before"""
+        try:
+            async with self._get_session() as session:
+                async with session.begin():
+                    active = await session.execute(
+                        select(RevalidationJob.id)
+                        .filter(
+                            RevalidationJob.status == RevalidationStatus.RUNNING,
+                            RevalidationJob.updated_at >= stale_before
+                        )
+                        .limit(1)
+                    )
+                    if active.first() is not None:
+                        return None
+                    now = datetime.utcnow()
+                    job = RevalidationJob(
+                        id=str(uuid.uuid4()),
+                        validator_version=validator_version,
+                        status=RevalidationStatus.RUNNING,
+                        holder=holder,
+                        last_id='',
+                        scanned=0,
+                        changed=0,
+                        created_at=now,
+                        updated_at=now
+                    )
+                    session.add(job)
+                    return job
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            raise e
+
+    @repository_timer("claim_revalidation_job")
+    async def claim_revalidation_job(
+        self, job_id: str, validator_version: str, holder: str, stale_before: datetime
+    ) -> Optional[RevalidationJob]:
+        """Takes over a PAUSED or FAILED job, or a RUNNING one whose holder stopped checkpointing.
+        Only a validator of the job's own version may continue it."""
+        try:
+            async with self._get_session() as session:
+                async with session.begin():
+                    result = await session.execute(
+                        update(RevalidationJob)
+                        .where(
+                            RevalidationJob.id == job_id,
+                            RevalidationJob.validator_version == validator_version,
+                            or_(
+                                RevalidationJob.status.in_((RevalidationStatus.PAUSED, RevalidationStatus.FAILED)),
+                                and_(
+                                    RevalidationJob.status == RevalidationStatus.RUNNING,
+                                    RevalidationJob.updated_at < stale_before
+                                )
+                            )
+                        )
+                        .values(status=RevalidationStatus.RUNNING, holder=holder, error=None, updated_at=datetime.utcnow())
+                        .execution_options(synchronize_session=False)
+                    )
+                    if result.rowcount == 0:
+                        return None
+                    return await session.get(RevalidationJob, job_id)
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            raise e
+
+    @repository_timer("pause_revalidation_job")
+    async def pause_revalidation_job(self, job_id: str, holder: Optional[str] = None) -> bool:
+        # The runner finds out at its next checkpoint, whichever process it lives in
+        try:
+            async with self._get_session() as session:
+                async with session.begin():
+                    query = update(RevalidationJob).where(
+                        RevalidationJob.id == job_id, RevalidationJob.status == RevalidationStatus.RUNNING
+                    )
+                    if holder is not None:
+                        query = query.where(RevalidationJob.holder == holder)
+                    result = await session.execute(
+                        query.values(status=RevalidationStatus.PAUSED, updated_at=datetime.utcnow())
+                        .execution_options(synchronize_session=False)
+                    )
+                    return result.rowcount > 0
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            raise e
+
+    @repository_timer("finish_revalidation_job")
+    async def finish_revalidation_job(
+        self, job_id: str, holder: str, status: RevalidationStatus, error: Optional[str] = None
+    ) -> bool:
+        try:
+            async with self._get_session() as session:
+                async with session.begin():
+                    now = datetime.utcnow()
+                    result = await session.execute(
+                        update(RevalidationJob)
+                        .where(
+                            RevalidationJob.id == job_id,
+                            RevalidationJob.holder == holder,
+                            RevalidationJob.status == RevalidationStatus.RUNNING
+                        )
+                        .values(status=status, error=error, updated_at=now, finished_at=now)
+                        .execution_options(synchronize_session=False)
+                    )
+                    return result.rowcount > 0
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            raise e
+
+    @repository_timer("get_revalidation_job")
+    async def get_revalidation_job(self, job_id: str) -> Optional[RevalidationJob]:
+        try:
+            async with self._get_session() as session:
+                async with session.begin():
+                    return await session.get(RevalidationJob, job_id)
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            raise e
+
+    @repository_timer("list_revalidation_jobs")
+    async def list_revalidation_jobs(self, limit: int = 20) -> List[RevalidationJob]:
+        try:
+            async with self._get_session() as session:
+                async with session.begin():
+                    result = await session.execute(
+                        select(RevalidationJob).order_by(RevalidationJob.created_at.desc()).limit(limit)
+                    )
+                    return result.scalars().all()
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            raise e
+
+    @repository_timer("revalidation_chunk")
+    async def revalidation_chunk(
+        self, after_id: str, limit: int, validator_version: str
+    ) -> List[Tuple[str, SubmissionStatus, Optional[str], Optional[str]]]:
+        """(id, status, digest, content) of the next PASSED/FAILED rows after after_id in id order
+        whose verdict predates validator_version; rows already at that version are skipped. Archived
+        rows are not scanned, so get_by_id keeps returning their archived verdict."""
+        try:
+            async with self._get_session() as session:
+                async with session.begin():
+                    status = Submission.status
+                    if session.bind.dialect.name == 'sqlite':
+                        # Without ANALYZE statistics SQLite prefers a status index and then sorts every terminal
+                        # row for each chunk; a unary + rules those out so the id index serves range and order
+                        status = UnaryExpression(Submission.status, operator=custom_op('+'), type_=Submission.status.type)
+                    result = await session.execute(
+                        select(Submission)
+                        .options(load_only(
+                            Submission.id, Submission.status, Submission.content_digest,
+                            Submission._content, Submission.content_compressed, Submission.content_codec
+                        ))
+                        .filter(
+                            Submission.id > after_id,
+                            status.in_((SubmissionStatus.PASSED, SubmissionStatus.FAILED)),
+                            or_(
+                                Submission.validator_version.is_(None),
+                                Submission.validator_version != validator_version
+                            )
+                        )
+                        .order_by(Submission.id)
+                        .limit(limit)
+                    )
+                    submissions = result.scalars().all()
+                    await self._hydrate_content(session, submissions)
+                    return [(s.id, s.status, s.content_digest, s.content) for s in submissions]
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            raise e
+
+    @repository_timer("apply_revalidation")
+    async def apply_revalidation(
+        self,
+        job_id: str,
+        holder: str,
+        validator_version: str,
+        last_id: str,
+        verdicts: Dict[str, Tuple[SubmissionStatus, bool]],
+        verdicts_by_digest: Optional[Dict[str, bool]] = None
+    ) -> Optional[int]:
+        """Writes one chunk of verdicts, keyed by id as (status read with the chunk, is_valid), and advances
+        the job's cursor in the same transaction. Returns how many statuses flipped, or None (nothing
+        written) when the job is no longer ours."""
+        try:
+            async with self._get_session() as session:
+                async with session.begin():
+                    checkpoint = await session.execute(
+                        update(RevalidationJob)
+                        .where(
+                            RevalidationJob.id == job_id,
+                            RevalidationJob.holder == holder,
+                            RevalidationJob.status == RevalidationStatus.RUNNING
+                        )
+                        .values(last_id=last_id, scanned=RevalidationJob.scanned + len(verdicts), updated_at=datetime.utcnow())
+                        .execution_options(synchronize_session=False)
+                    )
+                    if checkpoint.rowcount == 0:
+                        return None
+
+                    # Terminal rows only change status here, and one job holds the checkpoint, so the status
+                    # read with the chunk is still current. Matching on id alone keeps SQLite on the primary
+                    # key instead of the status indexes; rows archived in the meantime simply do not match.
+                    flips = {SubmissionStatus.PASSED: 0, SubmissionStatus.FAILED: 0}
+                    for new in flips:
+                        ids = [
+                            submission_id for submission_id, (old, is_valid) in verdicts.items()
+                            if (SubmissionStatus.PASSED if is_valid else SubmissionStatus.FAILED) == new and old != new
+                        ]
+                        if ids:
+                            result = await session.execute(
+                                update(Submission)
+                                .where(Submission.id.in_(ids))
+                                .values(status=new)
+                                .execution_options(synchronize_session=False)
+                            )
+                            flips[new] = result.rowcount
+                    await session.execute(
+                        update(Submission)
+                        .where(Submission.id.in_(list(verdicts)))
+                        .values(validator_version=validator_version)
+                        .execution_options(synchronize_session=False)
+                    )
+
+                    changed = flips[SubmissionStatus.PASSED] + flips[SubmissionStatus.FAILED]
+                    if changed:
+                        net = flips[SubmissionStatus.PASSED] - flips[SubmissionStatus.FAILED]
+                        await self._bump_status_counters(
+                            session, {SubmissionStatus.PASSED: net, SubmissionStatus.FAILED: -net}
+                        )
+                        await session.execute(
+                            update(RevalidationJob)
+                            .where(RevalidationJob.id == job_id)
+                            .values(changed=RevalidationJob.changed + changed)
+                            .execution_options(synchronize_session=False)
+                        )
+                    if verdicts_by_digest:
+                        # Pending duplicates of this content then reuse the new verdict
+                        insert = self._insert_for(session)
+                        now = datetime.utcnow()
+                        await session.execute(
+                            insert(ValidationResult)
+                            .values([
+                                {
+                                    'digest': digest,
+                                    'validator_version': validator_version,
+                                    'is_valid': is_valid,
+                                    'created_at': now
+                                }
+                                for digest, is_valid in verdicts_by_digest.items()
+                            ])
+                            .on_conflict_do_nothing(
+                                index_elements=[ValidationResult.digest, ValidationResult.validator_version]
+                            )
+                        )
+                    return changed
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            raise e
+
+    @repository_timer("get_cached_verdict")
+    async def get_cached_verdict(self, digest: str, validator_version: str) -> Optional[bool]:
+        try:
+            async with self._get_session() as session:
+                async with session.begin():
+                    result = await session.get(ValidationResult, (digest, validator_version))
+                    return result.is_valid if result else None
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            raise e
+
+    @repository_timer("save_verdict")
+    async def save_verdict(self, digest: str, validator_version: str, is_valid: bool) -> None:
+        try:
+            async with self._get_session() as session:
+                async with session.begin():
+                    insert = self._insert_for(session)
+                    stmt = insert(ValidationResult).values(
+                        digest=digest,
+                        validator_version=validator_version,
+                        is_valid=is_valid,
+                        created_at=datetime.utcnow()
+                    )
+                    await session.execute(stmt.on_conflict_do_update(
+                        index_elements=[ValidationResult.digest, ValidationResult.validator_version],
+                        set_={'is_valid': is_valid}
+                    ))
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            raise e
+
+    @repository_timer("acquire_lease")
+    async def acquire_lease(self, name: str, holder: str, ttl_seconds: float) -> bool:
+        # Insert, renew our own lease or take over an expired one in a single statement
+        try:
+            async with self._get_session() as session:
+                async with session.begin():
+                    now = datetime.utcnow()
+                    insert = self._insert_for(session)
+                    stmt = insert(PollerLease).values(
+                        name=name, holder=holder, expires_at=now + timedelta(seconds=ttl_seconds)
+                    )
+                    result = await session.execute(
+                        stmt.on_conflict_do_update(
+                            index_elements=[PollerLease.name],
+                            set_={'holder': stmt.excluded.holder, 'expires_at': stmt.excluded.expires_at},
+                            where=(PollerLease.holder == holder) | (PollerLease.expires_at < now)
+                        ).returning(PollerLease.holder)
+                    )
+                    return result.first() is not None
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            raise e
+
+    @repository_timer("release_lease")
+    async def release_lease(self, name: str, holder: str) -> None:
+        try:
+            async with self._get_session() as session:
+                async with session.begin():
+                    await session.execute(
+                        delete(PollerLease).where(PollerLease.name == name, PollerLease.holder == holder)
+                    )
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            raise e
+
+    @classmethod
+    async def _get_by_id(
+        cls,
+        session: AsyncSession,
+        submission_id: str,
+        for_update: bool = False,
+        with_content: bool = True
+    ) -> Optional[Submission]:
+        query = select(Submission).filter(Submission.id == submission_id)
+        if not with_content:
+            query = query.options(*cls._defer_content(Submission))
+        if for_update:
+            # No-op on SQLite, where the write transaction is already exclusive
+            query = query.with_for_update()
+        result = await session.execute(query)
+        return result.scalars().first()
+
     @staticmethod
-    async def _get_by_id(session: AsyncSession, submission_id: str) -> Optional[Submission]:
-        result = await session.execute(
-            select(Submission).filter(Submission.id == submission_id)
+    def _defer_content(model) -> tuple:
+        # raiseload turns an accidental content access into an error instead of a second query
+        return (
+            defer(model._content, raiseload=True),
+            defer(model.content_compressed, raiseload=True)
         )
-        return result.scalars().first()
-    
+
+    async def _bump_status_counters(self, session: AsyncSession, changes: Dict[SubmissionStatus, int]) -> None:
+        # Shard rows are pre-created by backfill_status_counters, so this is normally a plain UPDATE
+        # A zero delta only advances the change watermark
+        shard = random.randrange(self.counter_shards)
+        for status, delta in changes.items():
+            result = await session.execute(
+                update(SubmissionStatusCounter)
+                .where(SubmissionStatusCounter.status == status, SubmissionStatusCounter.shard == shard)
+                .values(count=SubmissionStatusCounter.count + delta, changes=SubmissionStatusCounter.changes + 1)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
+                insert = self._insert_for(session)
+                stmt = insert(SubmissionStatusCounter).values(status=status, shard=shard, count=delta, changes=1)
+                await session.execute(stmt.on_conflict_do_update(
+                    index_elements=[SubmissionStatusCounter.status, SubmissionStatusCounter.shard],
+                    set_={
+                        'count': SubmissionStatusCounter.count + stmt.excluded.count,
+                        'changes': SubmissionStatusCounter.changes + 1
+                    }
+                ))
+
+    async def _search_available(self, session: AsyncSession) -> bool:
+        if self._search_ready is None:
+            self._search_ready = self.search_enabled and await self._search_table_exists(session)
+        return self._search_ready
+
+    @staticmethod
+    async def _search_table_exists(session: AsyncSession) -> bool:
+        return (
+            session.bind.dialect.name == 'sqlite'
+            and (await session.execute(SEARCH_TABLE_EXISTS, {'name': SEARCH_TABLE})).first() is not None
+        )
+
+    async def _index_existing(self, session: AsyncSession) -> int:
+        # Keyset batches keep memory flat; content is hydrated and decompressed the same way reads do it
+        indexed = 0
+        last_id = ''
+        while True:
+            result = await session.execute(
+                select(Submission)
+                .filter(Submission.id > last_id)
+                .order_by(Submission.id)
+                .limit(SEARCH_BACKFILL_BATCH_SIZE)
+            )
+            submissions = result.scalars().all()
+            if not submissions:
+                return indexed
+            await self._hydrate_content(session, submissions)
+            rows = [{'submission_id': s.id, 'content': s.content} for s in submissions if s.content is not None]
+            if rows:
+                await session.execute(INSERT_SEARCH_ROW, rows)
+            indexed += len(rows)
+            last_id = submissions[-1].id
+            session.expunge_all()
+
     @staticmethod
     async def _list_all(session: AsyncSession) -> List[Submission]:
         result = await session.execute(
             select(Submission).order_by(Submission.created_at.desc())
         )
         return result.scalars().all()
-        
-    async def get_pending(self) -> List[Submission]:
+
+    @staticmethod
+    def _insert_for(session: AsyncSession):
+        # ON CONFLICT is dialect specific; both supported backends share the same API. Startup seeds the
+        # status counters through here, so another dialect fails the API and worker before they serve
+        dialect = session.bind.dialect.name
+        if dialect == 'postgresql':
+            return postgresql.insert
+        if dialect == 'sqlite':
+            return sqlite.insert
+        raise NotImplementedError(
+            f"Upserts are not supported for dialect '{dialect}'; DATABASE_URL must point at PostgreSQL or SQLite"
+        )
+
+    async def _store_blob(self, session: AsyncSession, digest: str, content: str) -> None:
+        codec, payload = pack_content(content, self.compression_codec, self.compression_threshold)
+        insert = self._insert_for(session)
+        await session.execute(
+            insert(ContentBlob)
+            .values({
+                ContentBlob.digest: digest,
+                ContentBlob._content: None if codec else payload,
+                ContentBlob.content_compressed: payload if codec else None,
+                ContentBlob.content_codec: codec,
+                ContentBlob.created_at: datetime.utcnow()
+            })
+            .on_conflict_do_nothing(index_elements=[ContentBlob.digest])
+        )
+
+    @staticmethod
+    async def _hydrate_content(session: AsyncSession, submissions: List[Submission]) -> None:
+        # Deduplicated rows keep only the digest; resolve them with a single blob lookup
+        pending = [
+            s for s in submissions
+            if s._content is None and s.content_compressed is None and s.content_digest
+        ]
+        if not pending:
+            return
+        result = await session.execute(
+            select(
+                ContentBlob.digest,
+                ContentBlob._content,
+                ContentBlob.content_compressed,
+                ContentBlob.content_codec
+            ).filter(ContentBlob.digest.in_({s.content_digest for s in pending}))
+        )
+        blobs = {row[0]: row[1:] for row in result.all()}
+        for submission in pending:
+            stored = blobs.get(submission.content_digest)
+            if stored is None:
+                continue
+            # Copy the stored representation so compressed blobs are still decompressed lazily
+            for key, value in zip(('_content', 'content_compressed', 'content_codec'), stored):
+                set_committed_value(submission, key, value)
+
+    @repository_timer("get_pending")
+    async def get_pending(
+        self,
+        priority: Optional[SubmissionPriority] = None,
+        limit: Optional[int] = None
+    ) -> List[Submission]:
         try:
             async with self._get_session() as session:
                 async with session.begin():
-                    result = await session.execute(
-                        select(Submission).filter(Submission.status == SubmissionStatus.PENDING)
-                    )
-                    return result.scalars().all()
+                    query = select(Submission).filter(Submission.status == SubmissionStatus.PENDING)
+                    if priority is not None:
+                        # Oldest first within one lane, served by ix_submissions_status_priority_created_at
+                        query = query.filter(Submission.priority == priority).order_by(Submission.created_at)
+                    if limit is not None:
+                        query = query.limit(limit)
+                    result = await session.execute(query)
+                    submissions = result.scalars().all()
+                    await self._hydrate_content(session, submissions)
+                    return submissions
         except sqlalchemy.exc.SQLAlchemyError as e:
             raise e
@@ -1,36 +1,114 @@
 import uuid
 import logging
+from typing import Optional
 from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
 from processor_app.content_processor_service.request.content_request import ContentSubmissionRequest
 from processor_app.content_processor_service.response.create_response import ContentSubmissionResponse
+from processor_app.content_processor_service.response.stats_response import SubmissionStatsResponse
+from processor_app.content_processor_service.response.search_response import SubmissionSearchResponse
+from processor_app.content_processor_service.schema import SubmissionStatus
+from processor_app.content_processor_service.response.trace_response import (
+    ContentSubmissionTraceResponse,
+    TraceStatsResponse
+)
+from processor_app.content_processor_service.etag import if_none_match
 from processor_app.infra.factory import Factory
-from fastapi import APIRouter, Depends, Request
+from processor_app.content_processor_service.search_index import SearchUnavailableError
+from processor_app.config import SEARCH_MAX_LIMIT, ADMISSION_API_KEYS
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from processor_app.content_processor_service.content_processor_service import ContentProcessorService
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/submissions", tags=["content-processor"])
 
-def get_content_processor_service(request: Request, repository = Depends(Factory.get_repository)):
-    producer = request.app.state.producer if hasattr(request.app.state, 'producer') else None
-    content_repository = ContentProcessorRepository(repository, producer)
-    content_processor_service = ContentProcessorService(content_repository)
-    return content_processor_service
+def get_content_processor_service(request: Request) -> ContentProcessorService:
+    # Built once at startup; the fallback only covers apps that skipped the startup hook
+    service = getattr(request.app.state, 'content_service', None)
+    if service is None:
+        producer = getattr(request.app.state, 'producer', None)
+        service = ContentProcessorService(ContentProcessorRepository(Factory.get_repository(), producer))
+        request.app.state.content_service = service
+    return service
 
-@router.post("/", response_model=ContentSubmissionResponse)
+def admit_submission(request: Request):
+    admission = getattr(request.app.state, 'admission', None)
+    if admission is None:
+        return
+    address = request.client.host if request.client else None
+    # The header is client supplied, so only configured keys get a bucket of their own
+    api_key = request.headers.get('x-api-key')
+    client_key = ('api_key', api_key) if api_key and api_key in ADMISSION_API_KEYS else address
+    rejection = admission.check(client_key, address)
+    if rejection:
+        reason, retry_after = rejection
+        detail = "Submission backlog is full" if reason == "backlog" else "Too many submissions"
+        raise HTTPException(status_code=429, detail=detail, headers={"Retry-After": str(retry_after)})
+
+def _not_modified(etag: str) -> Response:
+    # A 304 repeats the Vary the full response would carry; GZipMiddleware only adds it to compressed bodies
+    return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept-Encoding"})
+
+@router.post("/", response_model=ContentSubmissionResponse, dependencies=[Depends(admit_submission)])
 async def create_submission(
     submission_data: ContentSubmissionRequest,
     content_processor_service: ContentProcessorService = Depends(get_content_processor_service)
 ):
     return await content_processor_service.create_submission(submission_data)
 
-@router.get("/{submission_id}", response_model=ContentSubmissionResponse)
+# Fixed paths must be declared before /{submission_id}
+@router.get("/stats", response_model=SubmissionStatsResponse)
+async def get_stats(
+    content_processor_service: ContentProcessorService = Depends(get_content_processor_service)
+):
+    return await content_processor_service.get_stats()
+
+@router.get("/search", response_model=SubmissionSearchResponse)
+async def search_submissions(
+    q: str = Query(..., min_length=1, max_length=500),
+    status: Optional[SubmissionStatus] = None,
+    limit: int = Query(20, ge=1, le=SEARCH_MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+    content_processor_service: ContentProcessorService = Depends(get_content_processor_service)
+):
+    try:
+        return await content_processor_service.search_submissions(q, status, limit, offset)
+    except SearchUnavailableError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+@router.get("/trace-stats", response_model=TraceStatsResponse)
+async def get_trace_stats(
+    content_processor_service: ContentProcessorService = Depends(get_content_processor_service)
+):
+    return content_processor_service.get_trace_stats()
+
+@router.get("/{submission_id}", response_model=ContentSubmissionTraceResponse)
 async def get_submission(
     submission_id: str,
+    request: Request,
+    trace: bool = False,
     content_processor_service: ContentProcessorService = Depends(get_content_processor_service)
 ):
-    return await content_processor_service.get_submission(submission_id)
+    conditional = request.headers.get('if-none-match')
+    if conditional:
+        etag = await content_processor_service.get_submission_etag(submission_id, include_trace=trace)
+        if etag and if_none_match(conditional, etag):
+            return _not_modified(etag)
+
+    # Rows are trusted DB output: encode directly instead of validating through response_model
+    body, etag = await content_processor_service.get_submission_json(submission_id, include_trace=trace)
+    return Response(body, media_type="application/json", headers={"ETag": etag} if etag else None)
 
 
 @router.get("/", response_model=list[ContentSubmissionResponse])
-async def list_submissions(content_processor_service: ContentProcessorService = Depends(get_content_processor_service)):
-    return await content_processor_service.list_submissions()
+async def list_submissions(
+    request: Request,
+    content_processor_service: ContentProcessorService = Depends(get_content_processor_service)
+):
+    conditional = request.headers.get('if-none-match')
+    if conditional:
+        etag = await content_processor_service.get_list_etag()
+        if if_none_match(conditional, etag):
+            return _not_modified(etag)
+
+    body, etag = await content_processor_service.list_submissions_json()
+    return Response(body, media_type="application/json", headers={"ETag": etag})
@@ -1,7 +1,18 @@
 import logging
+from typing import Optional, Tuple
 from processor_app.content_processor_service.response.create_response import ContentSubmissionResponse
+from processor_app.content_processor_service.response.trace_response import (
+    ContentSubmissionTraceResponse,
+    TraceStatsResponse
+)
 from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
 from processor_app.content_processor_service.request.content_request import ContentSubmissionRequest
+from processor_app.content_processor_service.response.stats_response import SubmissionStatsResponse
+from processor_app.content_processor_service.response.search_response import SearchHit, SubmissionSearchResponse
+from processor_app.content_processor_service.schema import SubmissionStatus
+from processor_app.content_processor_service.response.json_encoding import encode_submission, encode_submissions
+from processor_app.content_processor_service.etag import submission_etag, list_etag
+from processor_app.metrics.stage_trace import STAGE_LATENCY
 
 logger = logging.getLogger(__name__)
 
@@ -12,10 +23,73 @@ class ContentProcessorService:
 
     async def create_submission(self, submission_data: ContentSubmissionRequest):
         submission = await self._repository.create(submission_data)
-        return ContentSubmissionResponse(**submission.__dict__)
+        return ContentSubmissionResponse.model_validate(submission)
     
-    async def get_submission(self, submission_id: str):
-        return await self._repository.get_by_id(submission_id)
+    async def get_submission(self, submission_id: str, include_trace: bool = False):
+        submission = await self._repository.get_by_id(submission_id)
+        if submission is None:
+            return None
+        response = ContentSubmissionTraceResponse.model_validate(submission)
+        if not include_trace:
+            response.trace = None
+        return response
+
+    async def get_submission_json(
+        self, submission_id: str, include_trace: bool = False
+    ) -> Tuple[bytes, Optional[str]]:
+        submission = await self._repository.get_by_id(submission_id)
+        if submission is None:
+            return encode_submission(None), None
+        etag = submission_etag(submission.id, submission.status, submission.processed_at, include_trace)
+        return encode_submission(submission, include_trace), etag
+
+    async def get_submission_etag(self, submission_id: str, include_trace: bool = False) -> Optional[str]:
+        # Reads only status and processed_at, so an unchanged submission costs no content load
+        version = await self._repository.get_version(submission_id)
+        if version is None:
+            return None
+        return submission_etag(submission_id, *version, include_trace)
+
+    async def get_stats(self) -> SubmissionStatsResponse:
+        counts = await self._repository.status_counts()
+        return SubmissionStatsResponse(
+            counts={status.value: count for status, count in counts.items()},
+            total=sum(counts.values())
+        )
+
+    async def search_submissions(
+        self,
+        query: str,
+        status: Optional[SubmissionStatus] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> SubmissionSearchResponse:
+        # One extra row tells whether another page exists without counting every match
+        rows = await self._repository.search(query, status, limit + 1, offset)
+        return SubmissionSearchResponse(
+            query=query,
+            results=[
+                SearchHit(id=submission_id, status=row_status.value, snippet=snippet, score=-rank)
+                for submission_id, row_status, snippet, rank in rows[:limit]
+            ],
+            limit=limit,
+            offset=offset,
+            has_more=len(rows) > limit
+        )
+
+    def get_trace_stats(self) -> TraceStatsResponse:
+        return TraceStatsResponse(
+            window_seconds=STAGE_LATENCY.window_seconds,
+            stages=STAGE_LATENCY.percentiles()
+        )
     
     async def list_submissions(self):
-        return await self._repository.list_all()
\ No newline at end of file
+        return await self._repository.list_all()
+
+    async def get_list_etag(self) -> str:
+        return list_etag(await self._repository.change_watermark())
+
+    async def list_submissions_json(self) -> Tuple[bytes, str]:
+        # Watermark first: a change racing with the read only makes the tag older, never newer than the body
+        etag = await self.get_list_etag()
+        return encode_submissions(await self._repository.list_all()), etag
@@ -0,0 +1,48 @@
+"""Entity tags for conditional submission reads.
+
+A submission only changes through status transitions, and processed_at is set
+with the final one, so (id, status, processed_at) identifies a representation.
+Lists use the change watermark from the status counters instead.
+
+Tags are weak: GZipMiddleware compresses the same body for clients that accept
+it, so the bytes differ by content coding while the representation does not.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Optional
+
+from processor_app.content_processor_service.schema import SubmissionStatus
+
+# Bump when the JSON layout of a submission changes so clients do not keep stale bodies
+REPRESENTATION_VERSION = 1
+
+
+def submission_etag(
+    submission_id: str,
+    status: SubmissionStatus,
+    processed_at: Optional[datetime],
+    include_trace: bool = False
+) -> str:
+    key = "|".join((
+        str(REPRESENTATION_VERSION),
+        submission_id,
+        status.value,
+        processed_at.isoformat() if processed_at else "",
+        "trace" if include_trace else "",
+    ))
+    return 'W/"' + hashlib.sha1(key.encode('utf-8')).hexdigest()[:20] + '"'
+
+
+def list_etag(watermark: int) -> str:
+    return f'W/"list-{REPRESENTATION_VERSION}-{watermark}"'
+
+
+def if_none_match(header: Optional[str], etag: str) -> bool:
+    """True when the If-None-Match header matches etag (weak comparison, as RFC 9110 requires)"""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
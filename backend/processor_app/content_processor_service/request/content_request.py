@@ -1,4 +1,6 @@
 from pydantic import BaseModel, Field
+from processor_app.content_processor_service.schema import SubmissionPriority
 
 class ContentSubmissionRequest(BaseModel):
     content: str = Field(..., min_length=1, )
+    priority: SubmissionPriority = SubmissionPriority.NORMAL
@@ -6,6 +6,7 @@ class ContentSubmissionResponse(BaseModel):
     id: str
     content: str
     status: str
+    priority: Optional[str] = None
     created_at: datetime
     processed_at: Optional[datetime] = None
 
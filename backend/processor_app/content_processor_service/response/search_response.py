@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class SearchHit(BaseModel):
+    id: str
+    status: str
+    snippet: str
+    score: float
+
+
+class SubmissionSearchResponse(BaseModel):
+    query: str
+    results: List[SearchHit]
+    limit: int
+    offset: int
+    has_more: bool
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+from typing import Dict
+
+
+class SubmissionStatsResponse(BaseModel):
+    counts: Dict[str, int]
+    total: int
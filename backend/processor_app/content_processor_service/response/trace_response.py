@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import Dict, Optional
+
+from processor_app.content_processor_service.response.create_response import ContentSubmissionResponse
+
+
+class ContentSubmissionTraceResponse(ContentSubmissionResponse):
+    trace: Optional[Dict[str, float]] = None
+
+
+class StageLatencyResponse(BaseModel):
+    count: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+class TraceStatsResponse(BaseModel):
+    window_seconds: float
+    stages: Dict[str, StageLatencyResponse]
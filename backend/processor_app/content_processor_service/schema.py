@@ -1,7 +1,10 @@
 from enum import Enum
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Enum as SQLEnum
+from typing import Optional
+from sqlalchemy import Column, String, DateTime, Boolean, Integer, LargeBinary, Index, JSON, Enum as SQLEnum
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import declarative_base
+from processor_app.compression import pack_content, unpack_content
 
 Base = declarative_base()
 
@@ -13,12 +16,143 @@ class SubmissionStatus(str, Enum):
     FAILED = "FAILED"
 
 
-class Submission(Base):
-    __tablename__ = "submissions"
+class SubmissionPriority(str, Enum):
+    # Lanes for the poll consumer's weighted fair scheduler
+    HIGH = "HIGH"
+    NORMAL = "NORMAL"
+    LOW = "LOW"
+
+
+class RevalidationStatus(str, Enum):
+    RUNNING = "RUNNING"
+    PAUSED = "PAUSED"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+class CompressedContentMixin:
+    # Plain text lives in "content"; large payloads go to content_compressed with the codec that wrote them
+    _content = Column("content", String, nullable=True)
+    content_compressed = Column(LargeBinary, nullable=True)
+    content_codec = Column(String(16), nullable=True)
+
+    @hybrid_property
+    def content(self) -> Optional[str]:
+        if self._content is not None or self.content_compressed is None:
+            return self._content
+        # Decompressed on first read and kept next to the loaded row
+        text = self.__dict__.get('_decompressed_content')
+        if text is None:
+            text = unpack_content(self.content_codec, self.content_compressed)
+            self.__dict__['_decompressed_content'] = text
+        return text
+
+    @content.setter
+    def content(self, value: Optional[str]) -> None:
+        self._content = value
+        self.content_compressed = None
+        self.content_codec = None
+        self.__dict__.pop('_decompressed_content', None)
+
+    @content.expression
+    def content(cls):
+        return cls._content
 
+    def store_content(self, value: str, codec_name: Optional[str], threshold: int) -> None:
+        codec, payload = pack_content(value, codec_name, threshold)
+        if codec is None:
+            self.content = value
+            return
+        self._content = None
+        self.content_compressed = payload
+        self.content_codec = codec
+        self.__dict__['_decompressed_content'] = value
+
+
+class SubmissionColumns(CompressedContentMixin):
+    # Shared by the hot submissions table and its archive so rows move between them column for column
     id = Column(String, primary_key=True, index=True)
-    content = Column(String, nullable=False)
+    # content is NULL when deduplicated into content_blobs
+    content_digest = Column(String(64), nullable=True, index=True)
     status = Column(SQLEnum(SubmissionStatus), default=SubmissionStatus.PENDING, nullable=False)
+    priority = Column(SQLEnum(SubmissionPriority), default=SubmissionPriority.NORMAL, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     processing_started_at = Column(DateTime, nullable=True)  # Track when PROCESSING started
     processed_at = Column(DateTime, nullable=True)  # When finally PASSED/FAILED
+    trace = Column(JSON, nullable=True)  # Stage marks in ms since created_at, see StageTrace
+    validator_version = Column(String, nullable=True)  # IContentValidator.version behind the current verdict
+
+
+class Submission(SubmissionColumns, Base):
+    __tablename__ = "submissions"
+
+    __table_args__ = (
+        # Range scans for stale PROCESSING claims
+        Index('ix_submissions_status_processing_started_at', 'status', 'processing_started_at'),
+        # Per-lane oldest-first scans of PENDING work
+        Index('ix_submissions_status_priority_created_at', 'status', 'priority', 'created_at'),
+        # Oldest-first scans of terminal rows for archival
+        Index('ix_submissions_status_processed_at', 'status', 'processed_at'),
+    )
+
+
+class SubmissionArchive(SubmissionColumns, Base):
+    # Terminal submissions moved out of the hot table by SubmissionArchiver; read only by id lookups
+    __tablename__ = "submissions_archive"
+
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class ContentBlob(CompressedContentMixin, Base):
+    __tablename__ = "content_blobs"
+
+    digest = Column(String(64), primary_key=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class ValidationResult(Base):
+    __tablename__ = "validation_results"
+
+    digest = Column(String(64), primary_key=True)
+    validator_version = Column(String, primary_key=True)
+    is_valid = Column(Boolean, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class PollerLease(Base):
+    # One row per coordinated job; the holder must renew before expires_at or another process takes over
+    __tablename__ = "poller_leases"
+
+    name = Column(String, primary_key=True)
+    holder = Column(String, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+
+class SubmissionStatusCounter(Base):
+    # Maintained in the same transaction as every status transition; a status total is the sum
+    # of its shards, and writers pick a random shard so they do not all update one hot row
+    __tablename__ = "submission_status_counters"
+
+    status = Column(SQLEnum(SubmissionStatus), primary_key=True)
+    shard = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    # Only ever increases; the sum over all rows is a cheap watermark for "anything changed" (list ETags)
+    changes = Column(Integer, nullable=False, default=0)
+
+
+class RevalidationJob(Base):
+    # Checkpoint of a bulk revalidation: last_id is the keyset cursor over submissions.id and is
+    # committed together with each chunk's verdicts, so a resumed job neither skips nor repeats work
+    __tablename__ = "revalidation_jobs"
+
+    id = Column(String, primary_key=True)
+    validator_version = Column(String, nullable=False)
+    status = Column(SQLEnum(RevalidationStatus), nullable=False)
+    holder = Column(String, nullable=True)  # process running the job; updated_at doubles as its heartbeat
+    last_id = Column(String, nullable=False, default='')
+    scanned = Column(Integer, nullable=False, default=0)
+    changed = Column(Integer, nullable=False, default=0)
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
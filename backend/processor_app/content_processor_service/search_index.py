@@ -0,0 +1,62 @@
+"""SQLite FTS5 index over submission content.
+
+The index keeps its own copy of the plain text, written in the same transaction
+as the submission, because stored content may be compressed or only referenced
+by digest. That copy costs the space dedup and compression save, so the index is
+opt-in. Archiving removes a row's entry in the same transaction as the move, so
+the index only covers the hot table.
+"""
+
+from typing import Optional
+
+from sqlalchemy import bindparam, text
+
+SEARCH_TABLE = "submissions_fts"
+
+# Marks around matched terms in snippets and between non-adjacent fragments
+SNIPPET_START = "["
+SNIPPET_END = "]"
+SNIPPET_ELLIPSIS = "…"
+
+CREATE_SEARCH_TABLE = text(
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+    "USING fts5(submission_id UNINDEXED, content, tokenize = 'unicode61 remove_diacritics 2')"
+)
+SEARCH_TABLE_EXISTS = text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name")
+SEARCH_TABLE_ANY_ROW = text(f"SELECT 1 FROM {SEARCH_TABLE} LIMIT 1")
+INSERT_SEARCH_ROW = text(f"INSERT INTO {SEARCH_TABLE} (submission_id, content) VALUES (:submission_id, :content)")
+CLEAR_SEARCH_TABLE = text(f"DELETE FROM {SEARCH_TABLE}")
+DELETE_SEARCH_ROWS = text(
+    f"DELETE FROM {SEARCH_TABLE} WHERE submission_id IN :submission_ids"
+).bindparams(bindparam('submission_ids', expanding=True))
+
+
+class SearchUnavailableError(RuntimeError):
+    """Search is disabled, or the database has no FTS5 index"""
+
+
+def match_expression(query: str) -> Optional[str]:
+    """FTS5 query requiring every whitespace-separated term; a trailing * matches a prefix.
+    Terms are quoted, so FTS5 operators and punctuation in user input are taken literally."""
+    terms = []
+    for term in query.split():
+        prefix = term.endswith('*')
+        term = term.rstrip('*')
+        if term:
+            terms.append('"' + term.replace('"', '""') + '"' + ('*' if prefix else ''))
+    return " ".join(terms) or None
+
+
+def search_statement(filter_status: bool):
+    # ORDER BY rank is consumed by FTS5 itself, so rows stream out best first and the status
+    # filter and LIMIT stop the scan early instead of sorting every match in SQLite
+    return text(
+        "SELECT f.submission_id, s.status AS status, "
+        f"snippet({SEARCH_TABLE}, 1, :snippet_start, :snippet_end, :snippet_ellipsis, :snippet_tokens) AS snippet, "
+        "f.rank "
+        f"FROM {SEARCH_TABLE} AS f "
+        "JOIN submissions AS s ON s.id = f.submission_id "
+        f"WHERE {SEARCH_TABLE} MATCH :query "
+        f"{'AND s.status = :status ' if filter_status else ''}"
+        "ORDER BY f.rank LIMIT :limit OFFSET :offset"
+    )
@@ -0,0 +1,6 @@
+"""Leader election so only one process runs the poll consumer"""
+
+from processor_app.coordination.lease_election import LeaseLeaderElection
+from processor_app.coordination.file_lock_election import FileLockLeaderElection
+
+__all__ = ["LeaseLeaderElection", "FileLockLeaderElection"]
@@ -0,0 +1,43 @@
+import fcntl
+import logging
+import os
+from typing import Optional
+
+from processor_app.interfaces.leader_election import ILeaderElection
+
+logger = logging.getLogger(__name__)
+
+
+class FileLockLeaderElection(ILeaderElection):
+    # For processes sharing one host (uvicorn --workers with SQLite); the OS drops the lock when the holder dies
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._fd is not None
+
+    async def try_acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{os.getpid()}\n".encode())
+        self._fd = fd
+        logger.info(f"Process {os.getpid()} acquired poll lock {self.path}")
+        return True
+
+    async def release(self) -> None:
+        if self._fd is None:
+            return
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+        logger.info(f"Process {os.getpid()} released poll lock {self.path}")
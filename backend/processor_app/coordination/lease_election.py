@@ -0,0 +1,39 @@
+import logging
+
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.interfaces.leader_election import ILeaderElection
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseLeaderElection(ILeaderElection):
+    # Leadership is a row in poller_leases; a holder that stops renewing loses it after ttl_seconds
+
+    def __init__(self, repository: ContentProcessorRepository, name: str, holder: str, ttl_seconds: float):
+        self.repository = repository
+        self.name = name
+        self.holder = holder
+        self.ttl_seconds = ttl_seconds
+        self.is_leader = False
+
+    async def try_acquire(self) -> bool:
+        try:
+            acquired = await self.repository.acquire_lease(self.name, self.holder, self.ttl_seconds)
+        except Exception as e:
+            # Step down rather than risk two leaders when the lease cannot be renewed
+            logger.error(f"Failed to renew lease '{self.name}': {e}")
+            acquired = False
+        if acquired != self.is_leader:
+            logger.info(f"{self.holder} {'acquired' if acquired else 'lost'} lease '{self.name}'")
+        self.is_leader = acquired
+        return acquired
+
+    async def release(self) -> None:
+        if not self.is_leader:
+            return
+        self.is_leader = False
+        try:
+            await self.repository.release_lease(self.name, self.holder)
+            logger.info(f"{self.holder} released lease '{self.name}'")
+        except Exception as e:
+            logger.error(f"Failed to release lease '{self.name}': {e}")
@@ -1,24 +1,99 @@
+import importlib
 import logging
-from typing import Optional
+import os
+import socket
+import uuid
+from functools import partial
+from typing import Any, Dict, Optional, Tuple, Callable
 
 from processor_app.config import (
     USE_KAFKA,
     KAFKA_BOOTSTRAP_SERVERS,
     KAFKA_TOPIC,
-    KAFKA_GROUP_ID
+    KAFKA_GROUP_ID,
+    KAFKA_BACKEND,
+    MEMORY_BROKER_PARTITIONS,
+    MEMORY_BROKER_LATENCY_MS,
+    MEMORY_BROKER_FAILURE_RATE,
+    KAFKA_PAYLOAD_CODEC,
+    KAFKA_PAYLOAD_COMPRESSION_THRESHOLD,
+    KAFKA_CLAIM_CHECK_THRESHOLD,
+    KAFKA_MAX_POLL_RECORDS,
+    KAFKA_MESSAGE_FORMAT,
+    KAFKA_RETRY_TOPIC,
+    KAFKA_DLQ_TOPIC,
+    KAFKA_MAX_RETRIES,
+    KAFKA_RETRY_BACKOFF_MS,
+    KAFKA_RETRY_MAX_BACKOFF_MS,
+    KAFKA_RETRY_JITTER,
+    VALIDATION_CACHE_SIZE,
+    POLL_INTERVAL_SECONDS,
+    POLL_PROCESSING_DELAY_SECONDS,
+    POLL_OVERLOAD_RETRIES,
+    POLL_OVERLOAD_BACKOFF_MS,
+    POLL_BATCH_SIZE,
+    POLL_MAX_CONCURRENCY,
+    POLL_LANE_WEIGHTS,
+    POLL_COORDINATION,
+    POLL_LEASE_SECONDS,
+    POLL_LOCK_FILE,
+    ADAPTIVE_CONCURRENCY,
+    ADAPTIVE_INITIAL_LIMIT,
+    ADAPTIVE_MIN_LIMIT,
+    ADAPTIVE_MAX_LIMIT,
+    ADAPTIVE_TARGET_LATENCY_MS,
+    ADAPTIVE_BACKOFF_RATIO
 )
 from processor_app.repositories.repository import Repository
 from processor_app.repositories.processor_repository import ProcessorRepository
-from processor_app.producers.kafka_producer import KafkaProducerImpl
-from processor_app.producers.fastapi_trigger import FastAPITrigger
-from processor_app.consumers.kafka_consumer import KafkaConsumer
-from processor_app.consumers.fastapi_poll import FastAPIPoll
+from processor_app.consumers.retry_policy import RetryPolicy
+from processor_app.consumers.lane_scheduler import parse_lane_weights
+from processor_app.consumers.adaptive_limiter import AdaptiveConcurrencyLimiter
+from processor_app.validators.validation_cache import ValidationCache
 
 logger = logging.getLogger(__name__)
 
+# Backends are imported on first use so the API does not pay for kafka-python, the Kafka
+# message serializers (or the broker simulator) when they are not configured
+_BACKENDS: Dict[str, Dict[str, str]] = {
+    'producer': {
+        'kafka': 'processor_app.producers.kafka_producer:KafkaProducerImpl',
+        'poll': 'processor_app.producers.fastapi_trigger:FastAPITrigger',
+    },
+    'consumer': {
+        'kafka': 'processor_app.consumers.kafka_consumer:KafkaConsumer',
+        'poll': 'processor_app.consumers.fastapi_poll:FastAPIPoll',
+    },
+    'leader_election': {
+        'lease': 'processor_app.coordination.lease_election:LeaseLeaderElection',
+        'file': 'processor_app.coordination.file_lock_election:FileLockLeaderElection',
+    },
+    'serializer': {
+        'lookup': 'processor_app.serializers.message_format:get_serializer',
+    },
+    'memory_broker': {
+        'broker': 'processor_app.infra.memory_broker:get_broker',
+        'producer': 'processor_app.infra.memory_broker:MemoryKafkaProducer',
+        'consumer': 'processor_app.infra.memory_broker:MemoryKafkaConsumer',
+    },
+}
+
 
 class Factory:
     _repository: Optional[Repository] = None
+    _loaded: Dict[Tuple[str, str], Any] = {}
+
+    @staticmethod
+    def load_backend(kind: str, name: str) -> Any:
+        key = (kind, name)
+        if key not in Factory._loaded:
+            try:
+                target = _BACKENDS[kind][name]
+            except KeyError:
+                raise ValueError(f"Unknown {kind} backend '{name}'")
+            module_name, _, attribute = target.partition(':')
+            Factory._loaded[key] = getattr(importlib.import_module(module_name), attribute)
+        return Factory._loaded[key]
 
     @staticmethod
     def _get_kafka_settings():
@@ -28,6 +103,23 @@ class Factory:
     def _is_kafka_enabled() -> bool:
         return USE_KAFKA
     
+    @staticmethod
+    def _get_kafka_clients() -> Tuple[Optional[Callable], Optional[Callable]]:
+        # None keeps the kafka-python clients
+        if KAFKA_BACKEND == 'memory':
+            broker = Factory.load_backend('memory_broker', 'broker')(
+                num_partitions=MEMORY_BROKER_PARTITIONS,
+                latency_ms=MEMORY_BROKER_LATENCY_MS,
+                failure_rate=MEMORY_BROKER_FAILURE_RATE
+            )
+            return (
+                partial(Factory.load_backend('memory_broker', 'producer'), broker=broker),
+                partial(Factory.load_backend('memory_broker', 'consumer'), broker=broker)
+            )
+        if KAFKA_BACKEND != 'kafka':
+            raise ValueError(f"Unknown KAFKA_BACKEND '{KAFKA_BACKEND}'")
+        return None, None
+
     @staticmethod
     def get_repository() -> Repository:
         if Factory._repository is None:
@@ -37,19 +129,97 @@ class Factory:
     @staticmethod
     def get_producer():
         if Factory._is_kafka_enabled():
-            logger.info("3. Using Kafka producer")
+            logger.info(f"3. Using Kafka producer ({KAFKA_BACKEND})")
             kafka_servers, kafka_topic, _ = Factory._get_kafka_settings()
-            return KafkaProducerImpl(kafka_servers, kafka_topic)
+            producer_client, _ = Factory._get_kafka_clients()
+            return Factory.load_backend('producer', 'kafka')(
+                kafka_servers, kafka_topic,
+                payload_codec=KAFKA_PAYLOAD_CODEC,
+                payload_compression_threshold=KAFKA_PAYLOAD_COMPRESSION_THRESHOLD,
+                claim_check_threshold=KAFKA_CLAIM_CHECK_THRESHOLD,
+                serializer=Factory.load_backend('serializer', 'lookup')(KAFKA_MESSAGE_FORMAT),
+                client_factory=producer_client
+            )
         else:
             logger.info("3. Using FastAPI poll")
-            return FastAPITrigger()
+            return Factory.load_backend('producer', 'poll')()
     
+    @staticmethod
+    def get_validation_cache(repository) -> Optional[ValidationCache]:
+        if VALIDATION_CACHE_SIZE <= 0:
+            return None
+        return ValidationCache(repository, VALIDATION_CACHE_SIZE)
+
+    @staticmethod
+    def get_leader_election(repository):
+        if POLL_COORDINATION == 'none':
+            return None
+        if POLL_COORDINATION == 'lease':
+            holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+            return Factory.load_backend('leader_election', 'lease')(
+                repository, "fastapi-poll", holder, POLL_LEASE_SECONDS
+            )
+        if POLL_COORDINATION == 'file':
+            return Factory.load_backend('leader_election', 'file')(POLL_LOCK_FILE)
+        raise ValueError(f"Unknown POLL_COORDINATION '{POLL_COORDINATION}'")
+
+    @staticmethod
+    def get_concurrency_limiter(name: str, max_limit: int = ADAPTIVE_MAX_LIMIT) -> Optional[AdaptiveConcurrencyLimiter]:
+        if not ADAPTIVE_CONCURRENCY:
+            return None
+        return AdaptiveConcurrencyLimiter(
+            initial_limit=ADAPTIVE_INITIAL_LIMIT,
+            min_limit=ADAPTIVE_MIN_LIMIT,
+            max_limit=max_limit,
+            target_latency=ADAPTIVE_TARGET_LATENCY_MS / 1000,
+            backoff_ratio=ADAPTIVE_BACKOFF_RATIO,
+            name=name
+        )
+
     @staticmethod
     def get_consumer(repository, validator):
+        validation_cache = Factory.get_validation_cache(repository)
         if Factory._is_kafka_enabled():
-            logger.info("4. Using Kafka consumer")
+            logger.info(f"4. Using Kafka consumer ({KAFKA_BACKEND})")
             kafka_servers, kafka_topic, kafka_group_id = Factory._get_kafka_settings()
-            return KafkaConsumer(repository, validator, kafka_servers, kafka_topic, kafka_group_id)
+            producer_client, consumer_client = Factory._get_kafka_clients()
+            retry_producer = None
+            if KAFKA_RETRY_TOPIC:
+                retry_producer = Factory.load_backend('producer', 'kafka')(
+                    kafka_servers,
+                    serializer=Factory.load_backend('serializer', 'lookup')(KAFKA_MESSAGE_FORMAT),
+                    client_factory=producer_client
+                )
+            return Factory.load_backend('consumer', 'kafka')(
+                repository, validator, kafka_servers, kafka_topic, kafka_group_id,
+                validation_cache=validation_cache,
+                max_poll_records=KAFKA_MAX_POLL_RECORDS,
+                client_factory=consumer_client,
+                retry_producer=retry_producer,
+                retry_topic=KAFKA_RETRY_TOPIC or None,
+                dlq_topic=KAFKA_DLQ_TOPIC or None,
+                retry_policy=RetryPolicy(
+                    KAFKA_MAX_RETRIES, KAFKA_RETRY_BACKOFF_MS, KAFKA_RETRY_MAX_BACKOFF_MS, KAFKA_RETRY_JITTER
+                ),
+                # More slots than records per poll could never be used
+                concurrency_limiter=Factory.get_concurrency_limiter(
+                    "kafka", min(ADAPTIVE_MAX_LIMIT, KAFKA_MAX_POLL_RECORDS)
+                )
+            )
         else:
             logger.info("4. Using FastAPI poll")
-            return FastAPIPoll(repository, validator)
\ No newline at end of file
+            return Factory.load_backend('consumer', 'poll')(
+                repository, validator,
+                poll_interval=POLL_INTERVAL_SECONDS,
+                validation_cache=validation_cache,
+                processing_delay=POLL_PROCESSING_DELAY_SECONDS,
+                leader_election=Factory.get_leader_election(repository),
+                lane_weights=parse_lane_weights(POLL_LANE_WEIGHTS),
+                batch_size=POLL_BATCH_SIZE,
+                max_concurrency=POLL_MAX_CONCURRENCY,
+                concurrency_limiter=Factory.get_concurrency_limiter(
+                    "poll", min(ADAPTIVE_MAX_LIMIT, POLL_MAX_CONCURRENCY) if POLL_MAX_CONCURRENCY > 0 else ADAPTIVE_MAX_LIMIT
+                ),
+                overload_retries=POLL_OVERLOAD_RETRIES,
+                overload_backoff=POLL_OVERLOAD_BACKOFF_MS / 1000
+            )
@@ -0,0 +1,381 @@
+"""In-process stand-in for a Kafka broker.
+
+MemoryKafkaProducer and MemoryKafkaConsumer mirror the subset of the
+kafka-python client API used by KafkaProducerImpl and KafkaConsumer, so the
+Kafka path can be run, benchmarked and soak-tested without a network broker.
+Topics have a fixed number of partitions, consumer groups split partitions
+between members and resume from committed offsets, and latency and failures
+can be injected per operation.
+"""
+
+import itertools
+import logging
+import random
+import threading
+import time
+import zlib
+from collections import namedtuple
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Field-compatible with kafka.structs / kafka.consumer.fetcher; namedtuples compare equal across both
+TopicPartition = namedtuple('TopicPartition', ['topic', 'partition'])
+OffsetAndMetadata = namedtuple('OffsetAndMetadata', ['offset', 'metadata'])
+RecordMetadata = namedtuple('RecordMetadata', ['topic', 'partition', 'offset', 'timestamp'])
+ConsumerRecord = namedtuple('ConsumerRecord', [
+    'topic', 'partition', 'offset', 'timestamp', 'timestamp_type',
+    'key', 'value', 'headers', 'checksum',
+    'serialized_key_size', 'serialized_value_size', 'serialized_header_size'
+])
+
+
+class MemoryBrokerError(Exception):
+    """Raised for injected failures and misuse of a closed client"""
+
+
+class _Record:
+    __slots__ = ('key', 'value', 'timestamp')
+
+    def __init__(self, key: Optional[bytes], value: bytes, timestamp: int):
+        self.key = key
+        self.value = value
+        self.timestamp = timestamp
+
+
+class MemoryBroker:
+    """Topics, committed group offsets and group membership shared by all clients of one broker"""
+
+    def __init__(
+        self,
+        num_partitions: int = 3,
+        latency_ms: float = 0,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        self.num_partitions = num_partitions
+        self.latency_ms = latency_ms
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._topics: Dict[str, List[List[_Record]]] = {}
+        self._committed: Dict[str, Dict[TopicPartition, int]] = {}
+        self._members: Dict[str, List[object]] = {}
+        self._generations: Dict[str, int] = {}
+        self._round_robin = itertools.count()
+        self._appended = 0
+        self._lock = threading.Condition()
+
+    def create_topic(self, topic: str, num_partitions: Optional[int] = None) -> None:
+        with self._lock:
+            if topic not in self._topics:
+                self._topics[topic] = [[] for _ in range(num_partitions or self.num_partitions)]
+
+    def partitions_for(self, topic: str) -> List[int]:
+        self.create_topic(topic)
+        return list(range(len(self._topics[topic])))
+
+    def inject(self, operation: str) -> None:
+        """Apply the configured latency and fail the operation with probability failure_rate"""
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            raise MemoryBrokerError(f"Injected {operation} failure")
+
+    def append(self, topic: str, value: bytes, key: Optional[bytes] = None, partition: Optional[int] = None) -> RecordMetadata:
+        self.create_topic(topic)
+        with self._lock:
+            partitions = self._topics[topic]
+            if partition is None:
+                # Same routing idea as the Kafka default partitioner: keyed records stick to one partition
+                partition = (zlib.crc32(key) if key is not None else next(self._round_robin)) % len(partitions)
+            timestamp = int(time.time() * 1000)
+            log = partitions[partition]
+            log.append(_Record(key, value, timestamp))
+            self._appended += 1
+            self._lock.notify_all()
+            return RecordMetadata(topic, partition, len(log) - 1, timestamp)
+
+    def fetch(self, tp: TopicPartition, offset: int, max_records: int) -> List[ConsumerRecord]:
+        with self._lock:
+            log = self._topics[tp.topic][tp.partition]
+            return [
+                ConsumerRecord(
+                    tp.topic, tp.partition, position, record.timestamp, 0,
+                    record.key, record.value, [], None,
+                    len(record.key) if record.key is not None else -1, len(record.value), -1
+                )
+                for position, record in enumerate(log[offset:offset + max_records], start=offset)
+            ]
+
+    def end_offset(self, tp: TopicPartition) -> int:
+        self.create_topic(tp.topic)
+        with self._lock:
+            return len(self._topics[tp.topic][tp.partition])
+
+    @property
+    def appended(self) -> int:
+        return self._appended
+
+    def wait_for_records(self, seen: int, timeout: float) -> None:
+        # Returns once anything was appended after `seen`, so a record written mid-poll is not missed
+        with self._lock:
+            self._lock.wait_for(lambda: self._appended != seen, timeout)
+
+    def commit(self, group_id: str, offsets: Dict[TopicPartition, int]) -> None:
+        with self._lock:
+            self._committed.setdefault(group_id, {}).update(offsets)
+
+    def committed(self, group_id: str, tp: TopicPartition) -> Optional[int]:
+        with self._lock:
+            return self._committed.get(group_id, {}).get(tp)
+
+    def lag(self, group_id: str, topic: str) -> int:
+        """Records not yet committed by the group, summed over partitions"""
+        return sum(
+            self.end_offset(TopicPartition(topic, p)) - (self.committed(group_id, TopicPartition(topic, p)) or 0)
+            for p in self.partitions_for(topic)
+        )
+
+    def join(self, group_id: str, member: object) -> None:
+        with self._lock:
+            self._members.setdefault(group_id, []).append(member)
+            self._generations[group_id] = self._generations.get(group_id, 0) + 1
+
+    def leave(self, group_id: str, member: object) -> None:
+        with self._lock:
+            members = self._members.get(group_id, [])
+            if member in members:
+                members.remove(member)
+                self._generations[group_id] = self._generations.get(group_id, 0) + 1
+
+    def generation(self, group_id: str) -> int:
+        with self._lock:
+            return self._generations.get(group_id, 0)
+
+    def assignment_for(self, group_id: str, member: object, topics: List[str]) -> List[TopicPartition]:
+        # Round-robin over the group's members, ordered by join time
+        partitions = [TopicPartition(t, p) for t in topics for p in self.partitions_for(t)]
+        with self._lock:
+            members = self._members.get(group_id, [member])
+            index, size = members.index(member), len(members)
+        return [tp for i, tp in enumerate(partitions) if i % size == index]
+
+
+_brokers: Dict[str, MemoryBroker] = {}
+_brokers_lock = threading.Lock()
+
+
+def get_broker(name: str = "default", **options) -> MemoryBroker:
+    """Process-wide named brokers so a producer and consumer built separately meet on the same topics"""
+    with _brokers_lock:
+        if name not in _brokers:
+            _brokers[name] = MemoryBroker(**options)
+        return _brokers[name]
+
+
+def reset_brokers() -> None:
+    with _brokers_lock:
+        _brokers.clear()
+
+
+class _SendFuture:
+
+    def __init__(self, metadata: Optional[RecordMetadata] = None, error: Optional[Exception] = None):
+        self._metadata = metadata
+        self._error = error
+
+    def get(self, timeout: Optional[float] = None) -> RecordMetadata:
+        if self._error:
+            raise self._error
+        return self._metadata
+
+    def succeeded(self) -> bool:
+        return self._error is None
+
+    def failed(self) -> bool:
+        return self._error is not None
+
+
+class MemoryKafkaProducer:
+
+    def __init__(
+        self,
+        bootstrap_servers=None,
+        value_serializer: Optional[Callable] = None,
+        key_serializer: Optional[Callable] = None,
+        broker: Optional[MemoryBroker] = None,
+        **configs
+    ):
+        # kafka-python tuning options (acks, retries, ...) are accepted and ignored
+        self.broker = broker or get_broker()
+        self.value_serializer = value_serializer
+        self.key_serializer = key_serializer
+        self._closed = False
+
+    def send(self, topic: str, value=None, key=None, partition: Optional[int] = None, **kwargs) -> _SendFuture:
+        if self._closed:
+            raise MemoryBrokerError("Producer is closed")
+        value_bytes = self.value_serializer(value) if self.value_serializer else value
+        key_bytes = self.key_serializer(key) if self.key_serializer and key is not None else key
+        try:
+            self.broker.inject("send")
+        except MemoryBrokerError as e:
+            return _SendFuture(error=e)
+        return _SendFuture(self.broker.append(topic, value_bytes, key_bytes, partition))
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        pass
+
+    def partitions_for(self, topic: str) -> set:
+        return set(self.broker.partitions_for(topic))
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        self._closed = True
+
+
+class MemoryKafkaConsumer:
+
+    def __init__(
+        self,
+        *topics: str,
+        bootstrap_servers=None,
+        group_id: Optional[str] = None,
+        auto_offset_reset: str = 'latest',
+        enable_auto_commit: bool = True,
+        value_deserializer: Optional[Callable] = None,
+        key_deserializer: Optional[Callable] = None,
+        max_poll_records: int = 500,
+        broker: Optional[MemoryBroker] = None,
+        **configs
+    ):
+        self.broker = broker or get_broker()
+        self.topics = list(topics)
+        self.group_id = group_id
+        self.auto_offset_reset = auto_offset_reset
+        self.enable_auto_commit = enable_auto_commit
+        self.value_deserializer = value_deserializer
+        self.key_deserializer = key_deserializer
+        self.max_poll_records = max_poll_records
+        self._positions: Dict[TopicPartition, int] = {}
+        self._paused: set = set()
+        self._generation = -1
+        self._closed = False
+        for topic in self.topics:
+            self.broker.create_topic(topic)
+        if self.group_id:
+            self.broker.join(self.group_id, self)
+
+    def _rebalance(self) -> None:
+        group = self.group_id or f"_standalone-{id(self)}"
+        generation = self.broker.generation(group) if self.group_id else 0
+        if generation == self._generation:
+            return
+        self._generation = generation
+        assigned = (
+            self.broker.assignment_for(self.group_id, self, self.topics)
+            if self.group_id
+            else [TopicPartition(t, p) for t in self.topics for p in self.broker.partitions_for(t)]
+        )
+        positions = {}
+        for tp in assigned:
+            if tp in self._positions:
+                positions[tp] = self._positions[tp]
+                continue
+            committed = self.broker.committed(self.group_id, tp) if self.group_id else None
+            if committed is not None:
+                positions[tp] = committed
+            else:
+                positions[tp] = 0 if self.auto_offset_reset == 'earliest' else self.broker.end_offset(tp)
+        self._positions = positions
+        self._paused &= set(positions)
+
+    def poll(self, timeout_ms: int = 0, max_records: Optional[int] = None, update_offsets: bool = True) -> Dict[TopicPartition, List[ConsumerRecord]]:
+        if self._closed:
+            raise MemoryBrokerError("Consumer is closed")
+        self.broker.inject("poll")
+        deadline = time.monotonic() + timeout_ms / 1000
+        budget = max_records or self.max_poll_records
+        while True:
+            seen = self.broker.appended
+            self._rebalance()
+            batch: Dict[TopicPartition, List[ConsumerRecord]] = {}
+            remaining = budget
+            for tp, position in self._positions.items():
+                if tp in self._paused or remaining <= 0:
+                    continue
+                records = self.broker.fetch(tp, position, remaining)
+                if not records:
+                    continue
+                if self.value_deserializer or self.key_deserializer:
+                    records = [self._deserialize(record) for record in records]
+                batch[tp] = records
+                remaining -= len(records)
+                if update_offsets:
+                    self._positions[tp] = position + len(records)
+            if batch:
+                if self.enable_auto_commit:
+                    self.commit()
+                return batch
+            wait = deadline - time.monotonic()
+            if wait <= 0:
+                return {}
+            self.broker.wait_for_records(seen, wait)
+
+    def _deserialize(self, record: ConsumerRecord) -> ConsumerRecord:
+        value = self.value_deserializer(record.value) if self.value_deserializer else record.value
+        key = record.key
+        if self.key_deserializer and key is not None:
+            key = self.key_deserializer(key)
+        return record._replace(key=key, value=value)
+
+    def commit(self, offsets: Optional[Dict[TopicPartition, OffsetAndMetadata]] = None) -> None:
+        if not self.group_id:
+            raise MemoryBrokerError("Committing offsets requires a group_id")
+        self.broker.inject("commit")
+        if offsets is None:
+            committed = dict(self._positions)
+        else:
+            committed = {TopicPartition(*tp): meta.offset for tp, meta in offsets.items()}
+        self.broker.commit(self.group_id, committed)
+
+    def committed(self, partition: TopicPartition) -> Optional[int]:
+        return self.broker.committed(self.group_id, partition) if self.group_id else None
+
+    def assignment(self) -> set:
+        self._rebalance()
+        return set(self._positions)
+
+    def position(self, partition: TopicPartition) -> int:
+        self._rebalance()
+        return self._positions[partition]
+
+    def seek(self, partition: TopicPartition, offset: int) -> None:
+        self._rebalance()
+        if partition not in self._positions:
+            raise MemoryBrokerError(f"Partition {partition} is not assigned to this consumer")
+        self._positions[partition] = offset
+
+    def pause(self, *partitions: TopicPartition) -> None:
+        self._paused.update(partitions)
+
+    def resume(self, *partitions: TopicPartition) -> None:
+        self._paused.difference_update(partitions)
+
+    def paused(self) -> set:
+        return set(self._paused)
+
+    def partitions_for_topic(self, topic: str) -> set:
+        return set(self.broker.partitions_for(topic))
+
+    def end_offsets(self, partitions: List[TopicPartition]) -> Dict[TopicPartition, int]:
+        return {tp: self.broker.end_offset(tp) for tp in partitions}
+
+    def close(self, autocommit: bool = True) -> None:
+        if self._closed:
+            return
+        if autocommit and self.enable_auto_commit and self.group_id:
+            self.commit()
+        self._closed = True
+        if self.group_id:
+            self.broker.leave(self.group_id, self)
+        logger.debug(f"Memory consumer for group '{self.group_id}' closed")
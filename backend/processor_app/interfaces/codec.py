@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+
+
+class ICodec(ABC):
+    name: str
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        pass
+
+    @abstractmethod
+    def decompress(self, data: bytes) -> bytes:
+        pass
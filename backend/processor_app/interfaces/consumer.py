@@ -14,3 +14,7 @@ class IConsumer(ABC):
     @abstractmethod
     async def is_running(self) -> bool:
         pass
+
+    async def drain(self, timeout: float) -> None:
+        # Stop taking new work and let in-flight submissions finish; consumers without in-flight state just stop
+        await self.shutdown()
@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+
+
+class ILeaderElection(ABC):
+
+    @abstractmethod
+    async def try_acquire(self) -> bool:
+        """Acquire or renew leadership; called once per poll iteration"""
+        pass
+
+    @abstractmethod
+    async def release(self) -> None:
+        pass
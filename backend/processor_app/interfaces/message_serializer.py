@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+
+
+class IMessageSerializer(ABC):
+    name: str
+
+    @abstractmethod
+    def serialize(self, message: dict) -> bytes:
+        pass
+
+    @abstractmethod
+    def deserialize(self, data: bytes) -> dict:
+        pass
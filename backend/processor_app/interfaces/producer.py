@@ -1,10 +1,11 @@
 from abc import ABC, abstractmethod
+from typing import Optional
 
 
 class IProducer(ABC):
     
     @abstractmethod
-    def produce(self, submission_id: str, content: str) -> None:
+    def produce(self, submission_id: str, content: str, digest: Optional[str] = None) -> None:
         pass
     
     @abstractmethod
@@ -1,8 +1,15 @@
 from abc import ABC, abstractmethod
+from typing import List, Sequence
 
 
 class IContentValidator(ABC):
+    # Bump whenever the rules change so memoized verdicts are not reused
+    version: str = "1"
 
     @abstractmethod
     def validate(self, content: str) -> bool:
         pass
+
+    def validate_batch(self, contents: Sequence[str]) -> List[bool]:
+        # Bulk revalidation entry point; override when rules can be applied to many contents more cheaply
+        return [self.validate(content) for content in contents]
@@ -0,0 +1 @@
+"""Background maintenance jobs"""
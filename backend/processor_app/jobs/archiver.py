@@ -0,0 +1,84 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.metrics.pipeline_metrics import SUBMISSIONS_ARCHIVED
+from processor_app.config import (
+    ARCHIVE_AFTER_DAYS,
+    ARCHIVE_INTERVAL_SECONDS,
+    ARCHIVE_BATCH_SIZE,
+    ARCHIVE_BATCH_PAUSE_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SubmissionArchiver:
+    # Keeps the hot submissions table bounded by moving old terminal rows to submissions_archive
+
+    def __init__(
+        self,
+        repository: ContentProcessorRepository,
+        interval_seconds: float = ARCHIVE_INTERVAL_SECONDS,
+        archive_after_days: float = ARCHIVE_AFTER_DAYS,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+        batch_pause_seconds: float = ARCHIVE_BATCH_PAUSE_SECONDS
+    ):
+        self.repository = repository
+        self.interval_seconds = interval_seconds
+        self.retention = timedelta(days=archive_after_days)
+        self.batch_size = batch_size
+        self.batch_pause_seconds = batch_pause_seconds
+        self.running = False
+        self._task: Optional[asyncio.Task] = None
+        self.runs_total = 0
+        self.archived_total = 0
+
+    async def start(self) -> None:
+        self.running = True
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Submission archiver started (every {self.interval_seconds}s, "
+            f"after {self.retention.total_seconds() / 86400:g} days, batches of {self.batch_size})"
+        )
+
+    async def shutdown(self) -> None:
+        self.running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        logger.info("Submission archiver shut down")
+
+    async def is_running(self) -> bool:
+        return self.running and self._task is not None and not self._task.done()
+
+    async def archive_once(self) -> int:
+        cutoff = datetime.utcnow() - self.retention
+        archived = 0
+        while True:
+            moved = await self.repository.archive_terminal(cutoff, self.batch_size)
+            archived += moved
+            SUBMISSIONS_ARCHIVED.inc(moved)
+            if moved < self.batch_size:
+                break
+            # Each batch is its own short transaction; the pause lets API writes take the lock in between
+            await asyncio.sleep(self.batch_pause_seconds)
+
+        self.runs_total += 1
+        self.archived_total += archived
+        if archived:
+            logger.info(f"Archived {archived} submissions processed before {cutoff.isoformat()}")
+        return archived
+
+    async def _run(self) -> None:
+        while self.running:
+            try:
+                await self.archive_once()
+            except Exception as e:
+                logger.error(f"Error in submission archiver: {e}")
+            await asyncio.sleep(self.interval_seconds)
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from time import monotonic
+from typing import Optional
+
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.content_processor_service.schema import RevalidationJob, RevalidationStatus
+from processor_app.interfaces.validator import IContentValidator
+from processor_app.metrics.pipeline_metrics import SUBMISSIONS_REVALIDATED
+from processor_app.config import (
+    REVALIDATION_CHUNK_SIZE,
+    REVALIDATION_ROWS_PER_SECOND,
+    REVALIDATION_STALE_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SubmissionRevalidator:
+    # Re-runs the validator over PASSED/FAILED submissions after a rule change. A process runs at most
+    # one job; its checkpoint row lets any process resume it after a pause or crash. Only the hot table
+    # is scanned: archived rows keep the verdict (and validator_version) they were archived with.
+
+    def __init__(
+        self,
+        repository: ContentProcessorRepository,
+        validator: IContentValidator,
+        chunk_size: int = REVALIDATION_CHUNK_SIZE,
+        rows_per_second: float = REVALIDATION_ROWS_PER_SECOND,
+        stale_seconds: float = REVALIDATION_STALE_SECONDS,
+        holder: Optional[str] = None
+    ):
+        self.repository = repository
+        self.validator = validator
+        self.chunk_size = max(chunk_size, 1)
+        self.rows_per_second = rows_per_second
+        self.stale_after = timedelta(seconds=stale_seconds)
+        self.holder = holder or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.job: Optional[RevalidationJob] = None
+        self.cursor = ''
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> Optional[RevalidationJob]:
+        """Starts a job for the current validator version; None while a job is already running"""
+        if await self.is_running():
+            return None
+        job = await self.repository.create_revalidation_job(
+            self.validator.version, self.holder, self._stale_before()
+        )
+        if job is not None:
+            self._launch(job)
+        return job
+
+    async def resume(self, job_id: str) -> Optional[RevalidationJob]:
+        """Continues a paused, failed or abandoned job from its checkpoint; None if it cannot be claimed"""
+        if await self.is_running():
+            return None
+        job = await self.repository.claim_revalidation_job(
+            job_id, self.validator.version, self.holder, self._stale_before()
+        )
+        if job is not None:
+            self._launch(job)
+        return job
+
+    async def pause(self, job_id: str) -> bool:
+        return await self.repository.pause_revalidation_job(job_id)
+
+    async def shutdown(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            # Leave it PAUSED rather than RUNNING so it can be resumed without waiting for staleness
+            try:
+                await self.repository.pause_revalidation_job(self.job.id, self.holder)
+            except Exception as e:
+                logger.error(f"Failed to pause revalidation job {self.job.id}: {e}")
+        logger.info("Submission revalidator shut down")
+
+    async def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def revalidate_chunk(self) -> Optional[int]:
+        """Validates and writes the next chunk; returns the rows scanned (below chunk_size at the end)
+        or None when the job was paused or taken over"""
+        job = self.job
+        rows = await self.repository.revalidation_chunk(self.cursor, self.chunk_size, job.validator_version)
+        if not rows:
+            return 0
+
+        # Validate each distinct content once; duplicates are common and the batch runs off the event loop
+        contents = list(dict.fromkeys(content for _, _, _, content in rows if content is not None))
+        verdicts = dict(zip(contents, await asyncio.to_thread(self.validator.validate_batch, contents)))
+        by_id, by_digest = {}, {}
+        for submission_id, status, digest, content in rows:
+            if content is None:
+                continue
+            is_valid = verdicts[content]
+            by_id[submission_id] = (status, is_valid)
+            if digest:
+                by_digest[digest] = is_valid
+
+        last_id = rows[-1][0]
+        changed = await self.repository.apply_revalidation(
+            job.id, self.holder, job.validator_version, last_id, by_id, by_digest
+        )
+        if changed is None:
+            return None
+        self.cursor = last_id
+        SUBMISSIONS_REVALIDATED.labels("changed").inc(changed)
+        SUBMISSIONS_REVALIDATED.labels("unchanged").inc(len(by_id) - changed)
+        return len(rows)
+
+    def _launch(self, job: RevalidationJob) -> None:
+        self.job = job
+        self.cursor = job.last_id or ''
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Revalidation job {job.id} started for validator version {job.validator_version} "
+            f"(chunks of {self.chunk_size}" + (f", {self.rows_per_second:g} rows/s" if self.rows_per_second > 0 else "")
+            + (f", resuming after {self.cursor}" if self.cursor else "") + ")"
+        )
+
+    def _stale_before(self) -> datetime:
+        return datetime.utcnow() - self.stale_after
+
+    async def _run(self) -> None:
+        job = self.job
+        try:
+            while True:
+                started = monotonic()
+                scanned = await self.revalidate_chunk()
+                if scanned is None:
+                    logger.info(f"Revalidation job {job.id} paused after {self.cursor or 'the start'}")
+                    return
+                if scanned < self.chunk_size:
+                    await self.repository.finish_revalidation_job(job.id, self.holder, RevalidationStatus.COMPLETED)
+                    logger.info(f"Revalidation job {job.id} completed")
+                    return
+                if self.rows_per_second > 0:
+                    delay = scanned / self.rows_per_second - (monotonic() - started)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                else:
+                    # Still yield between chunks so requests are served while a job runs unthrottled
+                    await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Revalidation job {job.id} failed: {e}")
+            try:
+                await self.repository.finish_revalidation_job(job.id, self.holder, RevalidationStatus.FAILED, str(e))
+            except Exception as db_error:
+                logger.error(f"Failed to record revalidation failure for {job.id}: {db_error}")
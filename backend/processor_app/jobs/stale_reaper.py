@@ -0,0 +1,103 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional, Union
+
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.content_processor_service.schema import SubmissionStatus
+from processor_app.metrics.pipeline_metrics import SUBMISSIONS_REAPED
+from processor_app.config import (
+    PROCESSING_TIMEOUT_MINUTES,
+    REAPER_INTERVAL_SECONDS,
+    REAPER_BATCH_SIZE,
+    REAPER_RESET_STATUS
+)
+
+logger = logging.getLogger(__name__)
+
+# PENDING retries an abandoned claim, FAILED gives up on it
+RESET_STATUSES = (SubmissionStatus.PENDING, SubmissionStatus.FAILED)
+
+
+class StaleSubmissionReaper:
+    # Resets PROCESSING claims abandoned by crashed workers; the processor only notices them on redelivery
+
+    def __init__(
+        self,
+        repository: ContentProcessorRepository,
+        interval_seconds: float = REAPER_INTERVAL_SECONDS,
+        timeout_minutes: float = PROCESSING_TIMEOUT_MINUTES,
+        batch_size: int = REAPER_BATCH_SIZE,
+        reset_status: Union[SubmissionStatus, str] = REAPER_RESET_STATUS
+    ):
+        self.repository = repository
+        self.interval_seconds = interval_seconds
+        self.timeout = timedelta(minutes=timeout_minutes)
+        self.batch_size = batch_size
+        self.reset_status = self._parse_reset_status(reset_status)
+        self.running = False
+        self._task: Optional[asyncio.Task] = None
+        self.runs_total = 0
+        self.reaped_total = 0
+        self.requeued_total = 0
+
+    async def start(self) -> None:
+        self.running = True
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Stale submission reaper started (every {self.interval_seconds}s, "
+            f"timeout {self.timeout.total_seconds():.0f}s, reset to {self.reset_status.value})"
+        )
+
+    async def shutdown(self) -> None:
+        self.running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        logger.info("Stale submission reaper shut down")
+
+    async def is_running(self) -> bool:
+        return self.running and self._task is not None and not self._task.done()
+
+    @staticmethod
+    def _parse_reset_status(reset_status: Union[SubmissionStatus, str]) -> SubmissionStatus:
+        # Checked here rather than at import, so a typo in REAPER_RESET_STATUS names the setting
+        try:
+            status = SubmissionStatus(reset_status)
+        except ValueError:
+            status = None
+        if status not in RESET_STATUSES:
+            raise ValueError(
+                f"REAPER_RESET_STATUS must be one of {', '.join(s.value for s in RESET_STATUSES)}, got {reset_status!r}"
+            )
+        return status
+
+    async def reap_once(self) -> int:
+        cutoff = datetime.utcnow() - self.timeout
+        reaped = 0
+        while True:
+            submission_ids = await self.repository.reap_stale(cutoff, self.reset_status, self.batch_size)
+            reaped += len(submission_ids)
+            if submission_ids and self.reset_status == SubmissionStatus.PENDING:
+                await self.repository.requeue(submission_ids)
+                self.requeued_total += len(submission_ids)
+            if len(submission_ids) < self.batch_size:
+                break
+
+        self.runs_total += 1
+        self.reaped_total += reaped
+        SUBMISSIONS_REAPED.labels(self.reset_status.value).inc(reaped)
+        if reaped:
+            logger.warning(f"Reaped {reaped} submissions stuck in PROCESSING → {self.reset_status.value}")
+        return reaped
+
+    async def _run(self) -> None:
+        while self.running:
+            try:
+                await self.reap_once()
+            except Exception as e:
+                logger.error(f"Error in stale submission reaper: {e}")
+            await asyncio.sleep(self.interval_seconds)
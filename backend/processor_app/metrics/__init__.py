@@ -0,0 +1,6 @@
+"""Pipeline metrics and Prometheus exposition"""
+
+from processor_app.metrics.registry import Counter, Gauge, Histogram, MetricsRegistry, timed
+from processor_app.metrics.pipeline_metrics import REGISTRY, render_metrics
+
+__all__ = ["Counter", "Gauge", "Histogram", "MetricsRegistry", "timed", "REGISTRY", "render_metrics"]
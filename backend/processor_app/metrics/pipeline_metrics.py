@@ -0,0 +1,100 @@
+"""Metrics for the submission pipeline"""
+
+from datetime import datetime
+from typing import Optional
+
+from processor_app.metrics.registry import MetricsRegistry, timed
+
+REGISTRY = MetricsRegistry()
+
+SUBMISSIONS_CREATED = REGISTRY.counter(
+    "submissions_created_total", "Submissions accepted by the API"
+)
+SUBMISSIONS_COMPLETED = REGISTRY.counter(
+    "submissions_completed_total", "Submissions that reached a terminal status", ["status"]
+)
+SUBMISSIONS_BACKLOG = REGISTRY.gauge(
+    "submissions_backlog", "Submissions per status, refreshed on scrape", ["status"]
+)
+SUBMISSION_STAGE_SECONDS = REGISTRY.histogram(
+    "submission_stage_seconds",
+    "Time spent between lifecycle stages (queued: PENDING to PROCESSING, "
+    "processing: PROCESSING to terminal, total: created to terminal)",
+    ["stage"]
+)
+VALIDATOR_SECONDS = REGISTRY.histogram(
+    "validator_duration_seconds", "Time spent in IContentValidator.validate"
+)
+VALIDATION_CACHE_LOOKUPS = REGISTRY.counter(
+    "validation_cache_lookups_total", "Memoized verdict lookups", ["result"]
+)
+REPOSITORY_CALL_SECONDS = REGISTRY.histogram(
+    "repository_call_seconds", "Latency of ContentProcessorRepository calls", ["method"]
+)
+SQL_STATEMENT_SECONDS = REGISTRY.histogram(
+    "sql_statement_seconds", "Latency of SQL cursor executions", ["operation"]
+)
+SQL_SLOW_STATEMENTS = REGISTRY.counter(
+    "sql_slow_statements_total", "SQL statements slower than SQL_SLOW_QUERY_MS"
+)
+SQL_POOL_WAIT_SECONDS = REGISTRY.histogram(
+    "sql_pool_wait_seconds", "Time spent getting a connection from the pool"
+)
+SQL_CONNECTION_HOLD_SECONDS = REGISTRY.histogram(
+    "sql_connection_hold_seconds", "Time a connection stays checked out of the pool"
+)
+SQL_CONNECTIONS_IN_USE = REGISTRY.gauge(
+    "sql_connections_in_use", "Connections currently checked out of the pool"
+)
+PROFILES_CAPTURED = REGISTRY.counter(
+    "profiles_captured_total", "Request and consumer profiles saved to PROFILE_DIR", ["kind"]
+)
+KAFKA_PRODUCE_SECONDS = REGISTRY.histogram(
+    "kafka_produce_seconds", "Latency of a Kafka publish including broker acknowledgement"
+)
+KAFKA_COMMIT_SECONDS = REGISTRY.histogram(
+    "kafka_commit_seconds", "Latency of Kafka offset commits"
+)
+SUBMISSIONS_REAPED = REGISTRY.counter(
+    "submissions_reaped_total", "Stale PROCESSING submissions reset by the reaper", ["status"]
+)
+SUBMISSIONS_ARCHIVED = REGISTRY.counter(
+    "submissions_archived_total", "Terminal submissions moved to submissions_archive"
+)
+SUBMISSIONS_REVALIDATED = REGISTRY.counter(
+    "submissions_revalidated_total", "Terminal submissions re-run by bulk revalidation", ["outcome"]
+)
+KAFKA_RETRIES = REGISTRY.counter(
+    "kafka_retries_total", "Failed messages republished to the retry topic"
+)
+KAFKA_DEAD_LETTERED = REGISTRY.counter(
+    "kafka_dead_lettered_total", "Messages moved to the dead-letter topic after exhausting retries"
+)
+KAFKA_DROPPED = REGISTRY.counter(
+    "kafka_dropped_total", "Failed messages committed without a retry because no retry topic is configured"
+)
+ADMISSION_REJECTED = REGISTRY.counter(
+    "admission_rejected_total", "Submissions rejected with 429 by admission control", ["reason"]
+)
+POLL_LANE_DEPTH = REGISTRY.gauge(
+    "poll_lane_depth", "Submissions queued in the poll scheduler per priority lane", ["lane"]
+)
+CONSUMER_CONCURRENCY_LIMIT = REGISTRY.gauge(
+    "consumer_concurrency_limit", "Current adaptive in-flight limit per consumer", ["consumer"]
+)
+POLL_LEADER = REGISTRY.gauge(
+    "poll_leader", "1 while this process holds the poll consumer leadership"
+)
+
+
+def observe_since(stage: str, started: Optional[datetime], now: datetime) -> None:
+    if isinstance(started, datetime):
+        SUBMISSION_STAGE_SECONDS.labels(stage).observe((now - started).total_seconds())
+
+
+def repository_timer(method: str):
+    return timed(REPOSITORY_CALL_SECONDS.labels(method))
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
@@ -0,0 +1,205 @@
+"""SQL statement timing by normalized fingerprint, pool wait and connection usage.
+
+Engine events time every cursor execution; statements are grouped by their SQL
+with literals and IN/VALUES lists collapsed, so the same query with different
+parameters or list lengths lands in one row. Pool wait is timed inside the
+pool itself, since SQLAlchemy has no event before a checkout starts.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from time import perf_counter
+from typing import Deque, Dict, List, Optional, Type
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+from processor_app.metrics.pipeline_metrics import (
+    SQL_STATEMENT_SECONDS,
+    SQL_SLOW_STATEMENTS,
+    SQL_POOL_WAIT_SECONDS,
+    SQL_CONNECTION_HOLD_SECONDS,
+    SQL_CONNECTIONS_IN_USE
+)
+from processor_app.config import SQL_SLOW_QUERY_MS, SQL_STATS_SAMPLES, SQL_STATS_MAX_FINGERPRINTS
+
+logger = logging.getLogger(__name__)
+
+# Fingerprints beyond SQL_STATS_MAX_FINGERPRINTS are pooled under this key
+OTHER_FINGERPRINT = "<other>"
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+|\?")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ROWS = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """SQL with literals and placeholders as ?, IN lists as (?) and multi-row VALUES as (?)..."""
+    normalized = _SPACE.sub(" ", statement).strip()
+    normalized = _STRING.sub("?", normalized)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _LIST.sub("(?)", normalized)
+    return _ROWS.sub("(?)...", normalized)
+
+
+def _operation(fingerprint_text: str) -> str:
+    verb = fingerprint_text.split(" ", 1)[0].upper()
+    return verb if verb in ("SELECT", "INSERT", "UPDATE", "DELETE") else "OTHER"
+
+
+class _StatementStats:
+    __slots__ = ("count", "total", "max", "samples")
+
+    def __init__(self, max_samples: int):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: Deque[float] = deque(maxlen=max_samples)
+
+
+class SqlStatementStats:
+    # Totals since start (or reset) per fingerprint plus the most recent durations for percentiles
+
+    def __init__(
+        self,
+        slow_query_ms: float = SQL_SLOW_QUERY_MS,
+        max_samples: int = SQL_STATS_SAMPLES,
+        max_fingerprints: int = SQL_STATS_MAX_FINGERPRINTS
+    ):
+        self.slow_query_ms = slow_query_ms
+        self.max_samples = max_samples
+        self.max_fingerprints = max_fingerprints
+        self._statements: Dict[str, _StatementStats] = {}
+        self._pool_waits: Deque[float] = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+        self.connections_in_use = 0
+
+    def record(self, statement: str, seconds: float) -> None:
+        key = fingerprint(statement)
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is None:
+                if len(self._statements) >= self.max_fingerprints:
+                    key = OTHER_FINGERPRINT
+                    stats = self._statements.get(key)
+                if stats is None:
+                    stats = self._statements[key] = _StatementStats(self.max_samples)
+            stats.count += 1
+            stats.total += seconds
+            stats.max = max(stats.max, seconds)
+            stats.samples.append(seconds)
+        SQL_STATEMENT_SECONDS.labels(_operation(key)).observe(seconds)
+        if self.slow_query_ms > 0 and seconds * 1000 >= self.slow_query_ms:
+            SQL_SLOW_STATEMENTS.inc()
+            logger.warning(f"Slow SQL ({seconds * 1000:.1f} ms): {key}")
+
+    def record_pool_wait(self, seconds: float) -> None:
+        self._pool_waits.append(seconds)
+        SQL_POOL_WAIT_SECONDS.observe(seconds)
+
+    def top(self, limit: int = 10, order_by: str = "total") -> List[dict]:
+        """Statements sorted by total time, p99 or count, slowest first"""
+        with self._lock:
+            snapshot = [
+                (key, stats.count, stats.total, stats.max, sorted(stats.samples))
+                for key, stats in self._statements.items()
+            ]
+        rows = [
+            {
+                'fingerprint': key,
+                'count': count,
+                'total_ms': round(total * 1000, 3),
+                'mean_ms': round(total / count * 1000, 3),
+                'p50_ms': _percentile_ms(samples, 0.50),
+                'p99_ms': _percentile_ms(samples, 0.99),
+                'max_ms': round(maximum * 1000, 3),
+            }
+            for key, count, total, maximum, samples in snapshot
+        ]
+        sort_key = {'total': 'total_ms', 'p99': 'p99_ms', 'count': 'count'}[order_by]
+        rows.sort(key=lambda row: row[sort_key], reverse=True)
+        return rows[:limit]
+
+    def pool(self) -> dict:
+        waits = sorted(self._pool_waits)
+        return {
+            'checkouts': len(waits),
+            'wait_p50_ms': _percentile_ms(waits, 0.50),
+            'wait_p99_ms': _percentile_ms(waits, 0.99),
+            'connections_in_use': self.connections_in_use,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._statements.clear()
+            self._pool_waits.clear()
+
+
+def _percentile_ms(sorted_seconds: List[float], quantile: float) -> float:
+    if not sorted_seconds:
+        return 0.0
+    index = min(len(sorted_seconds) - 1, int(round(quantile * (len(sorted_seconds) - 1))))
+    return round(sorted_seconds[index] * 1000, 3)
+
+
+SQL_STATS = SqlStatementStats()
+
+
+def instrumented_pool_class(pool_class: Type[Pool], stats: SqlStatementStats = SQL_STATS) -> Type[Pool]:
+    # _do_get is the hook Pool subclasses implement; it blocks while the pool is exhausted and
+    # opens the connection for NullPool, so its duration is what a caller waits for a connection
+    def _do_get(self):
+        started = perf_counter()
+        try:
+            return pool_class._do_get(self)
+        finally:
+            stats.record_pool_wait(perf_counter() - started)
+
+    return type(f"Instrumented{pool_class.__name__}", (pool_class,), {'_do_get': _do_get})
+
+
+def instrument_engine(engine: Engine, stats: SqlStatementStats = SQL_STATS) -> None:
+    """Times statements and connection checkouts on a sync engine (AsyncEngine.sync_engine)"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('sql_started', []).append(perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get('sql_started')
+        if started:
+            stats.record(statement, perf_counter() - started.pop())
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # A failed statement never reaches after_cursor_execute; drop its start time
+        connection = exception_context.connection
+        started = connection.info.get('sql_started') if connection is not None else None
+        if started:
+            started.pop()
+
+    @event.listens_for(engine.pool, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info['checked_out_at'] = time.monotonic()
+        stats.connections_in_use += 1
+        SQL_CONNECTIONS_IN_USE.set(stats.connections_in_use)
+
+    @event.listens_for(engine.pool, "checkin")
+    def checkin(dbapi_connection, connection_record):
+        checked_out_at: Optional[float] = connection_record.info.pop('checked_out_at', None)
+        if checked_out_at is None:
+            return
+        SQL_CONNECTION_HOLD_SECONDS.observe(time.monotonic() - checked_out_at)
+        stats.connections_in_use -= 1
+        SQL_CONNECTIONS_IN_USE.set(stats.connections_in_use)
@@ -0,0 +1,91 @@
+"""Per-submission stage timestamps and sliding-window stage latency percentiles"""
+
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, Dict, Optional, Tuple
+
+from processor_app.config import TRACE_WINDOW_SECONDS, TRACE_WINDOW_MAX_SAMPLES
+
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class StageTrace:
+    # Stage marks are stored as milliseconds since created_at; *_ms entries are durations
+
+    def __init__(self, created_at: Optional[datetime]):
+        self._origin_ms = (
+            created_at.replace(tzinfo=timezone.utc).timestamp() * 1000
+            if isinstance(created_at, datetime) else None
+        )
+        self.stages: Dict[str, float] = {}
+
+    def mark(self, stage: str, at_ms: Optional[float] = None) -> None:
+        if self._origin_ms is None:
+            return
+        at_ms = now_ms() if at_ms is None else at_ms
+        self.stages[stage] = max(0, int(at_ms - self._origin_ms))
+
+    def duration(self, name: str, seconds: float) -> None:
+        self.stages[f"{name}_ms"] = round(seconds * 1000, 3)
+
+    def as_dict(self) -> Dict[str, float]:
+        return dict(self.stages)
+
+
+class StageLatencyWindow:
+
+    def __init__(self, window_seconds: float = TRACE_WINDOW_SECONDS, max_samples: int = TRACE_WINDOW_MAX_SAMPLES):
+        self.window_seconds = window_seconds
+        self.max_samples = max_samples
+        self._samples: Dict[str, Deque[Tuple[float, float]]] = {}
+
+    def record(self, stage: str, milliseconds: float) -> None:
+        samples = self._samples.get(stage)
+        if samples is None:
+            samples = self._samples[stage] = deque(maxlen=self.max_samples)
+        samples.append((time.monotonic(), milliseconds))
+
+    def record_trace(self, stages: Dict[str, float]) -> None:
+        # Derive per-stage durations from the marks written by producers, consumers and the processor
+        published = stages.get('published', 0)
+        received = stages.get('received')
+        claimed = stages.get('claimed')
+        if 'published' in stages:
+            self.record('publish', published)
+        if received is not None:
+            self.record('scheduler_delay', received - published)
+            if claimed is not None:
+                self.record('claim', claimed - received)
+        for name in ('db_claim', 'validate', 'db_final'):
+            if f"{name}_ms" in stages:
+                self.record(name, stages[f"{name}_ms"])
+        if 'completed' in stages:
+            self.record('end_to_end', stages['completed'])
+
+    def percentiles(self) -> Dict[str, Dict[str, float]]:
+        cutoff = time.monotonic() - self.window_seconds
+        report = {}
+        for stage, samples in list(self._samples.items()):
+            while samples and samples[0][0] < cutoff:
+                samples.popleft()
+            values = sorted(value for _, value in samples)
+            if not values:
+                continue
+            report[stage] = {
+                'count': len(values),
+                'p50_ms': self._percentile(values, 0.50),
+                'p95_ms': self._percentile(values, 0.95),
+                'p99_ms': self._percentile(values, 0.99),
+            }
+        return report
+
+    @staticmethod
+    def _percentile(sorted_values, quantile: float) -> float:
+        index = min(len(sorted_values) - 1, int(round(quantile * (len(sorted_values) - 1))))
+        return round(sorted_values[index], 3)
+
+
+STAGE_LATENCY = StageLatencyWindow()
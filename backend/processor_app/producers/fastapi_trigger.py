@@ -1,4 +1,5 @@
 import logging
+from typing import Optional
 
 from processor_app.interfaces.producer import IProducer
 
@@ -9,7 +10,7 @@ class FastAPITrigger(IProducer):
     def __init__(self):
         pass
 
-    def produce(self, submission_id: str, content: str) -> None:
+    def produce(self, submission_id: str, content: str, digest: Optional[str] = None) -> None:
         logger.debug(f"[{submission_id}] FastAPI processor will auto-discover this submission via polling")
 
     def is_available(self) -> bool:
@@ -1,11 +1,17 @@
 """Kafka producer for publishing submissions to Kafka topic"""
 
-import json
 import logging
+from typing import Callable, Optional
 
 from kafka import KafkaProducer
 
 from processor_app.interfaces.producer import IProducer
+from processor_app.interfaces.message_serializer import IMessageSerializer
+from processor_app.serializers import JsonMessageSerializer
+from processor_app.metrics.pipeline_metrics import KAFKA_PRODUCE_SECONDS
+from processor_app.metrics.stage_trace import now_ms
+from processor_app.compression import pack_content
+from processor_app.content_processor_service.content_digest import compute_digest
 
 logger = logging.getLogger(__name__)
 
@@ -15,18 +21,29 @@ class KafkaProducerImpl(IProducer):
     def __init__(
         self,
         bootstrap_servers: list,
-        topic: str = "submissions"
+        topic: str = "submissions",
+        payload_codec: Optional[str] = None,
+        payload_compression_threshold: int = 1024,
+        claim_check_threshold: int = 0,
+        serializer: Optional[IMessageSerializer] = None,
+        client_factory: Optional[Callable] = None
     ):
         self.bootstrap_servers = bootstrap_servers
         self.topic = topic
+        self.payload_codec = payload_codec
+        self.payload_compression_threshold = payload_compression_threshold
+        self.claim_check_threshold = claim_check_threshold
+        self.serializer = serializer or JsonMessageSerializer()
+        # Anything with the kafka-python KafkaProducer constructor and send/flush/close
+        self.client_factory = client_factory or KafkaProducer
         self.producer = None
         self._initialize()
 
     def _initialize(self) -> None:
         try:
-            self.producer = KafkaProducer(
+            self.producer = self.client_factory(
                 bootstrap_servers=self.bootstrap_servers,
-                value_serializer=lambda v: json.dumps(v).encode('utf-8'),
+                value_serializer=self.serializer.serialize,
                 acks='all',
                 retries=3,
                 max_in_flight_requests_per_connection=1,
@@ -36,22 +53,44 @@ class KafkaProducerImpl(IProducer):
             logger.error(f"Failed to initialize Kafka producer: {e}")
             raise
 
-    def produce(self, submission_id: str, content: str) -> None:
+    def produce(self, submission_id: str, content: str, digest: Optional[str] = None) -> None:
         if not self.producer:
             logger.error("Kafka producer not initialized")
             return
 
         try:
-            future = self.producer.send(self.topic, {
-                'id': submission_id,
-                'content': content
-            })
-            future.get(timeout=5)
-            self.producer.flush()
+            message = self._build_message(submission_id, content, digest)
+            message['published_at'] = now_ms()
+            with KAFKA_PRODUCE_SECONDS.time():
+                future = self.producer.send(self.topic, message)
+                future.get(timeout=5)
+                self.producer.flush()
             logger.info(f"[{submission_id}] Published to Kafka successfully")
         except Exception as e:
             logger.error(f"[{submission_id}] Failed to publish to Kafka: {e}")
 
+    def publish(self, topic: str, message: dict) -> bool:
+        # Raw publish for retry and dead-letter routing; the caller decides what a failure means
+        if not self.producer:
+            logger.error("Kafka producer not initialized")
+            return False
+        try:
+            with KAFKA_PRODUCE_SECONDS.time():
+                self.producer.send(topic, message).get(timeout=5)
+            return True
+        except Exception as e:
+            logger.error(f"[{message.get('id')}] Failed to publish to '{topic}': {e}")
+            return False
+
+    def _build_message(self, submission_id: str, content: str, digest: Optional[str] = None) -> dict:
+        if self.claim_check_threshold and len(content) > self.claim_check_threshold:
+            # Claim-check: the consumer loads the content from the repository
+            return {'id': submission_id, 'digest': digest or compute_digest(content)}
+        codec, payload = pack_content(content, self.payload_codec, self.payload_compression_threshold)
+        if codec is None:
+            return {'id': submission_id, 'content': content}
+        return {'id': submission_id, 'codec': codec, 'content': payload}
+
     def is_available(self) -> bool:
         return self.producer is not None
 
@@ -0,0 +1,7 @@
+"""On-demand profiling of requests and consumer iterations"""
+
+from processor_app.profiling.profile_store import ProfileStore
+from processor_app.profiling.profiler import PROFILER, Profiler, TaskSampler
+from processor_app.profiling.profiling_middleware import ProfilingMiddleware
+
+__all__ = ["ProfileStore", "PROFILER", "Profiler", "TaskSampler", "ProfilingMiddleware"]
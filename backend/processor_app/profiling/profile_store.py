@@ -0,0 +1,73 @@
+import json
+import logging
+import os
+import re
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Names sort chronologically; the random suffix keeps processes sharing a directory apart
+_NAME = re.compile(r"^\d{8}T\d{12}-(request|consumer)-[0-9a-f]{8}$")
+
+
+class ProfileStore:
+    """Profiles on disk as <name>.<ext> plus a <name>.json sidecar, newest max_files kept.
+    Blocking file IO; callers on the event loop go through asyncio.to_thread."""
+
+    def __init__(self, directory: str, max_files: int):
+        self.directory = directory
+        self.max_files = max_files
+
+    @staticmethod
+    def new_name(kind: str) -> str:
+        return f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{kind}-{uuid.uuid4().hex[:8]}"
+
+    def save(self, name: str, extension: str, payload: bytes, metadata: dict) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, f"{name}.{extension}"), 'wb') as f:
+            f.write(payload)
+        metadata = {**metadata, 'name': name, 'file': f"{name}.{extension}", 'size_bytes': len(payload)}
+        # The sidecar is written last, so listings never show a half-written profile
+        with open(os.path.join(self.directory, f"{name}.json"), 'w') as f:
+            json.dump(metadata, f)
+        self._prune()
+
+    def list(self, limit: Optional[int] = None) -> List[dict]:
+        """Newest first"""
+        profiles = []
+        for name in self._names()[::-1][:limit]:
+            try:
+                with open(os.path.join(self.directory, f"{name}.json")) as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                # Pruned by another process between listing and reading
+                continue
+        return profiles
+
+    def path(self, name: str) -> Optional[str]:
+        if not _NAME.match(name):
+            return None
+        try:
+            with open(os.path.join(self.directory, f"{name}.json")) as f:
+                return os.path.join(self.directory, json.load(f)['file'])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _names(self) -> List[str]:
+        try:
+            entries = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(entry[:-5] for entry in entries if entry.endswith('.json') and _NAME.match(entry[:-5]))
+
+    def _prune(self) -> None:
+        names = self._names()
+        for name in names[:max(0, len(names) - self.max_files)]:
+            for entry in os.listdir(self.directory):
+                if entry.startswith(name + '.'):
+                    try:
+                        os.remove(os.path.join(self.directory, entry))
+                    except FileNotFoundError:
+                        pass
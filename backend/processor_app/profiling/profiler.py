@@ -0,0 +1,176 @@
+"""Profiles of a single request or consumer iteration.
+
+The default sampler walks the awaiting task's coroutine chain from a helper
+thread, so time spent awaiting the database shows up under the coroutine that
+awaited it, and synchronous work such as validation shows up under its callers.
+cProfile is deterministic but sees the whole event loop and loses track of a
+coroutine while it is suspended, so it suits CPU hot spots rather than latency.
+"""
+
+import asyncio
+import cProfile
+import logging
+import marshal
+import os
+import random
+import sys
+import threading
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import datetime
+from time import perf_counter
+from typing import AsyncIterator, List, Optional
+
+from processor_app.profiling.profile_store import ProfileStore
+from processor_app.metrics.pipeline_metrics import PROFILES_CAPTURED
+from processor_app.config import PROFILE_MODE, PROFILE_SAMPLE_INTERVAL_MS, PROFILE_DIR, PROFILE_MAX_FILES
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ('sample', 'cprofile')
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_qualname}"
+
+
+def task_stack(task: asyncio.Task, thread_id: int) -> List[str]:
+    """Outermost-first frames of the task's await chain. While the task is running, the
+    synchronous frames above its innermost coroutine are taken from the loop thread."""
+    labels = []
+    awaitable = task.get_coro()
+    innermost = None
+    while awaitable is not None:
+        frame = getattr(awaitable, 'cr_frame', None) or getattr(awaitable, 'gi_frame', None)
+        if frame is None:
+            # The future the chain ends in: a DB driver result, a sleep, a socket read
+            labels.append("<await>")
+            break
+        labels.append(_frame_label(frame))
+        innermost = awaitable
+        awaitable = getattr(awaitable, 'cr_await', None) or getattr(awaitable, 'gi_yieldfrom', None)
+    if innermost is not None and (getattr(innermost, 'cr_running', False) or getattr(innermost, 'gi_running', False)):
+        leaf = getattr(innermost, 'cr_frame', None) or getattr(innermost, 'gi_frame', None)
+        frame = sys._current_frames().get(thread_id)
+        synchronous = []
+        while frame is not None and frame is not leaf:
+            synchronous.append(_frame_label(frame))
+            frame = frame.f_back
+        if frame is leaf:
+            labels.extend(reversed(synchronous))
+    return labels
+
+
+class TaskSampler:
+    # One helper thread per profile; the task is only read, never touched, from that thread.
+    # While the loop thread holds the GIL, samples come no faster than sys.getswitchinterval()
+
+    def __init__(self, task: asyncio.Task, interval: float):
+        self.task = task
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="task-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def folded(self) -> bytes:
+        """Brendan Gregg's collapsed format, readable by flamegraph.pl and speedscope"""
+        lines = [f"{';'.join(stack)} {count}" for stack, count in self.samples.most_common()]
+        return ("\n".join(lines) + "\n").encode('utf-8') if lines else b""
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            if self.task.done():
+                return
+            try:
+                stack = task_stack(self.task, self._thread_id)
+            except Exception:
+                # The chain changed under us mid-walk; drop this sample
+                continue
+            # A sample taken while the profile is being stopped only shows the profiler itself
+            if stack and not self._stop.is_set():
+                self.samples[tuple(stack)] += 1
+
+
+class ProfileHandle:
+    def __init__(self, name: Optional[str]):
+        # None when the profile was skipped (another cProfile run was active)
+        self.name = name
+
+
+class Profiler:
+
+    def __init__(
+        self,
+        store: ProfileStore,
+        mode: str = PROFILE_MODE,
+        sample_interval_ms: float = PROFILE_SAMPLE_INTERVAL_MS
+    ):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode {mode!r}, expected one of {PROFILE_MODES}")
+        self.store = store
+        self.mode = mode
+        self.sample_interval = sample_interval_ms / 1000
+        # cProfile hooks the whole thread, so only one such profile can run at a time
+        self._cprofile_lock = threading.Lock()
+
+    @staticmethod
+    def sampled(rate: float) -> bool:
+        return rate > 0 and random.random() < rate
+
+    @asynccontextmanager
+    async def profile(self, kind: str, label: str) -> AsyncIterator[ProfileHandle]:
+        """Profiles the body when it runs in the current task; the file is saved on exit"""
+        if self.mode == 'cprofile' and not self._cprofile_lock.acquire(blocking=False):
+            yield ProfileHandle(None)
+            return
+        handle = ProfileHandle(self.store.new_name(kind))
+        started_at = datetime.utcnow()
+        sampler = profile = None
+        if self.mode == 'sample':
+            sampler = TaskSampler(asyncio.current_task(), self.sample_interval)
+            sampler.start()
+        else:
+            profile = cProfile.Profile()
+            profile.enable()
+        started = perf_counter()
+        try:
+            yield handle
+        finally:
+            duration_ms = (perf_counter() - started) * 1000
+            if sampler is not None:
+                sampler.stop()
+                extension, payload = 'folded', sampler.folded()
+                samples = sum(sampler.samples.values())
+            else:
+                profile.disable()
+                self._cprofile_lock.release()
+                profile.create_stats()
+                # Same bytes as Profile.dump_stats, so pstats and snakeviz read the file
+                extension, payload = 'prof', marshal.dumps(profile.stats)
+                samples = None
+            metadata = {
+                'kind': kind,
+                'label': label,
+                'mode': self.mode,
+                'duration_ms': round(duration_ms, 3),
+                'samples': samples,
+                'created_at': started_at.isoformat(),
+            }
+            try:
+                await asyncio.to_thread(self.store.save, handle.name, extension, payload, metadata)
+                PROFILES_CAPTURED.labels(kind).inc()
+                logger.info(f"Profiled {kind} {label} in {duration_ms:.1f} ms: {handle.name}")
+            except OSError as e:
+                logger.error(f"Failed to save profile {handle.name}: {e}")
+
+
+PROFILER = Profiler(ProfileStore(PROFILE_DIR, PROFILE_MAX_FILES))
@@ -0,0 +1,51 @@
+import logging
+from typing import Callable
+
+from processor_app.profiling.profiler import Profiler
+from processor_app.config import PROFILE_REQUEST_SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b'x-profile'
+PROFILE_ID_HEADER = b'x-profile-id'
+
+
+class ProfilingMiddleware:
+    """Profiles requests that send X-Profile: 1 with a valid admin token, plus a random
+    sample_rate share of all requests, and returns the profile name in X-Profile-Id.
+
+    Plain ASGI rather than BaseHTTPMiddleware, which runs the endpoint in a separate
+    task that the sampler would not see."""
+
+    def __init__(
+        self,
+        app,
+        profiler: Profiler,
+        authorize: Callable[[str], bool],
+        sample_rate: float = PROFILE_REQUEST_SAMPLE_RATE
+    ):
+        self.app = app
+        self.profiler = profiler
+        self.authorize = authorize
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        async with self.profiler.profile('request', f"{scope['method']} {scope['path']}") as handle:
+            async def send_with_profile_id(message):
+                if message['type'] == 'http.response.start' and handle.name:
+                    message['headers'] = [*message.get('headers', []), (PROFILE_ID_HEADER, handle.name.encode())]
+                await send(message)
+
+            await self.app(scope, receive, send_with_profile_id)
+
+    def _should_profile(self, scope) -> bool:
+        headers = dict(scope['headers'])
+        if headers.get(PROFILE_HEADER) in (b'1', b'true'):
+            if self.authorize(headers.get(b'x-admin-token', b'').decode('latin-1')):
+                return True
+            logger.warning(f"Ignoring {PROFILE_HEADER.decode()} on {scope['path']} without a valid admin token")
+        return self.profiler.sampled(self.sample_rate)
@@ -1,21 +1,39 @@
 import logging
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import StaticPool
 from processor_app.repositories.repository import Repository
-from processor_app.content_processor_service.schema import Base
-from processor_app.config import (DATABASE_URL)
+from processor_app.repositories.schema_migrations import upgrade
+from processor_app.metrics.sql_instrumentation import instrument_engine, instrumented_pool_class
+from processor_app.config import (DATABASE_URL, SQL_INSTRUMENTATION)
 logger = logging.getLogger(__name__)
 
 
 class ProcessorRepository(Repository):
-    def __init__(self) -> None:
+    def __init__(self, database_url: Optional[str] = None, instrument: bool = SQL_INSTRUMENTATION) -> None:
         # DATABASE_URL = "sqlite+aiosqlite:///./submissions.db"
+        database_url = database_url or DATABASE_URL
+        engine_options = {}
+        if database_url.endswith(':memory:'):
+            # Every session must share the single connection that owns the in-memory database.
+            # Overlapping transactions on that connection are not isolated from each other, so
+            # concurrent workloads (load benchmarks, poller next to requests) need a file database.
+            engine_options = {'poolclass': StaticPool, 'connect_args': {'check_same_thread': False}}
+        if instrument:
+            # Same pool the dialect would pick, timed around each checkout
+            url = make_url(database_url)
+            pool_class = engine_options.get('poolclass') or url.get_dialect().get_pool_class(url)
+            engine_options['poolclass'] = instrumented_pool_class(pool_class)
         self._engine = create_async_engine(
-            DATABASE_URL,
+            database_url,
             pool_pre_ping=True,
             echo=False,
-            future=True
+            future=True,
+            **engine_options
         )
+        if instrument:
+            instrument_engine(self._engine.sync_engine)
         
         self._session_maker = async_sessionmaker(
             self._engine,
@@ -24,15 +42,19 @@ class ProcessorRepository(Repository):
             autocommit=False,
             autoflush=False
         )
-        logger.info(f"Database engine created: {DATABASE_URL}")
+        logger.info(f"Database engine created: {database_url}")
+
+    @property
+    def engine(self):
+        return self._engine
 
     async def init_db(self) -> None:
         if self._engine is None:
             raise RuntimeError("Database engine not initialized")
         
         async with self._engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
-        logger.info("Database tables initialized")
+            version = await conn.run_sync(upgrade)
+        logger.info(f"Database tables initialized at schema version {version}")
 
     def get_session(self) -> AsyncSession:
         if self._session_maker is None:
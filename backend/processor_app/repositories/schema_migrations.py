@@ -0,0 +1,129 @@
+"""Versioned upgrades for databases created by older releases.
+
+create_all only creates missing tables, so columns added to an existing table
+(content_digest, priority, trace, ...) and relaxed constraints (content became
+nullable for deduplicated rows) have to be applied here. The applied version is
+kept in schema_version; a fresh database is stamped with the latest version.
+"""
+
+import logging
+from typing import Callable, List, Tuple
+
+from sqlalchemy import (
+    Column, Integer, MetaData, Table, inspect, insert, literal, select, text
+)
+from sqlalchemy.engine import Connection
+
+from processor_app.content_processor_service.schema import Base
+
+logger = logging.getLogger(__name__)
+
+_version_metadata = MetaData()
+schema_version = Table(
+    "schema_version", _version_metadata,
+    Column("version", Integer, nullable=False)
+)
+
+
+def _column_default(column: Column):
+    default = column.default
+    if default is not None and default.is_scalar:
+        return default.arg
+    return None
+
+
+def _rebuild_sqlite_table(connection: Connection, table: Table) -> None:
+    # SQLite cannot add NOT NULL columns or drop NOT NULL, so the table is recreated from the
+    # model and the rows copied over; new NOT NULL columns get their scalar default
+    old_name = f"{table.name}__old"
+    for index in inspect(connection).get_indexes(table.name):
+        connection.execute(text(f'DROP INDEX "{index["name"]}"'))
+    connection.execute(text(f'ALTER TABLE "{table.name}" RENAME TO "{old_name}"'))
+    table.create(connection)
+
+    old = Table(old_name, MetaData(), autoload_with=connection)
+    targets, sources = [], []
+    for column in table.columns:
+        if column.name in old.columns:
+            targets.append(column.name)
+            sources.append(old.columns[column.name])
+        elif not column.nullable:
+            targets.append(column.name)
+            sources.append(literal(_column_default(column), type_=column.type).label(column.name))
+    connection.execute(insert(table).from_select(targets, select(*sources)))
+    connection.execute(text(f'DROP TABLE "{old_name}"'))
+
+
+def _alter_table(connection: Connection, table: Table, existing: dict) -> None:
+    dialect = connection.dialect
+    preparer = dialect.identifier_preparer
+    for column in table.columns:
+        name = preparer.quote(column.name)
+        if column.name not in existing:
+            if hasattr(column.type, 'create'):
+                # Named types such as PostgreSQL enums must exist before a column can use them
+                column.type.create(connection, checkfirst=True)
+            ddl = f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {name} {column.type.compile(dialect)}"
+            default = _column_default(column)
+            if not column.nullable:
+                value = literal(default, type_=column.type).compile(
+                    dialect=dialect, compile_kwargs={'literal_binds': True}
+                )
+                ddl += f" DEFAULT {value} NOT NULL"
+            connection.execute(text(ddl))
+        elif column.nullable and not existing[column.name]['nullable']:
+            connection.execute(text(
+                f"ALTER TABLE {preparer.format_table(table)} ALTER COLUMN {name} DROP NOT NULL"
+            ))
+    for index in table.indexes:
+        index.create(connection, checkfirst=True)
+
+
+def _reconcile_columns(connection: Connection) -> None:
+    """Tables created before versioning get the columns and nullability of the current models"""
+    inspector = inspect(connection)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column['name']: column for column in inspector.get_columns(table.name)}
+        outdated = [column.name for column in table.columns if column.name not in existing] + [
+            column.name for column in table.columns
+            if column.name in existing and column.nullable and not existing[column.name]['nullable']
+        ]
+        if not outdated:
+            continue
+        logger.info(f"Upgrading table {table.name}: {', '.join(outdated)}")
+        if connection.dialect.name == 'sqlite':
+            _rebuild_sqlite_table(connection, table)
+        else:
+            _alter_table(connection, table, existing)
+
+
+# (version, description, step); append new steps, never edit applied ones
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "add columns and relax constraints on tables from unversioned releases", _reconcile_columns),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def upgrade(connection: Connection) -> int:
+    """Creates missing tables and applies pending migrations in one transaction; returns the version"""
+    inspector = inspect(connection)
+    existing_database = inspector.has_table("submissions")
+    _version_metadata.create_all(connection)
+    version = connection.execute(select(schema_version.c.version)).scalar()
+    if version is None:
+        # Unversioned: either brand new (create_all below builds the current schema) or a release
+        # from before schema_version existed, which needs every migration
+        version = 0 if existing_database else LATEST_VERSION
+        connection.execute(insert(schema_version).values(version=version))
+
+    for target, description, step in MIGRATIONS:
+        if target > version:
+            logger.info(f"Applying schema migration {target}: {description}")
+            step(connection)
+            connection.execute(schema_version.update().values(version=target))
+            version = target
+
+    Base.metadata.create_all(connection)
+    return version
@@ -0,0 +1,7 @@
+"""Kafka message serializers"""
+
+from processor_app.serializers.binary_serializer import BinaryMessageSerializer
+from processor_app.serializers.json_serializer import JsonMessageSerializer
+from processor_app.serializers.message_format import get_serializer, deserialize_message
+
+__all__ = ["BinaryMessageSerializer", "JsonMessageSerializer", "get_serializer", "deserialize_message"]
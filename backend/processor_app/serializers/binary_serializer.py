@@ -0,0 +1,76 @@
+import struct
+
+from processor_app.interfaces.message_serializer import IMessageSerializer
+
+MAGIC = 0xC5
+SCHEMA_VERSION = 2
+
+# v1: magic, schema version, flags, id length, digest length, codec length, content length
+# v2: v1 + published_at (epoch ms, 0 when unknown)
+_HEADERS = {
+    1: struct.Struct('>BBBHBBI'),
+    2: struct.Struct('>BBBHBBIQ'),
+}
+_FLAG_HAS_CONTENT = 0x01
+# Retry metadata (attempt, retry_at epoch ms) trails the content so older readers simply ignore it
+_FLAG_HAS_RETRY = 0x02
+_RETRY = struct.Struct('>HQ')
+
+
+class BinaryMessageSerializer(IMessageSerializer):
+    # Length-prefixed layout: header | id | digest | codec | content [| retry]
+    name = "binary"
+
+    def serialize(self, message: dict) -> bytes:
+        id_bytes = message['id'].encode('utf-8')
+        digest_bytes = (message.get('digest') or '').encode('ascii')
+        codec_bytes = (message.get('codec') or '').encode('ascii')
+        content = message.get('content')
+        flags = 0
+        if content is None:
+            content_bytes = b''
+        else:
+            flags |= _FLAG_HAS_CONTENT
+            content_bytes = content.encode('utf-8') if isinstance(content, str) else content
+        retry = b''
+        if message.get('attempt'):
+            flags |= _FLAG_HAS_RETRY
+            retry = _RETRY.pack(message['attempt'], message.get('retry_at') or 0)
+
+        header = _HEADERS[SCHEMA_VERSION].pack(
+            MAGIC, SCHEMA_VERSION, flags,
+            len(id_bytes), len(digest_bytes), len(codec_bytes), len(content_bytes),
+            message.get('published_at') or 0
+        )
+        return b''.join((header, id_bytes, digest_bytes, codec_bytes, content_bytes, retry))
+
+    def deserialize(self, data: bytes) -> dict:
+        view = memoryview(data)
+        magic, version = view[0], view[1]
+        if magic != MAGIC:
+            raise ValueError(f"Not a binary submission message (magic 0x{magic:02x})")
+        header = _HEADERS.get(version)
+        if header is None:
+            raise ValueError(f"Unsupported message schema version {version}")
+
+        fields = header.unpack_from(view)
+        flags, id_len, digest_len, codec_len, content_len = fields[2:7]
+        published_at = fields[7] if version >= 2 else 0
+
+        offset = header.size
+        submission_id = str(view[offset:offset + id_len], 'utf-8')
+        offset += id_len
+        digest = str(view[offset:offset + digest_len], 'ascii') or None
+        offset += digest_len
+        codec = str(view[offset:offset + codec_len], 'ascii') or None
+        offset += codec_len
+
+        message = {'id': submission_id, 'digest': digest, 'codec': codec, 'content': None}
+        if published_at:
+            message['published_at'] = published_at
+        if flags & _FLAG_HAS_CONTENT:
+            # Content stays a view over the received buffer until it is decoded or decompressed
+            message['content'] = view[offset:offset + content_len]
+        if flags & _FLAG_HAS_RETRY:
+            message['attempt'], message['retry_at'] = _RETRY.unpack_from(view, offset + content_len)
+        return message
@@ -0,0 +1,21 @@
+import base64
+import json
+
+from processor_app.interfaces.message_serializer import IMessageSerializer
+
+
+class JsonMessageSerializer(IMessageSerializer):
+    name = "json"
+
+    def serialize(self, message: dict) -> bytes:
+        content = message.get('content')
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            # JSON has no binary type; compressed content travels as base64
+            message = dict(message, content=base64.b64encode(content).decode('ascii'))
+        return json.dumps(message, separators=(',', ':')).encode('utf-8')
+
+    def deserialize(self, data: bytes) -> dict:
+        message = json.loads(data)
+        if message.get('codec') and message.get('content') is not None:
+            message['content'] = base64.b64decode(message['content'])
+        return message
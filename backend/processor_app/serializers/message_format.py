@@ -0,0 +1,28 @@
+"""Kafka message serializer selection"""
+
+from typing import Dict, Optional
+
+from processor_app.interfaces.message_serializer import IMessageSerializer
+from processor_app.serializers.binary_serializer import BinaryMessageSerializer, MAGIC
+from processor_app.serializers.json_serializer import JsonMessageSerializer
+
+_SERIALIZERS: Dict[str, IMessageSerializer] = {
+    serializer.name: serializer
+    for serializer in (JsonMessageSerializer(), BinaryMessageSerializer())
+}
+
+
+def get_serializer(name: str) -> IMessageSerializer:
+    try:
+        return _SERIALIZERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown message format '{name}'. Available: {sorted(_SERIALIZERS)}")
+
+
+def deserialize_message(data: Optional[bytes]) -> Optional[dict]:
+    # Both formats can share a topic during a rollout; the first byte tells them apart
+    if not data:
+        return None
+    if data[0] == MAGIC:
+        return _SERIALIZERS[BinaryMessageSerializer.name].deserialize(data)
+    return _SERIALIZERS[JsonMessageSerializer.name].deserialize(data)
@@ -1,5 +1,6 @@
 """Content validator implementations"""
 
 from processor_app.validators.content_validator import ContentValidator
+from processor_app.validators.validation_cache import ValidationCache
 
-__all__ = ["ContentValidator"]
+__all__ = ["ContentValidator", "ValidationCache"]
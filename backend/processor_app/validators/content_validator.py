@@ -2,21 +2,30 @@
 
 import re
 import logging
+from typing import List, Sequence
 from processor_app.interfaces.validator import IContentValidator
 
 logger = logging.getLogger(__name__)
 
+_DIGIT = re.compile(r'\d')
+
 
 class ContentValidator(IContentValidator):
+    version = "1"
 
     def validate(self, content: str) -> bool:
         if len(content) < 10:
             logger.debug(f"Validation failed: content too short ({len(content)} < 10)")
             return False
 
-        if not re.search(r'\d', content):
+        if not _DIGIT.search(content):
             logger.debug("Validation failed: content contains no digits")
             return False
 
         logger.debug("Content validation passed")
         return True
+
+    def validate_batch(self, contents: Sequence[str]) -> List[bool]:
+        # Same rules as validate without the per-item debug logging
+        search = _DIGIT.search
+        return [len(content) >= 10 and search(content) is not None for content in contents]
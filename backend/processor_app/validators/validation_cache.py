@@ -0,0 +1,52 @@
+"""Memoized validation verdicts keyed by content digest and validator version"""
+
+import logging
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.config import VALIDATION_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class ValidationCache:
+    # In-process LRU in front of the validation_results table
+
+    def __init__(self, repository: ContentProcessorRepository, max_size: int = VALIDATION_CACHE_SIZE):
+        self.repository = repository
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, str], bool]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, digest: str, validator_version: str) -> Optional[bool]:
+        key = (digest, validator_version)
+        verdict = self._entries.get(key)
+        if verdict is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return verdict
+
+        verdict = await self.repository.get_cached_verdict(digest, validator_version)
+        if verdict is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._remember(key, verdict)
+        return verdict
+
+    async def put(self, digest: str, validator_version: str, is_valid: bool) -> None:
+        self._remember((digest, validator_version), is_valid)
+        try:
+            await self.repository.save_verdict(digest, validator_version, is_valid)
+        except Exception as e:
+            # The verdict is already applied to the submission; losing the memo only costs a revalidation
+            logger.warning(f"Failed to persist validation verdict for digest {digest[:12]}: {e}")
+
+    def _remember(self, key: Tuple[str, str], is_valid: bool) -> None:
+        self._entries[key] = is_valid
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
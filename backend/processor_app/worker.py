@@ -0,0 +1,202 @@
+"""Standalone submission worker.
+
+Runs consumers without the HTTP API so processing scales separately:
+
+    RUN_CONSUMERS=false uvicorn main:app --port 8000
+    USE_KAFKA=true python -m processor_app.worker --processes 4 --concurrency 2
+
+Each process builds its repository and consumers through Factory, serves
+/health, /metrics and /trace-stats on its own port and drains in-flight
+submissions on SIGTERM/SIGINT before exiting. Stage latencies are kept in
+memory per process, so the API's /api/submissions/trace-stats only covers
+submissions processed inside the API process; read each worker's port instead.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import signal
+import sys
+from typing import List, Optional
+
+from processor_app.config import (
+    LOG_LEVEL,
+    USE_KAFKA,
+    POLL_COORDINATION,
+    WORKER_PROCESSES,
+    WORKER_CONCURRENCY,
+    WORKER_HEALTH_PORT,
+    WORKER_DRAIN_TIMEOUT_SECONDS
+)
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.infra.factory import Factory
+from processor_app.interfaces.consumer import IConsumer
+from processor_app.metrics.pipeline_metrics import render_metrics
+from processor_app.metrics.stage_trace import STAGE_LATENCY
+from processor_app.validators import ContentValidator
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+
+    def __init__(
+        self,
+        concurrency: int = WORKER_CONCURRENCY,
+        health_port: int = WORKER_HEALTH_PORT,
+        drain_timeout: float = WORKER_DRAIN_TIMEOUT_SECONDS,
+        health_host: str = "0.0.0.0"
+    ):
+        if not USE_KAFKA and concurrency > 1:
+            # Every poller would pick up the same PENDING rows
+            logger.warning("Polling mode runs a single consumer loop per process; ignoring concurrency")
+            concurrency = 1
+        self.concurrency = concurrency
+        self.health_port = health_port
+        self.health_host = health_host
+        self.drain_timeout = drain_timeout
+        self.consumers: List[IConsumer] = []
+        self.draining = False
+        self._stop = asyncio.Event()
+        self._health_server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        repo = Factory.get_repository()
+        await repo.init_db()
+        content_repo = ContentProcessorRepository(repo)
+        await content_repo.backfill_status_counters()
+        validator = ContentValidator()
+
+        # Kafka consumers in one group split the topic's partitions between them
+        self.consumers = [Factory.get_consumer(content_repo, validator) for _ in range(self.concurrency)]
+        for consumer in self.consumers:
+            await consumer.start()
+
+        if self.health_port:
+            self._health_server = await asyncio.start_server(
+                self._handle_health, self.health_host, self.health_port
+            )
+        logger.info(
+            f"Worker started with {len(self.consumers)} consumer loop(s)"
+            + (f", health on port {self.health_port}" if self.health_port else "")
+        )
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    async def drain(self) -> None:
+        self.draining = True
+        logger.info(f"Draining {len(self.consumers)} consumer loop(s) (timeout {self.drain_timeout}s)")
+        await asyncio.gather(*(consumer.drain(self.drain_timeout) for consumer in self.consumers))
+        if self._health_server:
+            self._health_server.close()
+            await self._health_server.wait_closed()
+        logger.info("Worker drained")
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, self.stop)
+        await self.start()
+        try:
+            await self._stop.wait()
+        finally:
+            await self.drain()
+
+    async def health(self) -> dict:
+        running = [await consumer.is_running() for consumer in self.consumers]
+        healthy = not self.draining and bool(running) and all(running)
+        return {
+            "status": "ok" if healthy else ("draining" if self.draining else "degraded"),
+            "consumers": len(running),
+            "running": sum(running),
+        }
+
+    async def _handle_health(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # Minimal HTTP/1.0 responder; enough for load balancer and orchestrator probes
+        try:
+            request_line = (await asyncio.wait_for(reader.readline(), timeout=5)).decode('latin-1')
+            path = request_line.split(' ')[1] if request_line.count(' ') >= 2 else '/'
+            if path == '/metrics':
+                status, content_type, body = 200, "text/plain; version=0.0.4", render_metrics().encode()
+            elif path == '/trace-stats':
+                report = {"window_seconds": STAGE_LATENCY.window_seconds, "stages": STAGE_LATENCY.percentiles()}
+                status, content_type, body = 200, "application/json", json.dumps(report).encode()
+            elif path == '/health':
+                report = await self.health()
+                status = 200 if report["status"] == "ok" else 503
+                content_type, body = "application/json", json.dumps(report).encode()
+            else:
+                status, content_type, body = 404, "text/plain", b"Not Found"
+            reason = {200: "OK", 404: "Not Found", 503: "Service Unavailable"}[status]
+            writer.write(
+                f"HTTP/1.0 {status} {reason}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode('latin-1') + body
+            )
+            await writer.drain()
+        except Exception as e:
+            logger.debug(f"Health request failed: {e}")
+        finally:
+            writer.close()
+
+
+def run_worker(concurrency: int, health_port: int, drain_timeout: float) -> None:
+    logging.basicConfig(
+        level=getattr(logging, LOG_LEVEL),
+        format='%(asctime)s - %(process)d - %(name)s - %(levelname)s - %(message)s'
+    )
+    asyncio.run(Worker(concurrency, health_port, drain_timeout).run())
+
+
+def run_processes(processes: int, concurrency: int, health_port: int, drain_timeout: float) -> int:
+    # spawn gives every child a fresh interpreter: no inherited event loop, engine or Kafka sockets
+    context = multiprocessing.get_context("spawn")
+    children = [
+        context.Process(
+            target=run_worker,
+            args=(concurrency, health_port + index if health_port else 0, drain_timeout),
+            name=f"worker-{index}"
+        )
+        for index in range(processes)
+    ]
+    for child in children:
+        child.start()
+
+    def forward(signum, frame):
+        for child in children:
+            if child.is_alive():
+                child.terminate()
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+
+    for child in children:
+        child.join()
+    failed = [child.name for child in children if child.exitcode not in (0, -signal.SIGTERM)]
+    if failed:
+        logger.error(f"Worker processes exited abnormally: {', '.join(failed)}")
+    return 1 if failed else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run submission consumers without the HTTP API")
+    parser.add_argument('--processes', type=int, default=WORKER_PROCESSES)
+    parser.add_argument('--concurrency', type=int, default=WORKER_CONCURRENCY, help='consumer loops per process')
+    parser.add_argument('--health-port', type=int, default=WORKER_HEALTH_PORT, help='0 disables')
+    parser.add_argument('--drain-timeout', type=float, default=WORKER_DRAIN_TIMEOUT_SECONDS)
+    args = parser.parse_args(argv)
+    if args.processes > 1 and not USE_KAFKA and POLL_COORDINATION == 'none':
+        # Uncoordinated pollers in separate processes would all claim the same PENDING rows
+        parser.error("--processes > 1 in polling mode needs POLL_COORDINATION=lease or file")
+
+    if args.processes <= 1:
+        run_worker(args.concurrency, args.health_port, args.drain_timeout)
+        return 0
+    logging.basicConfig(level=getattr(logging, LOG_LEVEL))
+    return run_processes(args.processes, args.concurrency, args.health_port, args.drain_timeout)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,30 @@
+import pytest
+from processor_app.content_processor_service.content_digest import compute_digest
+from processor_app.content_processor_service.schema import Submission
+from processor_app.repositories.processor_repository import ProcessorRepository
+
+
+@pytest.fixture
+async def sqlite_repo():
+    # Each test gets its own in-memory database; disposing closes the pooled connection that holds it
+    repo = ProcessorRepository("sqlite+aiosqlite:///:memory:")
+    await repo.init_db()
+    yield repo
+    await repo.engine.dispose()
+
+
+@pytest.fixture
+def insert_submission(sqlite_repo):
+    """Adds a submission row directly, bypassing create(), so tests can set any column"""
+    async def insert(submission_id, status, content=None, **columns):
+        content = content if content is not None else f"content {submission_id} 123"
+        async with sqlite_repo.get_session() as session:
+            async with session.begin():
+                session.add(Submission(
+                    id=submission_id,
+                    content=content,
+                    content_digest=compute_digest(content),
+                    status=status,
+                    **columns
+                ))
+    return insert
@@ -0,0 +1,174 @@
+import asyncio
+import pytest
+import sqlalchemy
+from datetime import datetime
+from functools import partial
+from unittest.mock import AsyncMock, Mock
+from processor_app.consumers.adaptive_limiter import AdaptiveConcurrencyLimiter, is_overload_error
+from processor_app.consumers.fastapi_poll import FastAPIPoll
+from processor_app.consumers.kafka_consumer import KafkaConsumer
+from processor_app.consumers.submission_processor import SubmissionProcessor
+from processor_app.content_processor_service.schema import Submission, SubmissionPriority, SubmissionStatus
+from processor_app.infra.memory_broker import MemoryBroker, MemoryKafkaConsumer, MemoryKafkaProducer
+from processor_app.metrics.pipeline_metrics import CONSUMER_CONCURRENCY_LIMIT
+from processor_app.producers.kafka_producer import KafkaProducerImpl
+
+
+def _locked_error():
+    return sqlalchemy.exc.OperationalError("UPDATE submissions", {}, Exception("database is locked"))
+
+
+class TestAdaptiveConcurrencyLimiter:
+
+    def test_additive_increase_while_saturated(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=6, target_latency=0.1)
+
+        # +1/limit per completion: about one step per round of `limit` completions
+        for _ in range(5):
+            limiter.on_sample(0.01, in_flight=4)
+        assert limiter.limit == 5
+
+        for _ in range(100):
+            limiter.on_sample(0.01, in_flight=limiter.limit)
+        assert limiter.limit == 6
+
+    def test_idle_limiter_does_not_grow(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, target_latency=0.1)
+
+        for _ in range(50):
+            limiter.on_sample(0.01, in_flight=1)
+
+        assert limiter.limit == 8
+
+    def test_multiplicative_decrease_once_per_window(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=16, min_limit=2, target_latency=60, backoff_ratio=0.5)
+
+        limiter.on_sample(0.01, overloaded=True)
+        limiter.on_sample(0.01, overloaded=True)
+
+        assert limiter.limit == 8
+        assert limiter.decreases_total == 1
+        assert CONSUMER_CONCURRENCY_LIMIT.labels("default").value == 8
+
+    def test_slow_samples_cut_down_to_minimum(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=16, min_limit=2, target_latency=0, backoff_ratio=0.5)
+
+        for _ in range(10):
+            limiter.on_sample(1.0)
+
+        assert limiter.limit == 2
+
+    def test_overload_errors(self):
+        assert is_overload_error(_locked_error())
+        assert is_overload_error(asyncio.TimeoutError())
+        assert not is_overload_error(ValueError("bad content"))
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_a_free_slot(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+        await limiter.acquire()
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        limiter.release()
+        await asyncio.wait_for(waiter, 1)
+        assert limiter.in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_lock_error_in_processor_shrinks_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, target_latency=60, backoff_ratio=0.5)
+        repository = AsyncMock()
+        repository.get_by_id.side_effect = _locked_error()
+        processor = SubmissionProcessor(repository, Mock(), concurrency_limiter=limiter)
+
+        assert not await processor.process_submission("sub-1", "Content 123")
+
+        assert limiter.limit == 4
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_overload_error_backs_off_and_retries(self):
+        repository = AsyncMock()
+        repository.get_by_id.side_effect = lambda *_, **__: Submission(
+            id="sub-1", content="Content 123", status=SubmissionStatus.PENDING, created_at=datetime.utcnow()
+        )
+        # The claim hits a lock timeout once, then goes through
+        repository.update_status.side_effect = [_locked_error(), None, None]
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, target_latency=60)
+        processor = SubmissionProcessor(
+            repository, Mock(), concurrency_limiter=limiter, overload_retries=2, overload_backoff=0.001
+        )
+
+        assert await processor.process_submission("sub-1", "Content 123") is True
+
+        repository.release_claim.assert_awaited_once_with("sub-1")
+        assert repository.update_status.call_args_list[-1][0][1] == SubmissionStatus.PASSED
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_overload_retries_are_bounded(self):
+        repository = AsyncMock()
+        repository.get_by_id.side_effect = _locked_error()
+        processor = SubmissionProcessor(repository, Mock(), overload_retries=2, overload_backoff=0.001)
+
+        assert await processor.process_submission("sub-1", "Content 123") is False
+
+        assert repository.release_claim.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_processing_delay_holds_no_limiter_room(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+        consumer = FastAPIPoll(
+            AsyncMock(), Mock(), processing_delay=60, max_concurrency=3, concurrency_limiter=limiter
+        )
+        for index in range(4):
+            consumer.scheduler.enqueue(SubmissionPriority.NORMAL, (Mock(id=f"sub-{index}"), 0))
+
+        consumer._dispatch()
+
+        # Every delayed task is dispatched up to the hard ceiling, none of them holds a slot yet
+        assert len(consumer._in_flight) == 3
+        assert limiter.in_flight == 0
+        for task in consumer._in_flight:
+            task.cancel()
+        await asyncio.gather(*consumer._in_flight, return_exceptions=True)
+
+
+class TestKafkaConcurrentBatch:
+
+    @pytest.mark.asyncio
+    async def test_batch_runs_concurrently_and_commits_everything(self):
+        broker = MemoryBroker(num_partitions=1)
+        producer = KafkaProducerImpl(["unused"], client_factory=partial(MemoryKafkaProducer, broker=broker))
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=4)
+        consumer = KafkaConsumer(
+            AsyncMock(), Mock(), ["unused"], "subs", "workers",
+            max_poll_records=20,
+            client_factory=partial(MemoryKafkaConsumer, broker=broker),
+            concurrency_limiter=limiter
+        )
+        active = {'now': 0, 'peak': 0}
+
+        async def process(*_, **__):
+            async with limiter.slot():
+                active['now'] += 1
+                active['peak'] = max(active['peak'], active['now'])
+                await asyncio.sleep(0.01)
+                active['now'] -= 1
+            return True
+
+        consumer.processor.process_submission = process
+        for index in range(12):
+            producer.publish("subs", {'id': f"sub-{index}", 'content': f"Content {index}"})
+
+        await consumer.start()
+        for _ in range(100):
+            if broker.lag("workers", "subs") == 0:
+                break
+            await asyncio.sleep(0.02)
+        await consumer.shutdown()
+
+        assert broker.lag("workers", "subs") == 0
+        assert active['peak'] == 4
@@ -0,0 +1,145 @@
+import pytest
+from fastapi import Depends, FastAPI
+from benchmarks.asgi_client import AsgiClient
+from processor_app.admission import AdmissionController, BacklogMonitor, TokenBucketLimiter
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.content_processor_service import content_processor_route
+from processor_app.content_processor_service.content_processor_route import admit_submission
+from processor_app.content_processor_service.request.content_request import ContentSubmissionRequest
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+async def content_repo(sqlite_repo):
+    return ContentProcessorRepository(sqlite_repo)
+
+
+class TestTokenBucketLimiter:
+
+    def test_burst_then_retry_after(self):
+        clock = FakeClock()
+        limiter = TokenBucketLimiter(rate=0.5, burst=3, clock=clock)
+
+        assert [limiter.acquire("a") for _ in range(3)] == [None, None, None]
+        assert limiter.acquire("a") == 2
+
+        clock.now = 2.0
+        assert limiter.acquire("a") is None
+
+    def test_clients_are_independent(self):
+        limiter = TokenBucketLimiter(rate=1, burst=1, clock=FakeClock())
+
+        assert limiter.acquire("a") is None
+        assert limiter.acquire("a") == 1
+        assert limiter.acquire("b") is None
+
+    def test_forgets_least_recent_clients(self):
+        limiter = TokenBucketLimiter(rate=1, burst=1, max_clients=2, clock=FakeClock())
+
+        for key in ("a", "b", "c"):
+            limiter.acquire(key)
+
+        # "a" was evicted, so it starts again with a full bucket
+        assert limiter.acquire("a") is None
+        assert len(limiter._buckets) == 2
+
+    def test_caps_key_buckets_per_owner(self):
+        limiter = TokenBucketLimiter(rate=1, burst=1, max_keys_per_owner=2, clock=FakeClock())
+
+        assert limiter.acquire("k1", owner="10.0.0.1") is None
+        assert limiter.acquire("k2", owner="10.0.0.1") is None
+        # Past its share, new keys from the address draw from the address bucket
+        assert limiter.acquire("k3", owner="10.0.0.1") is None
+        assert limiter.acquire("k4", owner="10.0.0.1") == 1
+        assert set(limiter._buckets) == {"k1", "k2", "10.0.0.1"}
+        assert limiter.acquire("k5", owner="10.0.0.2") is None
+
+    def test_evicted_keys_release_the_owner_share(self):
+        limiter = TokenBucketLimiter(rate=1, burst=1, max_clients=2, max_keys_per_owner=1, clock=FakeClock())
+
+        limiter.acquire("k1", owner="10.0.0.1")
+        limiter.acquire("x", owner="10.0.0.2")
+        limiter.acquire("y", owner="10.0.0.3")
+
+        assert limiter._owned == {"10.0.0.2": {"x"}, "10.0.0.3": {"y"}}
+
+
+class TestBacklogMonitor:
+
+    @pytest.mark.asyncio
+    async def test_counts_pending_and_processing(self, content_repo):
+        for index in range(3):
+            await content_repo.create(ContentSubmissionRequest(content=f"content {index}"))
+        monitor = BacklogMonitor(content_repo, lag_provider=lambda: 1)
+
+        await monitor.refresh()
+
+        assert monitor.pending == 3
+        assert monitor.lag == 1
+        assert monitor.backlog == 3
+
+    @pytest.mark.asyncio
+    async def test_lag_dominates_when_larger(self, content_repo):
+        monitor = BacklogMonitor(content_repo, lag_provider=lambda: 7)
+
+        await monitor.refresh()
+
+        assert monitor.backlog == 7
+
+
+class TestAdmissionController:
+
+    def test_rejects_over_backlog(self):
+        monitor = BacklogMonitor(repository=None)
+        monitor.pending = 10
+        controller = AdmissionController(backlog_monitor=monitor, max_backlog=10, backlog_retry_after=4)
+
+        assert controller.check("a") == ("backlog", 4)
+
+        monitor.pending = 9
+        assert controller.check("a") is None
+
+    def test_rate_limit(self):
+        controller = AdmissionController(limiter=TokenBucketLimiter(rate=1, burst=1, clock=FakeClock()))
+
+        assert controller.check("a") is None
+        assert controller.check("a") == ("rate_limit", 1)
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        monkeypatch.setattr(content_processor_route, 'ADMISSION_API_KEYS', frozenset({"k1", "k2"}))
+        app = FastAPI()
+        app.state.admission = AdmissionController(limiter=TokenBucketLimiter(rate=1, burst=1, clock=FakeClock()))
+
+        @app.post("/submit", dependencies=[Depends(admit_submission)])
+        async def submit():
+            return {"ok": True}
+
+        return AsgiClient(app)
+
+    @pytest.mark.asyncio
+    async def test_route_returns_429_with_retry_after(self, client):
+        status, _, _ = await client.request("POST", "/submit", headers={"X-API-Key": "k1"})
+        assert status == 200
+        status, headers, _ = await client.request("POST", "/submit", headers={"X-API-Key": "k1"})
+        assert status == 429
+        assert headers["retry-after"] == "1"
+        status, _, _ = await client.request("POST", "/submit", headers={"X-API-Key": "k2"})
+        assert status == 200
+
+    @pytest.mark.asyncio
+    async def test_unknown_api_keys_share_the_address_bucket(self, client):
+        status, _, _ = await client.request("POST", "/submit", headers={"X-API-Key": "made-up-1"})
+        assert status == 200
+        status, _, _ = await client.request("POST", "/submit", headers={"X-API-Key": "made-up-2"})
+        assert status == 429
+        status, _, _ = await client.request("POST", "/submit")
+        assert status == 429
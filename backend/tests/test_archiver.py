@@ -0,0 +1,84 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.content_processor_service.request.content_request import ContentSubmissionRequest
+from processor_app.content_processor_service.schema import Submission, SubmissionArchive, SubmissionStatus
+from processor_app.jobs.archiver import SubmissionArchiver
+
+
+def _days_ago(days):
+    return datetime.utcnow() - timedelta(days=days)
+
+
+async def _count(repo, model):
+    async with repo.get_session() as session:
+        return (await session.execute(select(func.count()).select_from(model))).scalar()
+
+
+class TestSubmissionArchiver:
+
+    @pytest.mark.asyncio
+    async def test_moves_only_old_terminal_rows(self, sqlite_repo, insert_submission):
+        content_repo = ContentProcessorRepository(sqlite_repo)
+        await insert_submission("old-passed", SubmissionStatus.PASSED, processed_at=_days_ago(40))
+        await insert_submission("old-failed", SubmissionStatus.FAILED, processed_at=_days_ago(40))
+        await insert_submission("recent", SubmissionStatus.PASSED, processed_at=_days_ago(1))
+        await insert_submission("pending", SubmissionStatus.PENDING)
+        archiver = SubmissionArchiver(content_repo, archive_after_days=30)
+
+        assert await archiver.archive_once() == 2
+
+        assert await _count(sqlite_repo, Submission) == 2
+        assert await _count(sqlite_repo, SubmissionArchive) == 2
+        assert archiver.archived_total == 2
+
+    @pytest.mark.asyncio
+    async def test_runs_in_bounded_batches(self, sqlite_repo, insert_submission):
+        content_repo = ContentProcessorRepository(sqlite_repo)
+        for index in range(7):
+            await insert_submission(f"old-{index}", SubmissionStatus.PASSED, processed_at=_days_ago(40))
+        calls = []
+        original = content_repo.archive_terminal
+
+        async def archive_terminal(cutoff, limit):
+            calls.append(limit)
+            return await original(cutoff, limit)
+
+        content_repo.archive_terminal = archive_terminal
+        archiver = SubmissionArchiver(content_repo, archive_after_days=30, batch_size=3, batch_pause_seconds=0)
+
+        assert await archiver.archive_once() == 7
+        assert calls == [3, 3, 3]
+
+    @pytest.mark.asyncio
+    async def test_lookup_falls_back_to_archive(self, sqlite_repo):
+        content_repo = ContentProcessorRepository(sqlite_repo, dedup_enabled=True)
+        await content_repo.backfill_status_counters()
+        created = await content_repo.create(ContentSubmissionRequest(content="archived 42"))
+        await content_repo.update_status(
+            created.id, SubmissionStatus.PASSED, processed_at=datetime.utcnow() - timedelta(days=40)
+        )
+
+        await SubmissionArchiver(content_repo, archive_after_days=30).archive_once()
+
+        archived = await content_repo.get_by_id(created.id)
+        assert isinstance(archived, SubmissionArchive)
+        assert archived.status == SubmissionStatus.PASSED
+        # Deduplicated content still resolves through content_blobs
+        assert archived.content == "archived 42"
+        assert await content_repo.list_all() == []
+        assert (await content_repo.status_counts())[SubmissionStatus.PASSED] == 1
+
+    @pytest.mark.asyncio
+    async def test_backfill_counts_archived_rows(self, sqlite_repo, insert_submission):
+        content_repo = ContentProcessorRepository(sqlite_repo)
+        await insert_submission("old", SubmissionStatus.FAILED, processed_at=_days_ago(40))
+        await insert_submission("pending", SubmissionStatus.PENDING)
+        await SubmissionArchiver(content_repo, archive_after_days=30).archive_once()
+
+        await content_repo.backfill_status_counters(rebuild=True)
+
+        counts = await content_repo.status_counts()
+        assert counts[SubmissionStatus.FAILED] == 1
+        assert counts[SubmissionStatus.PENDING] == 1
@@ -0,0 +1,105 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy import select
+from processor_app.compression import get_codec, pack_content, unpack_content
+from processor_app.consumers.kafka_consumer import KafkaConsumer
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.content_processor_service.request.content_request import ContentSubmissionRequest
+from processor_app.content_processor_service.schema import Submission
+from processor_app.producers.kafka_producer import KafkaProducerImpl
+
+LARGE_CONTENT = "repetitive content 12345 " * 200
+
+
+class TestContentCodec:
+
+    @pytest.mark.parametrize("codec_name", ["zlib", "lzma"])
+    def test_round_trip(self, codec_name):
+        codec, payload = pack_content(LARGE_CONTENT, codec_name, threshold=100)
+
+        assert codec == codec_name
+        assert len(payload) < len(LARGE_CONTENT)
+        assert unpack_content(codec, payload) == LARGE_CONTENT
+        assert unpack_content(codec, memoryview(payload)) == LARGE_CONTENT
+
+    def test_below_threshold_is_not_compressed(self):
+        assert pack_content("small 123", "zlib", threshold=100) == (None, "small 123")
+
+    def test_disabled_codec_is_passthrough(self):
+        assert pack_content(LARGE_CONTENT, "", threshold=0) == (None, LARGE_CONTENT)
+
+    def test_unknown_codec_rejected(self):
+        with pytest.raises(ValueError):
+            get_codec("snappy")
+
+
+class TestCompressedSubmission:
+
+    def test_store_content_compresses_above_threshold(self):
+        submission = Submission(id="s-1")
+        submission.store_content(LARGE_CONTENT, "zlib", threshold=100)
+
+        assert submission._content is None
+        assert submission.content_codec == "zlib"
+        assert submission.content == LARGE_CONTENT
+
+    def test_plain_assignment_clears_compressed_payload(self):
+        submission = Submission(id="s-1")
+        submission.store_content(LARGE_CONTENT, "zlib", threshold=100)
+        submission.content = "plain 123"
+
+        assert submission.content_compressed is None
+        assert submission.content == "plain 123"
+
+    @pytest.mark.asyncio
+    async def test_compressed_rows_are_decompressed_on_read(self, sqlite_repo):
+        content_repo = ContentProcessorRepository(sqlite_repo, compression_codec="zlib", compression_threshold=100)
+
+        created = await content_repo.create(ContentSubmissionRequest(content=LARGE_CONTENT))
+        small = await content_repo.create(ContentSubmissionRequest(content="Small content 1"))
+
+        async with sqlite_repo.get_session() as session:
+            rows = (await session.execute(
+                select(Submission.id, Submission._content, Submission.content_codec)
+            )).all()
+        stored = {row[0]: row[1:] for row in rows}
+        assert stored[created.id] == (None, "zlib")
+        assert stored[small.id] == ("Small content 1", None)
+
+        assert (await content_repo.get_by_id(created.id)).content == LARGE_CONTENT
+        assert {s.content for s in await content_repo.list_all()} == {LARGE_CONTENT, "Small content 1"}
+
+    @pytest.mark.asyncio
+    async def test_dedup_blobs_are_compressed(self, sqlite_repo):
+        content_repo = ContentProcessorRepository(
+            sqlite_repo, dedup_enabled=True, compression_codec="zlib", compression_threshold=100
+        )
+
+        first = await content_repo.create(ContentSubmissionRequest(content=LARGE_CONTENT))
+        await content_repo.create(ContentSubmissionRequest(content=LARGE_CONTENT))
+
+        loaded = await content_repo.get_by_id(first.id)
+        assert loaded.content_codec == "zlib"
+        assert loaded.content == LARGE_CONTENT
+
+
+class TestKafkaPayloadCompression:
+
+    def test_producer_compresses_large_payloads(self):
+        with patch.object(KafkaProducerImpl, '_initialize'):
+            producer = KafkaProducerImpl(["localhost:9092"], payload_codec="zlib", payload_compression_threshold=100)
+
+        message = producer._build_message("s-1", LARGE_CONTENT)
+
+        assert message['codec'] == "zlib"
+        assert len(message['content']) < len(LARGE_CONTENT)
+        assert KafkaConsumer._decode_content(message) == LARGE_CONTENT
+
+    def test_producer_keeps_small_payloads_plain(self):
+        with patch.object(KafkaProducerImpl, '_initialize'):
+            producer = KafkaProducerImpl(["localhost:9092"], payload_codec="zlib", payload_compression_threshold=100)
+
+        message = producer._build_message("s-1", "small 123")
+
+        assert message == {'id': "s-1", 'content': "small 123"}
+        assert KafkaConsumer._decode_content(message) == "small 123"
@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from datetime import datetime, timedelta
 from processor_app.consumers.fastapi_poll import FastAPIPoll
+from processor_app.consumers.kafka_consumer import KafkaConsumer
 from processor_app.content_processor_service.schema import SubmissionStatus
 from processor_app.content_processor_service.schema import Submission
 
@@ -114,7 +115,7 @@ class TestFastAPIPollConsumer:
         await fastapi_consumer.processor.process_submission("nonexistent-id", "content")
         
         assert mock_repository.get_by_id.called
-        mock_repository.get_by_id.assert_called_with("nonexistent-id")
+        mock_repository.get_by_id.assert_called_with("nonexistent-id", with_content=False)
     
     @pytest.mark.asyncio
     async def test_process_async_updates_final_status(self, fastapi_consumer, mock_repository, mock_validator):
@@ -386,3 +387,50 @@ class TestCrashSafetyAndIdempotency:
         assert mock_repository.update_status.called
         first_call = mock_repository.update_status.call_args_list[0]
         assert first_call[0][1] == SubmissionStatus.PENDING
+
+
+class TestKafkaClaimCheck:
+
+    @staticmethod
+    def _record(value, offset=0):
+        record = Mock()
+        record.value = value
+        record.offset = offset
+        return record
+
+    @pytest.mark.asyncio
+    async def test_claim_checked_contents_loaded_in_one_batch(self, mock_repository, mock_validator):
+        consumer = KafkaConsumer(mock_repository, mock_validator, ["localhost:9092"])
+        mock_repository.get_contents.return_value = {"a": "content a 1", "b": "content b 2"}
+        messages = {
+            "tp-0": [self._record({'id': "a", 'digest': "d1"}), self._record({'id': "x", 'content': "inline 1"})],
+            "tp-1": [self._record({'id': "b", 'digest': "d2"})],
+        }
+
+        contents = await consumer._fetch_claimed_contents(messages)
+
+        assert contents == {"a": "content a 1", "b": "content b 2"}
+        mock_repository.get_contents.assert_called_once_with(["a", "b"])
+
+    @pytest.mark.asyncio
+    async def test_inline_messages_skip_repository(self, mock_repository, mock_validator):
+        consumer = KafkaConsumer(mock_repository, mock_validator, ["localhost:9092"])
+
+        contents = await consumer._fetch_claimed_contents({"tp-0": [self._record({'id': "x", 'content': "inline 1"})]})
+
+        assert contents == {}
+        assert not mock_repository.get_contents.called
+
+    @pytest.mark.asyncio
+    async def test_processor_falls_back_to_stored_content(self, mock_repository, mock_validator):
+        consumer = KafkaConsumer(mock_repository, mock_validator, ["localhost:9092"])
+        mock_repository.get_by_id.return_value = Submission(
+            id="claim-1",
+            content="Stored content 12345",
+            status=SubmissionStatus.PENDING,
+            created_at=datetime.utcnow()
+        )
+
+        await consumer.processor.process_submission("claim-1", None)
+
+        mock_validator.validate.assert_called_with("Stored content 12345")
@@ -0,0 +1,142 @@
+import gzip
+import json
+import pytest
+from datetime import datetime, timedelta
+from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from benchmarks.asgi_client import AsgiClient
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.content_processor_service.content_processor_route import router
+from processor_app.content_processor_service.content_processor_service import ContentProcessorService
+from processor_app.content_processor_service.etag import if_none_match
+from processor_app.content_processor_service.request.content_request import ContentSubmissionRequest
+from processor_app.content_processor_service.schema import SubmissionStatus
+
+
+@pytest.fixture
+async def content_repo(sqlite_repo):
+    content_repo = ContentProcessorRepository(sqlite_repo)
+    await content_repo.backfill_status_counters()
+    return content_repo
+
+
+@pytest.fixture
+def client(content_repo):
+    app = FastAPI()
+    app.include_router(router)
+    app.state.content_service = ContentProcessorService(content_repo)
+    return AsgiClient(app)
+
+
+async def _create(content_repo, content="Content 123"):
+    return (await content_repo.create(ContentSubmissionRequest(content=content))).id
+
+
+class TestIfNoneMatch:
+
+    def test_matching(self):
+        assert if_none_match('"a"', '"a"')
+        assert if_none_match('"x", W/"a"', '"a"')
+        assert if_none_match('"a"', 'W/"a"')
+        assert if_none_match('*', '"a"')
+        assert not if_none_match('"b"', '"a"')
+        assert not if_none_match(None, '"a"')
+
+
+class TestConditionalSubmissionReads:
+
+    @pytest.mark.asyncio
+    async def test_unchanged_submission_is_304(self, content_repo, client):
+        submission_id = await _create(content_repo)
+        path = f"/api/submissions/{submission_id}"
+
+        status, headers, body = await client.request("GET", path)
+        assert status == 200
+        etag = headers["etag"]
+
+        status, headers, body = await client.request("GET", path, headers={"If-None-Match": etag})
+        assert status == 304
+        assert body == b""
+        assert headers["etag"] == etag
+
+    @pytest.mark.asyncio
+    async def test_status_change_and_trace_change_the_tag(self, content_repo, client):
+        submission_id = await _create(content_repo)
+        path = f"/api/submissions/{submission_id}"
+        _, headers, _ = await client.request("GET", path)
+        etag = headers["etag"]
+        _, trace_headers, _ = await client.request("GET", path + "?trace=true")
+        assert trace_headers["etag"] != etag
+
+        await content_repo.update_status(submission_id, SubmissionStatus.PASSED, processed_at=datetime.utcnow())
+
+        status, headers, body = await client.request("GET", path, headers={"If-None-Match": etag})
+        assert status == 200
+        assert headers["etag"] != etag
+        assert json.loads(body)["status"] == "PASSED"
+
+    @pytest.mark.asyncio
+    async def test_unknown_submission_has_no_tag(self, client):
+        status, headers, body = await client.request(
+            "GET", "/api/submissions/missing", headers={"If-None-Match": "*"}
+        )
+
+        assert status == 200
+        assert body == b"null"
+        assert "etag" not in headers
+
+
+class TestConditionalListReads:
+
+    @pytest.mark.asyncio
+    async def test_list_tag_follows_the_watermark(self, content_repo, client):
+        submission_id = await _create(content_repo)
+        _, headers, _ = await client.request("GET", "/api/submissions/")
+        etag = headers["etag"]
+
+        status, _, _ = await client.request("GET", "/api/submissions/", headers={"If-None-Match": etag})
+        assert status == 304
+
+        await content_repo.update_status(submission_id, SubmissionStatus.PROCESSING)
+        status, headers, _ = await client.request("GET", "/api/submissions/", headers={"If-None-Match": etag})
+        assert status == 200
+        etag = headers["etag"]
+
+        await content_repo.update_status(
+            submission_id, SubmissionStatus.PASSED, processed_at=datetime.utcnow() - timedelta(days=40)
+        )
+        _, headers, _ = await client.request("GET", "/api/submissions/")
+        etag = headers["etag"]
+        await content_repo.archive_terminal(datetime.utcnow() - timedelta(days=30))
+
+        status, _, body = await client.request("GET", "/api/submissions/", headers={"If-None-Match": etag})
+        assert status == 200
+        assert json.loads(body) == []
+
+
+class TestContentCoding:
+
+    @pytest.mark.asyncio
+    async def test_gzip_and_identity_share_a_weak_tag_and_vary(self, content_repo):
+        app = FastAPI()
+        app.include_router(router)
+        app.add_middleware(GZipMiddleware, minimum_size=1)
+        app.state.content_service = ContentProcessorService(content_repo)
+        client = AsgiClient(app)
+        submission_id = await _create(content_repo, "Compressible content 123 " * 20)
+        path = f"/api/submissions/{submission_id}"
+
+        _, identity, plain = await client.request("GET", path, headers={"Accept-Encoding": "identity"})
+        _, compressed, body = await client.request("GET", path, headers={"Accept-Encoding": "gzip"})
+
+        assert compressed["content-encoding"] == "gzip"
+        assert gzip.decompress(body) == plain
+        assert compressed["vary"] == "Accept-Encoding"
+        # Same representation, different bytes: only a weak tag may be shared
+        assert identity["etag"] == compressed["etag"] and identity["etag"].startswith('W/"')
+
+        status, headers, _ = await client.request(
+            "GET", path, headers={"Accept-Encoding": "gzip", "If-None-Match": compressed["etag"]}
+        )
+        assert status == 304
+        assert headers["vary"] == "Accept-Encoding"
@@ -0,0 +1,99 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from processor_app.content_processor_service.content_processor_route import get_content_processor_service
+from processor_app.infra.factory import Factory
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Importing Factory must not load these; it pulls them in only when a configured backend needs them
+HEAVY_MODULES = (
+    "kafka",
+    "orjson",
+    "processor_app.serializers",
+    "processor_app.content_processor_service.response.json_encoding",
+    "processor_app.profiling",
+    "cProfile",
+    "pstats",
+)
+
+_PROBE = """
+import importlib, json, sys
+importlib.import_module(sys.argv[1])
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def _modules_after_import(module: str, env: dict) -> list:
+    # A fresh interpreter, so modules imported by earlier tests do not count
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE, module],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "LOG_LEVEL": "WARNING", **env},
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _loaded(modules: list, package: str) -> bool:
+    return any(name == package or name.startswith(package + ".") for name in modules)
+
+
+class TestLazyBackends:
+
+    def test_poll_mode_does_not_import_kafka(self):
+        modules = _modules_after_import("main", {"USE_KAFKA": "false"})
+
+        assert not _loaded(modules, "kafka")
+        assert "processor_app.consumers.kafka_consumer" not in modules
+        assert "processor_app.infra.memory_broker" not in modules
+
+    @pytest.mark.parametrize("use_kafka", ["false", "true"])
+    def test_factory_import_leaves_heavy_modules_unloaded(self, use_kafka):
+        modules = _modules_after_import("processor_app.infra.factory", {"USE_KAFKA": use_kafka})
+
+        assert [package for package in HEAVY_MODULES if _loaded(modules, package)] == []
+
+    def test_load_backend_caches(self):
+        first = Factory.load_backend("consumer", "poll")
+
+        assert first.__name__ == "FastAPIPoll"
+        assert Factory.load_backend("consumer", "poll") is first
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            Factory.load_backend("consumer", "carrier-pigeon")
+
+
+class TestServiceWiring:
+
+    def test_service_is_built_once(self):
+        request = Mock()
+        request.app.state = Mock(spec=[])
+        request.app.state.producer = None
+
+        service = get_content_processor_service(request)
+
+        assert get_content_processor_service(request) is service
+
+
+class TestStartup:
+
+    @pytest.mark.asyncio
+    async def test_startup_errors_are_not_swallowed(self):
+        import main
+
+        repository = Mock()
+        repository.init_db = AsyncMock()
+        with patch.object(main.Factory, 'get_repository', return_value=repository), \
+                patch.object(main, 'ContentProcessorRepository') as content_repository:
+            content_repository.return_value.backfill_status_counters = AsyncMock(
+                side_effect=NotImplementedError("Upserts are not supported for dialect 'mysql'")
+            )
+            with pytest.raises(NotImplementedError):
+                await main.startup_event()
@@ -0,0 +1,65 @@
+import json
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.content_processor_service.request.content_request import ContentSubmissionRequest
+from processor_app.content_processor_service.response import json_encoding
+from processor_app.content_processor_service.response.create_response import ContentSubmissionResponse
+from processor_app.content_processor_service.response.trace_response import ContentSubmissionTraceResponse
+from processor_app.content_processor_service.schema import SubmissionStatus
+
+
+@pytest.fixture
+async def content_repo(sqlite_repo):
+    return ContentProcessorRepository(sqlite_repo, dedup_enabled=True, compression_codec="zlib", compression_threshold=100)
+
+
+async def _seed(content_repo):
+    short = await content_repo.create(ContentSubmissionRequest(content="short 1"))
+    await content_repo.create(ContentSubmissionRequest(content="compressed 2 " * 50))
+    # Same content again is stored as a digest reference only
+    await content_repo.create(ContentSubmissionRequest(content="compressed 2 " * 50))
+    await content_repo.update_status(
+        short.id, SubmissionStatus.PASSED, processed_at=datetime(2024, 1, 2, 3, 4, 5), trace={"validated": 1.5}
+    )
+    return short.id
+
+
+class TestJsonEncoding:
+
+    @pytest.mark.asyncio
+    async def test_list_matches_response_model(self, content_repo):
+        await _seed(content_repo)
+        submissions = await content_repo.list_all()
+
+        expected = [ContentSubmissionResponse.model_validate(s).model_dump(mode="json") for s in submissions]
+
+        assert json.loads(json_encoding.encode_submissions(submissions)) == expected
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("include_trace", [False, True])
+    async def test_get_matches_trace_response_model(self, content_repo, include_trace):
+        submission = await content_repo.get_by_id(await _seed(content_repo))
+        model = ContentSubmissionTraceResponse.model_validate(submission)
+        if not include_trace:
+            model.trace = None
+
+        encoded = json.loads(json_encoding.encode_submission(submission, include_trace))
+
+        assert encoded == model.model_dump(mode="json")
+        assert encoded["processed_at"] == "2024-01-02T03:04:05"
+
+    def test_missing_submission_is_null(self):
+        assert json_encoding.encode_submission(None) == b"null"
+
+    @pytest.mark.asyncio
+    async def test_stdlib_fallback_is_identical(self, content_repo):
+        await _seed(content_repo)
+        submissions = await content_repo.list_all()
+
+        fast = json_encoding.encode_submissions(submissions)
+        with patch.object(json_encoding, "orjson", None):
+            fallback = json_encoding.encode_submissions(submissions)
+
+        assert json.loads(fallback) == json.loads(fast)
@@ -0,0 +1,210 @@
+import asyncio
+import random
+import pytest
+from functools import partial
+from unittest.mock import AsyncMock, Mock
+from processor_app.consumers.kafka_consumer import KafkaConsumer
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.content_processor_service.request.content_request import ContentSubmissionRequest
+from processor_app.content_processor_service.schema import SubmissionStatus
+from processor_app.interfaces.validator import IContentValidator
+from processor_app.consumers.retry_policy import RetryPolicy
+from processor_app.infra.memory_broker import MemoryBroker, MemoryKafkaConsumer, MemoryKafkaProducer, TopicPartition
+from processor_app.metrics.stage_trace import now_ms
+from processor_app.producers.kafka_producer import KafkaProducerImpl
+from processor_app.serializers import deserialize_message, get_serializer
+
+
+class FlakyValidator(IContentValidator):
+    # Raises for the first `failures` calls, then accepts everything
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    def validate(self, content: str) -> bool:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("validator backend unavailable")
+        return True
+
+
+class TestRetryPolicy:
+
+    def test_backoff_doubles_and_caps(self):
+        policy = RetryPolicy(max_retries=10, backoff_ms=100, max_backoff_ms=1000, jitter=0)
+
+        assert [policy.delay_ms(n) for n in range(1, 6)] == [100, 200, 400, 800, 1000]
+
+    def test_jitter_stays_within_bounds(self):
+        policy = RetryPolicy(backoff_ms=1000, jitter=0.5, rng=random.Random(7))
+
+        delays = {policy.delay_ms(1) for _ in range(50)}
+
+        assert all(500 <= d <= 1000 for d in delays)
+        assert len(delays) > 1
+
+    def test_dead_letter_after_max_retries(self):
+        policy = RetryPolicy(max_retries=3)
+
+        assert not policy.should_dead_letter(3)
+        assert policy.should_dead_letter(4)
+
+
+class TestKafkaRetryRouting:
+
+    @pytest.fixture
+    def broker(self):
+        return MemoryBroker(num_partitions=1)
+
+    @pytest.fixture
+    async def content_repo(self, sqlite_repo):
+        content_repo = ContentProcessorRepository(sqlite_repo)
+        await content_repo.backfill_status_counters()
+        return content_repo
+
+    def _consumer(self, broker, max_retries=2, backoff_ms=10, repository=None, validator=None):
+        producer = KafkaProducerImpl(["unused"], client_factory=partial(MemoryKafkaProducer, broker=broker))
+        consumer = KafkaConsumer(
+            repository or AsyncMock(), validator or Mock(), ["unused"], "subs", "workers",
+            max_poll_records=10,
+            client_factory=partial(MemoryKafkaConsumer, broker=broker),
+            retry_producer=producer,
+            retry_topic="subs-retry",
+            dlq_topic="subs-dlq",
+            retry_policy=RetryPolicy(max_retries, backoff_ms, backoff_ms * 4, jitter=0)
+        )
+        return consumer, producer
+
+    @staticmethod
+    def _read(broker, topic):
+        return [
+            deserialize_message(record.value)
+            for record in broker.fetch(TopicPartition(topic, 0), 0, 100)
+        ]
+
+    async def _run_until(self, consumer, done):
+        await consumer.start()
+        for _ in range(100):
+            if done():
+                break
+            await asyncio.sleep(0.02)
+        await consumer.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_transient_failure_is_recovered_by_the_retry(self, broker, content_repo):
+        created = await content_repo.create(ContentSubmissionRequest(content="Flaky 123"))
+        validator = FlakyValidator(failures=1)
+        consumer, producer = self._consumer(broker, repository=content_repo, validator=validator)
+        producer.publish("subs", {'id': created.id, 'content': "Flaky 123"})
+
+        await self._run_until(consumer, lambda: validator.calls >= 2 and not broker.lag("workers", "subs-retry"))
+
+        assert validator.calls == 2
+        assert consumer.retried_total == 1 and consumer.dead_lettered_total == 0
+        submission = await content_repo.get_by_id(created.id)
+        assert submission.status == SubmissionStatus.PASSED
+        assert (await content_repo.status_counts())[SubmissionStatus.PROCESSING] == 0
+
+    @pytest.mark.parametrize("codec, content", [(None, "hello 123 world"), ("zlib", "hello 123 world " * 20)])
+    @pytest.mark.asyncio
+    async def test_binary_message_survives_a_json_retry(self, broker, content_repo, codec, content):
+        # Mixed formats during a rollout: binary on the main topic, JSON on the retry topic
+        created = await content_repo.create(ContentSubmissionRequest(content=content))
+        validator = FlakyValidator(failures=1)
+        consumer, _ = self._consumer(broker, repository=content_repo, validator=validator)
+        consumer.retry_producer = KafkaProducerImpl(
+            ["unused"], serializer=get_serializer("json"), client_factory=partial(MemoryKafkaProducer, broker=broker)
+        )
+        binary = KafkaProducerImpl(
+            ["unused"], "subs", payload_codec=codec, payload_compression_threshold=1,
+            serializer=get_serializer("binary"), client_factory=partial(MemoryKafkaProducer, broker=broker)
+        )
+        seen = []
+        validate = validator.validate
+        validator.validate = lambda content: seen.append(content) or validate(content)
+        binary.produce(created.id, content)
+
+        await self._run_until(consumer, lambda: validator.calls >= 2 and not broker.lag("workers", "subs-retry"))
+
+        assert seen == [content, content]
+        assert (await content_repo.get_by_id(created.id)).status == SubmissionStatus.PASSED
+
+    @pytest.mark.asyncio
+    async def test_failing_message_is_retried_then_dead_lettered(self, broker, content_repo):
+        created = await content_repo.create(ContentSubmissionRequest(content="Bad 123"))
+        validator = FlakyValidator(failures=10)
+        consumer, producer = self._consumer(broker, max_retries=2, repository=content_repo, validator=validator)
+        producer.publish("subs", {'id': created.id, 'content': "Bad 123"})
+
+        await self._run_until(consumer, lambda: consumer.dead_lettered_total)
+
+        assert validator.calls == 3
+        assert consumer.retried_total == 2
+        assert [m['attempt'] for m in self._read(broker, "subs-retry")] == [1, 2]
+        dead = self._read(broker, "subs-dlq")
+        assert [(m['id'], m['attempt'], m['content']) for m in dead] == [(created.id, 2, "Bad 123")]
+        assert (await content_repo.get_by_id(created.id)).status == SubmissionStatus.FAILED
+        assert broker.lag("workers", "subs") == 0
+        assert broker.lag("workers", "subs-retry") == 0
+
+    @pytest.mark.asyncio
+    async def test_failure_without_retry_topic_is_counted_as_dropped(self, broker):
+        consumer, producer = self._consumer(broker)
+        consumer.retry_producer = consumer.retry_topic = None
+        consumer.processor.process_submission = AsyncMock(return_value=False)
+        producer.publish("subs", {'id': "lost-1", 'content': "Lost 123"})
+
+        await self._run_until(consumer, lambda: consumer.dropped_total)
+
+        assert consumer.dropped_total == 1
+        assert consumer.processor.process_submission.call_args.kwargs['retry_on_error'] is False
+        assert broker.lag("workers", "subs") == 0
+
+    @pytest.mark.asyncio
+    async def test_pending_retry_does_not_block_main_topic(self, broker):
+        consumer, producer = self._consumer(broker)
+        consumer.processor.process_submission = AsyncMock(return_value=True)
+        producer.publish("subs-retry", {'id': "later", 'content': "Later 123", 'attempt': 1, 'retry_at': now_ms() + 60000})
+        producer.publish("subs", {'id': "now", 'content': "Now 123"})
+
+        await consumer.start()
+        for _ in range(100):
+            if consumer.processor.process_submission.called:
+                break
+            await asyncio.sleep(0.02)
+        await asyncio.sleep(0.05)
+        await consumer.shutdown()
+
+        processed = [c[0][0] for c in consumer.processor.process_submission.call_args_list]
+        assert processed == ["now"]
+        assert TopicPartition("subs-retry", 0) in consumer._delayed
+        assert broker.lag("workers", "subs-retry") == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_handoff_rewinds_partition(self, broker):
+        consumer, producer = self._consumer(broker)
+        consumer.consumer = Mock()
+        consumer.retry_producer = Mock()
+        consumer.retry_producer.publish.return_value = False
+        consumer.processor.process_submission = AsyncMock(return_value=False)
+        message = Mock(offset=4, value={'id': "x", 'content': "X 123"}, timestamp=None)
+        tp = TopicPartition("subs", 0)
+
+        assert not await consumer._handle_record(tp, message, {})
+
+        consumer.consumer.seek.assert_called_with(tp, 4)
+        assert not consumer.consumer.commit.called
+
+
+class TestRetryMetadataSerialization:
+
+    @pytest.mark.parametrize("name", ["json", "binary"])
+    def test_round_trip(self, name):
+        serializer = get_serializer(name)
+
+        message = deserialize_message(serializer.serialize(
+            {'id': "sub-1", 'content': "Retry 123", 'attempt': 3, 'retry_at': 1700000000123}
+        ))
+
+        assert (message['attempt'], message['retry_at']) == (3, 1700000000123)
@@ -0,0 +1,133 @@
+import asyncio
+import pytest
+from collections import Counter
+from unittest.mock import Mock, AsyncMock
+from processor_app.consumers.fastapi_poll import FastAPIPoll
+from processor_app.consumers.lane_scheduler import WeightedFairScheduler, parse_lane_weights
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.content_processor_service.request.content_request import ContentSubmissionRequest
+from processor_app.content_processor_service.schema import Submission, SubmissionPriority, SubmissionStatus
+
+
+class TestWeightedFairScheduler:
+
+    def test_dequeues_in_weight_proportion(self):
+        scheduler = WeightedFairScheduler({'high': 3, 'low': 1})
+        for i in range(100):
+            scheduler.enqueue('high', i)
+            scheduler.enqueue('low', i)
+
+        lanes = Counter(scheduler.dequeue()[0] for _ in range(40))
+
+        assert lanes == {'high': 30, 'low': 10}
+
+    def test_low_lane_is_not_starved(self):
+        scheduler = WeightedFairScheduler({'high': 8, 'low': 1})
+        for i in range(100):
+            scheduler.enqueue('high', i)
+        scheduler.enqueue('low', 'batch')
+
+        order = [scheduler.dequeue()[1] for _ in range(9)]
+
+        assert 'batch' in order
+
+    def test_idle_lane_does_not_bank_credit(self):
+        scheduler = WeightedFairScheduler({'high': 1, 'low': 1})
+        scheduler.enqueue('low', 'a')
+        scheduler.dequeue()
+        for i in range(4):
+            scheduler.enqueue('high', i)
+            scheduler.enqueue('low', i)
+
+        assert [scheduler.dequeue()[0] for _ in range(4)] in (
+            ['high', 'low', 'high', 'low'], ['low', 'high', 'low', 'high']
+        )
+
+    def test_empty(self):
+        scheduler = WeightedFairScheduler({'only': 1})
+
+        assert scheduler.dequeue() is None
+        assert len(scheduler) == 0
+
+    def test_parse_lane_weights(self):
+        assert parse_lane_weights("high=8, NORMAL=3,low=1") == {'HIGH': 8, 'NORMAL': 3, 'LOW': 1}
+        with pytest.raises(ValueError):
+            WeightedFairScheduler({'a': 0})
+
+    def test_partial_lane_weights_rejected(self):
+        # With LOW left out, LOW submissions would never be fetched
+        with pytest.raises(ValueError, match="LOW"):
+            FastAPIPoll(Mock(), Mock(), lane_weights=parse_lane_weights("HIGH=8,NORMAL=3"))
+        with pytest.raises(ValueError):
+            FastAPIPoll(Mock(), Mock(), lane_weights=parse_lane_weights("HIGH=8,NORMAL=3,LOW=0"))
+
+
+class TestPriorityPoll:
+
+    @staticmethod
+    def _submission(submission_id, priority):
+        return Submission(id=submission_id, content="Lane 123", status=SubmissionStatus.PENDING, priority=priority)
+
+    @pytest.mark.asyncio
+    async def test_high_lane_dispatched_first_and_not_requeued(self):
+        backlog = {
+            SubmissionPriority.HIGH: [self._submission("h1", SubmissionPriority.HIGH)],
+            SubmissionPriority.NORMAL: [],
+            SubmissionPriority.LOW: [self._submission(f"l{i}", SubmissionPriority.LOW) for i in range(5)],
+        }
+        repository = AsyncMock()
+        repository.get_pending.side_effect = lambda priority, limit: backlog[priority][:limit]
+        consumer = FastAPIPoll(repository, Mock(), processing_delay=10, max_concurrency=2)
+        consumer.running = True
+
+        await consumer._fetch_pending()
+        consumer._dispatch()
+        await consumer._fetch_pending()
+
+        assert len(consumer._in_flight) == 2
+        assert consumer.scheduler.depth(SubmissionPriority.LOW) == 4
+        assert consumer._queued_ids == {"h1", "l0", "l1", "l2", "l3", "l4"}
+        for task in list(consumer._in_flight):
+            task.cancel()
+        await asyncio.sleep(0)
+
+    @pytest.mark.asyncio
+    async def test_finished_submission_frees_slot(self):
+        repository = AsyncMock()
+        submissions = [self._submission(f"n{i}", SubmissionPriority.NORMAL) for i in range(3)]
+        repository.get_pending.side_effect = (
+            lambda priority, limit: submissions if priority == SubmissionPriority.NORMAL else []
+        )
+        repository.get_by_id.return_value = None
+        consumer = FastAPIPoll(repository, Mock(), processing_delay=0, max_concurrency=1)
+        consumer.running = True
+
+        await consumer._fetch_pending()
+        consumer._dispatch()
+        for _ in range(20):
+            if not consumer._queued_ids:
+                break
+            await asyncio.sleep(0.01)
+
+        assert repository.get_by_id.call_count == 3
+        assert len(consumer.scheduler) == 0
+
+
+class TestPendingByLane:
+
+    @pytest.mark.asyncio
+    async def test_lane_query_is_oldest_first_and_limited(self, sqlite_repo):
+        content_repo = ContentProcessorRepository(sqlite_repo)
+        created = [
+            await content_repo.create(ContentSubmissionRequest(content=f"Item {i}", priority=priority))
+            for i, priority in enumerate(["LOW", "HIGH", "LOW", "LOW"])
+        ]
+
+        low = await content_repo.get_pending(priority=SubmissionPriority.LOW, limit=2)
+
+        assert [s.id for s in low] == [created[0].id, created[2].id]
+        assert created[1].priority == SubmissionPriority.HIGH
+        assert len(await content_repo.get_pending()) == 4
+
+    def test_request_defaults_to_normal(self):
+        assert ContentSubmissionRequest(content="x").priority == SubmissionPriority.NORMAL
@@ -0,0 +1,125 @@
+import asyncio
+import pytest
+from unittest.mock import Mock, AsyncMock
+from processor_app.consumers.fastapi_poll import FastAPIPoll
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.content_processor_service.schema import Submission, SubmissionStatus
+from processor_app.coordination import LeaseLeaderElection, FileLockLeaderElection
+
+
+@pytest.fixture
+async def content_repo(sqlite_repo):
+    return ContentProcessorRepository(sqlite_repo)
+
+
+class TestLeaseLeaderElection:
+
+    @pytest.mark.asyncio
+    async def test_single_holder_until_expiry(self, content_repo):
+        first = LeaseLeaderElection(content_repo, "poll", "a", ttl_seconds=0.2)
+        second = LeaseLeaderElection(content_repo, "poll", "b", ttl_seconds=0.2)
+
+        assert await first.try_acquire()
+        assert await first.try_acquire()
+        assert not await second.try_acquire()
+
+        await asyncio.sleep(0.25)
+        assert await second.try_acquire()
+        assert not await first.try_acquire()
+
+    @pytest.mark.asyncio
+    async def test_release_hands_over_immediately(self, content_repo):
+        first = LeaseLeaderElection(content_repo, "poll", "a", ttl_seconds=60)
+        second = LeaseLeaderElection(content_repo, "poll", "b", ttl_seconds=60)
+
+        assert await first.try_acquire()
+        await first.release()
+
+        assert await second.try_acquire()
+
+    @pytest.mark.asyncio
+    async def test_renewal_error_steps_down(self):
+        repository = AsyncMock()
+        repository.acquire_lease.side_effect = [True, Exception("DB Error")]
+        election = LeaseLeaderElection(repository, "poll", "a", ttl_seconds=60)
+
+        assert await election.try_acquire()
+        assert not await election.try_acquire()
+        assert not election.is_leader
+
+
+class TestFileLockLeaderElection:
+
+    @pytest.mark.asyncio
+    async def test_lock_is_exclusive(self, tmp_path):
+        path = str(tmp_path / "poll.lock")
+        first = FileLockLeaderElection(path)
+        second = FileLockLeaderElection(path)
+
+        assert await first.try_acquire()
+        assert not await second.try_acquire()
+
+        await first.release()
+        assert await second.try_acquire()
+        await second.release()
+
+
+class TestCoordinatedPoll:
+
+    @pytest.mark.asyncio
+    async def test_follower_does_not_scan(self):
+        repository = AsyncMock()
+        election = Mock()
+        election.try_acquire = AsyncMock(return_value=False)
+        election.release = AsyncMock()
+        consumer = FastAPIPoll(repository, Mock(), poll_interval=0.01, leader_election=election)
+
+        await consumer.start()
+        await asyncio.sleep(0.05)
+        await consumer.shutdown()
+
+        assert election.try_acquire.called
+        assert not repository.get_pending.called
+        election.release.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_leader_scans(self):
+        repository = AsyncMock()
+        repository.get_pending.return_value = []
+        election = Mock()
+        election.try_acquire = AsyncMock(return_value=True)
+        election.release = AsyncMock()
+        consumer = FastAPIPoll(repository, Mock(), poll_interval=0.01, leader_election=election)
+
+        await consumer.start()
+        await asyncio.sleep(0.05)
+        await consumer.shutdown()
+
+        assert repository.get_pending.called
+
+    @pytest.mark.asyncio
+    async def test_deposed_leader_drops_its_queue(self):
+        repository = AsyncMock()
+        repository.get_pending.side_effect = lambda priority, limit: [
+            Submission(id=f"{priority.value}-{i}", content="Queued 123", status=SubmissionStatus.PENDING, priority=priority)
+            for i in range(3)
+        ]
+        leadership = iter([True])
+        election = Mock()
+        election.try_acquire = AsyncMock(side_effect=lambda: next(leadership, False))
+        election.release = AsyncMock()
+        consumer = FastAPIPoll(
+            repository, Mock(), poll_interval=0.01, processing_delay=10, leader_election=election, max_concurrency=1
+        )
+        consumer.processor.process_submission = AsyncMock()
+
+        await consumer.start()
+        await asyncio.sleep(0.05)
+
+        # The one dispatched task was still in processing_delay, so nothing reached the processor
+        assert len(consumer.scheduler) == 0
+        assert not consumer._queued_ids
+        assert not consumer._in_flight
+        assert repository.get_pending.call_count == 3
+        assert not consumer.processor.process_submission.called
+        await consumer.shutdown()
@@ -0,0 +1,138 @@
+import asyncio
+import pytest
+from functools import partial
+from processor_app.consumers.kafka_consumer import KafkaConsumer
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.content_processor_service.request.content_request import ContentSubmissionRequest
+from processor_app.content_processor_service.schema import SubmissionStatus
+from processor_app.infra.memory_broker import (
+    MemoryBroker,
+    MemoryBrokerError,
+    MemoryKafkaConsumer,
+    MemoryKafkaProducer,
+    OffsetAndMetadata,
+    TopicPartition
+)
+from processor_app.producers.kafka_producer import KafkaProducerImpl
+from processor_app.validators.content_validator import ContentValidator
+
+
+@pytest.fixture
+def broker():
+    return MemoryBroker(num_partitions=2)
+
+
+def _values(batch):
+    return sorted(record.value for records in batch.values() for record in records)
+
+
+class TestMemoryBroker:
+
+    def test_round_trip_with_serializers(self, broker):
+        producer = MemoryKafkaProducer(broker=broker, value_serializer=lambda v: v.encode())
+        consumer = MemoryKafkaConsumer(
+            "t", broker=broker, group_id="g", auto_offset_reset="earliest", value_deserializer=bytes.decode
+        )
+
+        metadata = producer.send("t", "hello").get(timeout=1)
+        batch = consumer.poll(timeout_ms=100)
+
+        assert metadata.offset == 0
+        assert _values(batch) == ["hello"]
+
+    def test_keyed_records_share_a_partition(self, broker):
+        producer = MemoryKafkaProducer(broker=broker)
+
+        partitions = {producer.send("t", b"v", key=b"same").get().partition for _ in range(5)}
+
+        assert len(partitions) == 1
+
+    def test_uncommitted_records_are_redelivered_to_the_group(self, broker):
+        producer = MemoryKafkaProducer(broker=broker)
+        for value in (b"a", b"b", b"c"):
+            producer.send("t", value, partition=0)
+
+        first = MemoryKafkaConsumer("t", broker=broker, group_id="g", auto_offset_reset="earliest",
+                                    enable_auto_commit=False)
+        records = first.poll(timeout_ms=100)[TopicPartition("t", 0)]
+        first.commit({TopicPartition("t", 0): OffsetAndMetadata(records[0].offset + 1, None)})
+        first.close()
+
+        second = MemoryKafkaConsumer("t", broker=broker, group_id="g", auto_offset_reset="earliest",
+                                     enable_auto_commit=False)
+
+        assert _values(second.poll(timeout_ms=100)) == [b"b", b"c"]
+        assert broker.lag("g", "t") == 2
+
+    def test_group_members_split_partitions(self, broker):
+        a = MemoryKafkaConsumer("t", broker=broker, group_id="g")
+        b = MemoryKafkaConsumer("t", broker=broker, group_id="g")
+
+        assert a.assignment() | b.assignment() == {TopicPartition("t", 0), TopicPartition("t", 1)}
+        assert not a.assignment() & b.assignment()
+
+        b.close()
+        assert len(a.assignment()) == 2
+
+    def test_pause_and_seek(self, broker):
+        producer = MemoryKafkaProducer(broker=broker)
+        producer.send("t", b"a", partition=0)
+        producer.send("t", b"b", partition=1)
+        consumer = MemoryKafkaConsumer("t", broker=broker, group_id="g", auto_offset_reset="earliest")
+
+        consumer.pause(TopicPartition("t", 1))
+        assert _values(consumer.poll(timeout_ms=100)) == [b"a"]
+
+        consumer.resume(TopicPartition("t", 1))
+        consumer.seek(TopicPartition("t", 0), 0)
+        assert _values(consumer.poll(timeout_ms=100)) == [b"a", b"b"]
+
+    def test_poll_waits_for_a_late_record(self, broker):
+        consumer = MemoryKafkaConsumer("t", broker=broker, group_id="g")
+        producer = MemoryKafkaProducer(broker=broker)
+
+        async def produce_later():
+            await asyncio.sleep(0.05)
+            producer.send("t", b"late")
+
+        async def scenario():
+            poll = asyncio.to_thread(consumer.poll, timeout_ms=2000)
+            return (await asyncio.gather(poll, produce_later()))[0]
+
+        assert _values(asyncio.run(scenario())) == [b"late"]
+
+    def test_failure_injection(self):
+        broker = MemoryBroker(failure_rate=1.0, seed=1)
+        producer = MemoryKafkaProducer(broker=broker)
+        consumer = MemoryKafkaConsumer("t", broker=broker, group_id="g")
+
+        with pytest.raises(MemoryBrokerError):
+            producer.send("t", b"v").get(timeout=1)
+        with pytest.raises(MemoryBrokerError):
+            consumer.commit()
+
+
+class TestKafkaPathOnMemoryBroker:
+
+    @pytest.mark.asyncio
+    async def test_submission_reaches_verdict(self, broker, sqlite_repo):
+        producer = KafkaProducerImpl(["unused"], "submissions", client_factory=partial(MemoryKafkaProducer, broker=broker))
+        repository = ContentProcessorRepository(sqlite_repo, producer)
+        consumer = KafkaConsumer(
+            repository, ContentValidator(), ["unused"], "submissions", "processors",
+            client_factory=partial(MemoryKafkaConsumer, broker=broker)
+        )
+
+        await consumer.start()
+        try:
+            created = await repository.create(ContentSubmissionRequest(content="Memory broker 123"))
+            for _ in range(100):
+                submission = await repository.get_by_id(created.id)
+                if submission.status == SubmissionStatus.PASSED:
+                    break
+                await asyncio.sleep(0.02)
+        finally:
+            await consumer.shutdown()
+
+        assert submission.status == SubmissionStatus.PASSED
+        assert broker.lag("processors", "submissions") == 0
@@ -0,0 +1,71 @@
+import pytest
+from processor_app.metrics.registry import MetricsRegistry, timed
+
+
+class TestMetricsRegistry:
+
+    def setup_method(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter_exposition(self):
+        counter = self.registry.counter("jobs_total", "Jobs", ["status"])
+        counter.labels("PASSED").inc()
+        counter.labels("PASSED").inc(2)
+
+        text = self.registry.render()
+
+        assert "# TYPE jobs_total counter" in text
+        assert 'jobs_total{status="PASSED"} 3' in text
+
+    def test_gauge_set_and_dec(self):
+        gauge = self.registry.gauge("depth", "Depth")
+        gauge.set(5)
+        gauge.dec()
+
+        assert "depth 4" in self.registry.render()
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = self.registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        histogram.observe(0.05)
+        histogram.observe(0.1)
+        histogram.observe(0.5)
+        histogram.observe(5)
+
+        text = self.registry.render()
+
+        assert 'latency_seconds_bucket{le="0.1"} 2' in text
+        assert 'latency_seconds_bucket{le="1"} 3' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+        assert "latency_seconds_count 4" in text
+        assert "latency_seconds_sum 5.65" in text
+
+    def test_label_values_are_escaped(self):
+        counter = self.registry.counter("escaped_total", "Escaped", ["name"])
+        counter.labels('a"b').inc()
+
+        assert 'escaped_total{name="a\\"b"} 1' in self.registry.render()
+
+    def test_wrong_label_count_rejected(self):
+        counter = self.registry.counter("labelled_total", "Labelled", ["a", "b"])
+
+        with pytest.raises(ValueError):
+            counter.labels("only-one")
+
+    def test_duplicate_registration_rejected(self):
+        self.registry.counter("dup_total", "Dup")
+
+        with pytest.raises(ValueError):
+            self.registry.counter("dup_total", "Dup")
+
+    @pytest.mark.asyncio
+    async def test_timed_decorator_observes_failures(self):
+        histogram = self.registry.histogram("call_seconds", "Calls", ["method"])
+
+        @timed(histogram.labels("broken"))
+        async def broken():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await broken()
+
+        assert histogram.labels("broken").count == 1
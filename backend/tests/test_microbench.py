@@ -0,0 +1,60 @@
+import pytest
+from benchmarks.microbench import BENCHMARKS, compare, welch_t_test, _student_t_sf
+
+
+def _result(samples):
+    return {'mean': sum(samples) / len(samples), 'samples': samples}
+
+
+class TestWelchTTest:
+
+    def test_student_t_tail_matches_known_values(self):
+        assert _student_t_sf(0.0, 10) == pytest.approx(0.5)
+        assert _student_t_sf(2.228, 10) == pytest.approx(0.025, abs=1e-4)
+        assert _student_t_sf(-2.228, 10) == pytest.approx(0.975, abs=1e-4)
+        assert _student_t_sf(1.96, 100000) == pytest.approx(0.025, abs=1e-4)
+
+    def test_clear_slowdown_is_significant(self):
+        baseline = [1.00, 1.01, 0.99, 1.02, 0.98, 1.00]
+        current = [1.30, 1.31, 1.29, 1.32, 1.28, 1.30]
+
+        t, df, p_value = welch_t_test(baseline, current)
+
+        assert t > 0
+        assert df > 0
+        assert p_value < 0.001
+
+    def test_zero_variance(self):
+        assert welch_t_test([1.0, 1.0], [1.0, 1.0])[2] == 1.0
+        assert welch_t_test([1.0, 1.0], [2.0, 2.0])[2] == 0.0
+
+
+class TestCompare:
+
+    def test_verdicts(self):
+        baseline = {
+            'slower': _result([1.00, 1.01, 0.99, 1.02, 0.98]),
+            'faster': _result([1.00, 1.01, 0.99, 1.02, 0.98]),
+            'noisy': _result([1.0, 1.5, 0.7, 1.2, 0.9]),
+        }
+        current = {
+            'slower': _result([1.50, 1.51, 1.49, 1.52, 1.48]),
+            'faster': _result([0.50, 0.51, 0.49, 0.52, 0.48]),
+            'noisy': _result([1.1, 1.6, 0.8, 1.3, 1.0]),
+            'added': _result([1.0, 1.0]),
+        }
+
+        verdicts = {row['name']: row['verdict'] for row in compare(baseline, current, 0.10, 0.01)}
+
+        assert verdicts == {'slower': 'regressed', 'faster': 'improved', 'noisy': 'unchanged', 'added': 'new'}
+
+    def test_small_slowdown_below_threshold_is_ignored(self):
+        baseline = {'op': _result([1.00, 1.001, 0.999, 1.0])}
+        current = {'op': _result([1.05, 1.051, 1.049, 1.05])}
+
+        assert compare(baseline, current, 0.10, 0.01)[0]['verdict'] == 'unchanged'
+
+    def test_registry_covers_hot_paths(self):
+        prefixes = {name.split('.')[0] for name in BENCHMARKS}
+
+        assert prefixes == {'validator', 'processor', 'repository', 'serializer', 'service'}
@@ -19,7 +19,31 @@ class TestFastAPITrigger:
 
 
 class TestKafkaProducerImpl:
-    pass
+
+    def _producer(self, **kwargs):
+        with patch.object(KafkaProducerImpl, '_initialize'):
+            return KafkaProducerImpl(["localhost:9092"], **kwargs)
+
+    def test_small_content_is_inlined(self):
+        producer = self._producer(claim_check_threshold=100)
+
+        message = producer._build_message("test-id", "test content 1", "digest")
+
+        assert message == {'id': "test-id", 'content': "test content 1"}
+
+    def test_large_content_is_claim_checked(self):
+        producer = self._producer(claim_check_threshold=100)
+
+        message = producer._build_message("test-id", "x1" * 100, "digest")
+
+        assert message == {'id': "test-id", 'digest': "digest"}
+
+    def test_claim_check_disabled(self):
+        producer = self._producer(claim_check_threshold=0)
+
+        message = producer._build_message("test-id", "x1" * 100, "digest")
+
+        assert message['content'] == "x1" * 100
 
 
 class TestProducerInterface:
@@ -0,0 +1,181 @@
+import asyncio
+import json
+import os
+import pstats
+import time
+import pytest
+from fastapi import FastAPI
+from benchmarks.asgi_client import AsgiClient
+from processor_app.admin_service import admin_route
+from processor_app.admin_service.admin_service import AdminService
+from processor_app.consumers.submission_processor import SubmissionProcessor
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.content_processor_service.request.content_request import ContentSubmissionRequest
+from processor_app.content_processor_service.schema import SubmissionStatus
+from processor_app.interfaces.validator import IContentValidator
+from processor_app.jobs.revalidator import SubmissionRevalidator
+from processor_app.profiling import ProfileStore, Profiler, ProfilingMiddleware
+from processor_app.validators import ContentValidator
+
+
+class SlowValidator(IContentValidator):
+
+    def validate(self, content: str) -> bool:
+        busy_until = time.perf_counter() + 0.03
+        while time.perf_counter() < busy_until:
+            pass
+        return True
+
+
+def _busy(seconds):
+    busy_until = time.perf_counter() + seconds
+    while time.perf_counter() < busy_until:
+        pass
+
+
+async def _awaits_then_computes():
+    await asyncio.sleep(0.03)
+    _busy(0.03)
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    return Profiler(ProfileStore(str(tmp_path), max_files=10), mode='sample', sample_interval_ms=1)
+
+
+def _folded(profiler, name):
+    with open(profiler.store.path(name)) as f:
+        return f.read()
+
+
+class TestProfileStore:
+
+    def test_keeps_the_newest_profiles(self, tmp_path):
+        store = ProfileStore(str(tmp_path), max_files=2)
+        names = []
+        for index in range(3):
+            name = store.new_name('request')
+            store.save(name, 'folded', b'a;b 1\n', {'label': f"GET /{index}"})
+            names.append(name)
+
+        assert [profile['name'] for profile in store.list()] == [names[2], names[1]]
+        assert store.path(names[0]) is None
+        kept = [f"{name}.{extension}" for name in names[1:] for extension in ('folded', 'json')]
+        assert sorted(os.listdir(tmp_path)) == sorted(kept)
+
+    def test_rejects_names_outside_the_ring(self, tmp_path):
+        store = ProfileStore(str(tmp_path), max_files=2)
+
+        assert store.path('../etc/passwd') is None
+        assert store.list() == []
+
+
+class TestProfiler:
+
+    @pytest.mark.asyncio
+    async def test_sampler_sees_awaited_and_synchronous_time(self, profiler):
+        async with profiler.profile('request', 'GET /slow') as handle:
+            await _awaits_then_computes()
+
+        folded = _folded(profiler, handle.name)
+        assert "test_profiling.py:_awaits_then_computes;tasks.py:sleep;<await>" in folded
+        assert "test_profiling.py:_awaits_then_computes;test_profiling.py:_busy" in folded
+        [metadata] = profiler.store.list()
+        assert metadata['kind'] == 'request' and metadata['label'] == 'GET /slow'
+        assert metadata['samples'] > 0 and metadata['duration_ms'] >= 60
+
+    @pytest.mark.asyncio
+    async def test_cprofile_mode_writes_pstats_and_runs_one_at_a_time(self, tmp_path):
+        profiler = Profiler(ProfileStore(str(tmp_path), max_files=10), mode='cprofile')
+
+        async with profiler.profile('request', 'GET /cpu') as handle:
+            async with profiler.profile('request', 'GET /overlapping') as skipped:
+                _busy(0.01)
+
+        assert skipped.name is None
+        stats = pstats.Stats(profiler.store.path(handle.name))
+        assert any(function == '_busy' for _, _, function in stats.stats)
+        assert len(profiler.store.list()) == 1
+
+    def test_unknown_mode(self, tmp_path):
+        with pytest.raises(ValueError):
+            Profiler(ProfileStore(str(tmp_path), max_files=1), mode='perf')
+
+
+class TestProfilingMiddleware:
+
+    @pytest.fixture
+    def client(self, profiler):
+        app = FastAPI()
+
+        @app.get("/slow")
+        async def slow():
+            await _awaits_then_computes()
+            return {"ok": True}
+
+        app.add_middleware(
+            ProfilingMiddleware, profiler=profiler, authorize=lambda token: token == 'secret', sample_rate=0
+        )
+        return AsgiClient(app)
+
+    @pytest.mark.asyncio
+    async def test_header_with_admin_token_profiles_the_request(self, client, profiler):
+        headers = {'X-Profile': '1', 'X-Admin-Token': 'secret'}
+        status, headers, _ = await client.request('GET', '/slow', headers=headers)
+
+        assert status == 200
+        folded = _folded(profiler, headers['x-profile-id'])
+        assert "<locals>.slow;test_profiling.py:_awaits_then_computes;tasks.py:sleep;<await>" in folded
+
+    @pytest.mark.asyncio
+    async def test_header_without_token_is_ignored(self, client, profiler):
+        _, headers, _ = await client.request('GET', '/slow', headers={'X-Profile': '1', 'X-Admin-Token': 'wrong'})
+
+        assert 'x-profile-id' not in headers
+        assert profiler.store.list() == []
+
+
+class TestConsumerProfiling:
+
+    @pytest.mark.asyncio
+    async def test_sampled_submissions_are_profiled(self, profiler, sqlite_repo):
+        content_repo = ContentProcessorRepository(sqlite_repo)
+        created = await content_repo.create(ContentSubmissionRequest(content="profiled content 1"))
+        processor = SubmissionProcessor(content_repo, SlowValidator(), profiler=profiler, profile_sample_rate=1)
+
+        assert await processor.process_submission(created.id, None) is True
+
+        assert (await content_repo.get_by_id(created.id)).status == SubmissionStatus.PASSED
+        [metadata] = profiler.store.list()
+        assert metadata['kind'] == 'consumer'
+        assert "test_profiling.py:SlowValidator.validate" in _folded(profiler, metadata['name'])
+
+
+class TestAdminProfileEndpoints:
+
+    @pytest.mark.asyncio
+    async def test_lists_and_downloads_profiles(self, profiler, monkeypatch, sqlite_repo):
+        monkeypatch.setattr(admin_route, 'ADMIN_TOKEN', 'secret')
+        content_repo = ContentProcessorRepository(sqlite_repo)
+        app = FastAPI()
+        app.include_router(admin_route.router)
+        app.state.admin_service = AdminService(
+            content_repo, SubmissionRevalidator(content_repo, ContentValidator()), profiler=profiler
+        )
+        client = AsgiClient(app)
+        headers = {'X-Admin-Token': 'secret'}
+        async with profiler.profile('request', 'GET /slow') as handle:
+            await _awaits_then_computes()
+
+        status, _, body = await client.request('GET', '/api/admin/profiles', headers=headers)
+        assert status == 200
+        assert [profile['name'] for profile in json.loads(body)] == [handle.name]
+
+        path = f'/api/admin/profiles/{handle.name}'
+        status, response_headers, body = await client.request('GET', path, headers=headers)
+        assert status == 200
+        assert response_headers['content-type'].startswith('text/plain')
+        assert b"_awaits_then_computes" in body
+
+        status, _, _ = await client.request('GET', '/api/admin/profiles/missing', headers=headers)
+        assert status == 404
@@ -0,0 +1,195 @@
+import asyncio
+import json
+import pytest
+from datetime import datetime, timedelta
+from fastapi import FastAPI
+from benchmarks.asgi_client import AsgiClient
+from processor_app.admin_service import admin_route
+from processor_app.admin_service.admin_service import AdminService
+from processor_app.content_processor_service.content_digest import compute_digest
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.content_processor_service.schema import RevalidationStatus, SubmissionStatus
+from processor_app.interfaces.validator import IContentValidator
+from processor_app.jobs.revalidator import SubmissionRevalidator
+from processor_app.validators import ContentValidator
+
+
+class KeywordValidator(IContentValidator):
+    # Stricter rules than ContentValidator: content must mention "valid"
+    version = "2"
+
+    def validate(self, content: str) -> bool:
+        return "valid" in content
+
+
+@pytest.fixture
+async def content_repo(sqlite_repo, insert_submission):
+    for index in range(5):
+        await _insert(insert_submission, f"a-{index}", SubmissionStatus.PASSED, f"valid content {index}")
+        await _insert(insert_submission, f"b-{index}", SubmissionStatus.PASSED, f"stale verdict {index}")
+    await _insert(insert_submission, "c-0", SubmissionStatus.FAILED, "valid now 0")
+    await _insert(insert_submission, "d-0", SubmissionStatus.PENDING, "valid but pending 0")
+    content_repo = ContentProcessorRepository(sqlite_repo)
+    await content_repo.backfill_status_counters()
+    return content_repo
+
+
+async def _insert(insert_submission, submission_id, status, content, validator_version="1"):
+    await insert_submission(
+        submission_id, status, content,
+        processed_at=datetime.utcnow() if status != SubmissionStatus.PENDING else None,
+        validator_version=validator_version
+    )
+
+
+async def _wait_for_checkpoint(content_repo, job_id, scanned):
+    for _ in range(200):
+        job = await content_repo.get_revalidation_job(job_id)
+        if job.scanned >= scanned:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} never reached {scanned} rows")
+
+
+class TestValidateBatch:
+
+    def test_matches_validate(self):
+        validator = ContentValidator()
+        contents = ["short 1", "long enough 1", "long enough but no digits", ""]
+
+        assert validator.validate_batch(contents) == [validator.validate(content) for content in contents]
+
+
+class TestSubmissionRevalidator:
+
+    @pytest.mark.asyncio
+    async def test_flips_stale_verdicts_and_stamps_version(self, content_repo):
+        revalidator = SubmissionRevalidator(content_repo, KeywordValidator(), chunk_size=4, rows_per_second=0)
+
+        job = await revalidator.start()
+        await asyncio.wait_for(revalidator._task, 5)
+
+        job = await content_repo.get_revalidation_job(job.id)
+        assert job.status == RevalidationStatus.COMPLETED
+        assert (job.scanned, job.changed) == (11, 6)
+        assert (await content_repo.get_by_id("b-3")).status == SubmissionStatus.FAILED
+        assert (await content_repo.get_by_id("c-0")).status == SubmissionStatus.PASSED
+        assert (await content_repo.get_by_id("d-0")).status == SubmissionStatus.PENDING
+        assert (await content_repo.get_by_id("a-1")).validator_version == "2"
+        counts = await content_repo.status_counts()
+        assert counts[SubmissionStatus.PASSED] == 6
+        assert counts[SubmissionStatus.FAILED] == 5
+        assert await content_repo.get_cached_verdict(compute_digest("stale verdict 2"), "2") is False
+
+    @pytest.mark.asyncio
+    async def test_rows_already_at_the_version_are_skipped(self, insert_submission, content_repo):
+        await _insert(insert_submission, "e-0", SubmissionStatus.PASSED, "no keyword 0", validator_version="2")
+        revalidator = SubmissionRevalidator(content_repo, KeywordValidator(), rows_per_second=0)
+
+        job = await revalidator.start()
+        await asyncio.wait_for(revalidator._task, 5)
+
+        assert (await content_repo.get_revalidation_job(job.id)).scanned == 11
+        assert (await content_repo.get_by_id("e-0")).status == SubmissionStatus.PASSED
+
+    @pytest.mark.asyncio
+    async def test_archived_rows_keep_their_verdict(self, content_repo):
+        await content_repo.update_status(
+            "b-0", SubmissionStatus.PASSED, processed_at=datetime.utcnow() - timedelta(days=40)
+        )
+        assert await content_repo.archive_terminal(datetime.utcnow() - timedelta(days=30)) == 1
+        revalidator = SubmissionRevalidator(content_repo, KeywordValidator(), rows_per_second=0)
+
+        job = await revalidator.start()
+        await asyncio.wait_for(revalidator._task, 5)
+
+        # Only the hot table is scanned; reads keep serving the archived verdict and its version
+        assert (await content_repo.get_revalidation_job(job.id)).scanned == 10
+        archived = await content_repo.get_by_id("b-0")
+        assert (archived.status, archived.validator_version) == (SubmissionStatus.PASSED, "1")
+        assert (await content_repo.get_by_id("b-1")).status == SubmissionStatus.FAILED
+
+    @pytest.mark.asyncio
+    async def test_resumes_from_checkpoint_after_shutdown(self, content_repo):
+        # 2 rows per chunk at 4 rows/s leaves the job sleeping after its first checkpoint
+        first = SubmissionRevalidator(content_repo, KeywordValidator(), chunk_size=2, rows_per_second=4)
+        job = await first.start()
+        await _wait_for_checkpoint(content_repo, job.id, 2)
+        await first.shutdown()
+
+        paused = await content_repo.get_revalidation_job(job.id)
+        assert paused.status == RevalidationStatus.PAUSED
+        assert paused.last_id
+
+        second = SubmissionRevalidator(content_repo, KeywordValidator(), chunk_size=2, rows_per_second=0)
+        assert await second.resume(job.id) is not None
+        await asyncio.wait_for(second._task, 5)
+
+        done = await content_repo.get_revalidation_job(job.id)
+        assert done.status == RevalidationStatus.COMPLETED
+        assert (done.scanned, done.changed) == (11, 6)
+
+    @pytest.mark.asyncio
+    async def test_pause_from_another_process_stops_the_runner(self, content_repo):
+        runner = SubmissionRevalidator(content_repo, KeywordValidator(), chunk_size=2, rows_per_second=20)
+        job = await runner.start()
+        await _wait_for_checkpoint(content_repo, job.id, 2)
+
+        other = SubmissionRevalidator(content_repo, KeywordValidator())
+        assert await other.pause(job.id) is True
+        await asyncio.wait_for(runner._task, 5)
+
+        paused = await content_repo.get_revalidation_job(job.id)
+        assert paused.status == RevalidationStatus.PAUSED
+        assert paused.scanned < 11
+
+    @pytest.mark.asyncio
+    async def test_one_running_job_and_matching_version_to_resume(self, content_repo):
+        runner = SubmissionRevalidator(content_repo, KeywordValidator(), chunk_size=2, rows_per_second=4)
+        job = await runner.start()
+
+        assert await SubmissionRevalidator(content_repo, KeywordValidator()).start() is None
+        await runner.shutdown()
+        assert await SubmissionRevalidator(content_repo, ContentValidator()).resume(job.id) is None
+
+
+class TestAdminRevalidationEndpoints:
+
+    @pytest.fixture
+    def client(self, content_repo, monkeypatch):
+        monkeypatch.setattr(admin_route, 'ADMIN_TOKEN', 'secret')
+        app = FastAPI()
+        app.include_router(admin_route.router)
+        revalidator = SubmissionRevalidator(content_repo, KeywordValidator(), rows_per_second=0)
+        app.state.admin_service = AdminService(content_repo, revalidator)
+        return AsgiClient(app), revalidator
+
+    @pytest.mark.asyncio
+    async def test_requires_token(self, client, monkeypatch):
+        client, _ = client
+
+        status, _, _ = await client.request('GET', '/api/admin/revalidations', headers={'X-Admin-Token': 'wrong'})
+        assert status == 401
+
+        monkeypatch.setattr(admin_route, 'ADMIN_TOKEN', '')
+        status, _, _ = await client.request('GET', '/api/admin/revalidations', headers={'X-Admin-Token': 'secret'})
+        assert status == 404
+
+    @pytest.mark.asyncio
+    async def test_start_and_inspect_job(self, client):
+        client, revalidator = client
+        headers = {'X-Admin-Token': 'secret'}
+
+        status, _, body = await client.request('POST', '/api/admin/revalidations', headers=headers)
+        assert status == 202
+        job_id = json.loads(body)['id']
+        await asyncio.wait_for(revalidator._task, 5)
+
+        status, _, body = await client.request('GET', f'/api/admin/revalidations/{job_id}', headers=headers)
+        assert status == 200
+        assert json.loads(body)['status'] == 'COMPLETED'
+
+        status, _, _ = await client.request('POST', f'/api/admin/revalidations/{job_id}/pause', headers=headers)
+        assert status == 409
+        status, _, _ = await client.request('POST', '/api/admin/revalidations/missing/resume', headers=headers)
+        assert status == 404
@@ -0,0 +1,75 @@
+import sqlite3
+import pytest
+from sqlalchemy import inspect, select
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.content_processor_service.request.content_request import ContentSubmissionRequest
+from processor_app.content_processor_service.schema import SubmissionPriority, SubmissionStatus
+from processor_app.repositories.processor_repository import ProcessorRepository
+from processor_app.repositories.schema_migrations import LATEST_VERSION, schema_version
+
+# The submissions table as the first release created it
+BASELINE_SCHEMA = """
+CREATE TABLE submissions (
+    id VARCHAR NOT NULL,
+    content VARCHAR NOT NULL,
+    status VARCHAR(10) NOT NULL,
+    created_at DATETIME NOT NULL,
+    processing_started_at DATETIME,
+    processed_at DATETIME,
+    PRIMARY KEY (id)
+);
+CREATE INDEX ix_submissions_id ON submissions (id);
+INSERT INTO submissions (id, content, status, created_at, processed_at)
+VALUES ('legacy-1', 'legacy content 1', 'PASSED', '2024-01-01 00:00:00', '2024-01-01 00:00:05');
+"""
+
+
+async def _version(repo):
+    async with repo.engine.connect() as conn:
+        return (await conn.execute(select(schema_version.c.version))).scalar_one()
+
+
+@pytest.fixture
+async def baseline_repo(tmp_path):
+    path = tmp_path / "baseline.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(BASELINE_SCHEMA)
+    repo = ProcessorRepository(f"sqlite+aiosqlite:///{path}")
+    yield repo
+    await repo.engine.dispose()
+
+
+class TestSchemaMigrations:
+
+    @pytest.mark.asyncio
+    async def test_upgrades_a_baseline_database(self, baseline_repo):
+        await baseline_repo.init_db()
+        content_repo = ContentProcessorRepository(baseline_repo, dedup_enabled=True, search_enabled=False)
+        await content_repo.backfill_status_counters()
+
+        [legacy] = await content_repo.list_all()
+        assert (legacy.id, legacy.content, legacy.status) == ("legacy-1", "legacy content 1", SubmissionStatus.PASSED)
+        assert legacy.priority == SubmissionPriority.NORMAL
+
+        # Deduplicated rows need the relaxed content column
+        first = await content_repo.create(ContentSubmissionRequest(content="shared content 2"))
+        second = await content_repo.create(ContentSubmissionRequest(content="shared content 2"))
+        assert (await content_repo.get_by_id(second.id)).content == "shared content 2"
+        assert {first.id, second.id, "legacy-1"} == {row.id for row in await content_repo.list_all()}
+        assert await _version(baseline_repo) == LATEST_VERSION
+
+    @pytest.mark.asyncio
+    async def test_upgrade_is_idempotent_and_keeps_indexes(self, baseline_repo):
+        await baseline_repo.init_db()
+        await baseline_repo.init_db()
+
+        async with baseline_repo.engine.connect() as conn:
+            indexes = await conn.run_sync(
+                lambda sync: {index['name'] for index in inspect(sync).get_indexes('submissions')}
+            )
+        assert {'ix_submissions_content_digest', 'ix_submissions_status_priority_created_at'} <= indexes
+        assert await _version(baseline_repo) == LATEST_VERSION
+
+    @pytest.mark.asyncio
+    async def test_fresh_database_is_stamped_latest(self, sqlite_repo):
+        assert await _version(sqlite_repo) == LATEST_VERSION
@@ -0,0 +1,159 @@
+import json
+import pytest
+from datetime import datetime, timedelta
+from fastapi import FastAPI
+from sqlalchemy import text
+from benchmarks.asgi_client import AsgiClient
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.content_processor_service.content_processor_route import router
+from processor_app.content_processor_service.content_processor_service import ContentProcessorService
+from processor_app.content_processor_service.request.content_request import ContentSubmissionRequest
+from processor_app.content_processor_service.schema import SubmissionStatus
+from processor_app.content_processor_service.search_index import SearchUnavailableError, match_expression
+
+
+@pytest.fixture
+async def content_repo(sqlite_repo):
+    content_repo = ContentProcessorRepository(sqlite_repo, search_enabled=True)
+    await content_repo.backfill_status_counters()
+    await content_repo.init_search_index()
+    return content_repo
+
+
+def _client(content_repo):
+    app = FastAPI()
+    app.include_router(router)
+    app.state.content_service = ContentProcessorService(content_repo)
+    return AsgiClient(app)
+
+
+async def _create(content_repo, content):
+    return (await content_repo.create(ContentSubmissionRequest(content=content))).id
+
+
+class TestMatchExpression:
+
+    def test_terms_are_quoted_and_anded(self):
+        assert match_expression('invoice 42') == '"invoice" "42"'
+
+    def test_operators_and_quotes_are_literal(self):
+        assert match_expression('a OR "b') == '"a" "OR" """b"'
+
+    def test_trailing_star_is_a_prefix_query(self):
+        assert match_expression('inv*') == '"inv"*'
+
+    def test_blank_query(self):
+        assert match_expression('  * ') is None
+
+
+class TestSearchRepository:
+
+    @pytest.mark.asyncio
+    async def test_ranks_matches_and_returns_snippets(self, content_repo):
+        weak = await _create(content_repo, "refund requested for order 1 " + "filler text " * 20)
+        strong = await _create(content_repo, "refund refund refund order 2")
+        await _create(content_repo, "unrelated content 3")
+
+        results = await content_repo.search("refund")
+
+        assert [row[0] for row in results] == [strong, weak]
+        assert "[refund]" in results[0][2]
+        assert results[0][1] == SubmissionStatus.PENDING
+
+    @pytest.mark.asyncio
+    async def test_filters_by_status(self, content_repo):
+        passed = await _create(content_repo, "shipping delay 1")
+        await _create(content_repo, "shipping delay 2")
+        await content_repo.update_status(passed, SubmissionStatus.PASSED, processed_at=datetime.utcnow())
+
+        results = await content_repo.search("shipping", status=SubmissionStatus.PASSED)
+
+        assert [(row[0], row[1]) for row in results] == [(passed, SubmissionStatus.PASSED)]
+
+    @pytest.mark.asyncio
+    async def test_archiving_removes_rows_from_the_index(self, sqlite_repo, content_repo):
+        archived = await _create(content_repo, "archived needle 7")
+        kept = await _create(content_repo, "kept needle 8")
+        await content_repo.update_status(
+            archived, SubmissionStatus.FAILED, processed_at=datetime.utcnow() - timedelta(days=40)
+        )
+        # Search being turned off later must not leave stale entries behind
+        archiver = ContentProcessorRepository(sqlite_repo, search_enabled=False)
+        assert await archiver.archive_terminal(datetime.utcnow() - timedelta(days=30)) == 1
+
+        assert [row[0] for row in await content_repo.search("needle")] == [kept]
+        async with sqlite_repo.engine.connect() as conn:
+            indexed = (await conn.execute(text("SELECT submission_id FROM submissions_fts"))).scalars().all()
+        assert indexed == [kept]
+        assert (await content_repo.get_by_id(archived)).status == SubmissionStatus.FAILED
+
+    @pytest.mark.asyncio
+    async def test_backfills_compressed_and_deduplicated_content(self, sqlite_repo):
+        writer = ContentProcessorRepository(
+            sqlite_repo, dedup_enabled=True, compression_codec='zlib', compression_threshold=1,
+            search_enabled=False
+        )
+        first = await _create(writer, "compressed haystack 1")
+        second = await _create(writer, "compressed haystack 1")
+
+        content_repo = ContentProcessorRepository(sqlite_repo, search_enabled=True)
+        assert await content_repo.init_search_index() is True
+        assert await content_repo.init_search_index() is False
+
+        results = await content_repo.search("haystack")
+        assert sorted(row[0] for row in results) == sorted([first, second])
+
+    @pytest.mark.asyncio
+    async def test_rows_created_after_init_by_another_repository_are_indexed(self, sqlite_repo, content_repo):
+        other = ContentProcessorRepository(sqlite_repo, search_enabled=True)
+        submission_id = await _create(other, "late arrival 5")
+
+        assert [row[0] for row in await content_repo.search("arrival")] == [submission_id]
+
+    @pytest.mark.asyncio
+    async def test_disabled_search_raises(self, sqlite_repo):
+        content_repo = ContentProcessorRepository(sqlite_repo, search_enabled=False)
+        await content_repo.init_search_index()
+
+        with pytest.raises(SearchUnavailableError):
+            await content_repo.search("anything")
+
+
+class TestSearchEndpoint:
+
+    @pytest.mark.asyncio
+    async def test_paginates_with_has_more(self, content_repo):
+        ids = [await _create(content_repo, f"paged result {index}") for index in range(3)]
+        client = _client(content_repo)
+
+        status, _, body = await client.request('GET', '/api/submissions/search?q=paged&limit=2')
+        first = json.loads(body)
+        status2, _, body2 = await client.request('GET', '/api/submissions/search?q=paged&limit=2&offset=2')
+        second = json.loads(body2)
+
+        assert status == status2 == 200
+        assert len(first['results']) == 2 and first['has_more'] is True
+        assert len(second['results']) == 1 and second['has_more'] is False
+        assert sorted(hit['id'] for hit in first['results'] + second['results']) == sorted(ids)
+
+    @pytest.mark.asyncio
+    async def test_status_filter_and_validation(self, content_repo):
+        await _create(content_repo, "status filtered 1")
+        client = _client(content_repo)
+
+        status, _, body = await client.request('GET', '/api/submissions/search?q=filtered&status=PASSED')
+        assert status == 200
+        assert json.loads(body)['results'] == []
+
+        status, _, _ = await client.request('GET', '/api/submissions/search?q=filtered&status=UNKNOWN')
+        assert status == 422
+        status, _, _ = await client.request('GET', '/api/submissions/search?q=filtered&limit=100000')
+        assert status == 422
+
+    @pytest.mark.asyncio
+    async def test_not_available_is_501(self, sqlite_repo):
+        client = _client(ContentProcessorRepository(sqlite_repo, search_enabled=False))
+
+        status, _, _ = await client.request('GET', '/api/submissions/search?q=anything')
+
+        assert status == 501
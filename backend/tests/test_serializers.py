@@ -0,0 +1,94 @@
+import json
+import zlib
+import pytest
+from processor_app.consumers.kafka_consumer import KafkaConsumer
+from processor_app.serializers import (
+    BinaryMessageSerializer,
+    JsonMessageSerializer,
+    deserialize_message,
+    get_serializer
+)
+
+
+class TestBinaryMessageSerializer:
+
+    def setup_method(self):
+        self.serializer = BinaryMessageSerializer()
+
+    def test_round_trip_plain_content(self):
+        data = self.serializer.serialize({'id': "sub-1", 'content': "héllo wörld 123"})
+
+        message = self.serializer.deserialize(data)
+
+        assert message['id'] == "sub-1"
+        assert message['codec'] is None
+        assert isinstance(message['content'], memoryview)
+        assert KafkaConsumer._decode_content(message) == "héllo wörld 123"
+
+    def test_round_trip_compressed_content(self):
+        payload = zlib.compress(b"compressed content 123" * 10)
+        data = self.serializer.serialize({'id': "sub-1", 'codec': "zlib", 'content': payload})
+
+        message = self.serializer.deserialize(data)
+
+        assert message['codec'] == "zlib"
+        assert bytes(message['content']) == payload
+        assert KafkaConsumer._decode_content(message) == "compressed content 123" * 10
+
+    def test_claim_check_message_has_no_content(self):
+        data = self.serializer.serialize({'id': "sub-1", 'digest': "ab" * 32})
+
+        message = self.serializer.deserialize(data)
+
+        assert message['digest'] == "ab" * 32
+        assert message['content'] is None
+
+    def test_smaller_than_json(self):
+        message = {'id': "0b7e6a3c-5f7e-4d0c-9a55-0c2d2f3e4a5b", 'content': "Test content 123"}
+
+        assert len(self.serializer.serialize(message)) < len(JsonMessageSerializer().serialize(message))
+
+    def test_rejects_newer_schema_version(self):
+        data = bytearray(self.serializer.serialize({'id': "sub-1", 'content': "x"}))
+        data[1] = 99
+
+        with pytest.raises(ValueError):
+            self.serializer.deserialize(bytes(data))
+
+
+class TestJsonMessageSerializer:
+
+    def test_plain_message_is_backwards_compatible(self):
+        data = JsonMessageSerializer().serialize({'id': "sub-1", 'content': "Test content 123"})
+
+        assert json.loads(data) == {'id': "sub-1", 'content': "Test content 123"}
+
+    def test_compressed_content_round_trip(self):
+        serializer = JsonMessageSerializer()
+        payload = zlib.compress(b"compressed 123")
+
+        message = serializer.deserialize(serializer.serialize({'id': "sub-1", 'codec': "zlib", 'content': payload}))
+
+        assert message['content'] == payload
+
+
+class TestMessageFormat:
+
+    def test_deserialize_detects_format(self):
+        message = {'id': "sub-1", 'content': "Test content 123"}
+
+        for name in ("json", "binary"):
+            decoded = deserialize_message(get_serializer(name).serialize(message))
+            assert KafkaConsumer._decode_content(decoded) == "Test content 123"
+
+    def test_legacy_json_payload(self):
+        decoded = deserialize_message(json.dumps({'id': "sub-1", 'content': "legacy 1"}).encode('utf-8'))
+
+        assert decoded == {'id': "sub-1", 'content': "legacy 1"}
+
+    def test_empty_payload(self):
+        assert deserialize_message(None) is None
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            get_serializer("avro")
@@ -0,0 +1,144 @@
+import json
+import logging
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import text
+from benchmarks.asgi_client import AsgiClient
+from processor_app.admin_service import admin_route
+from processor_app.admin_service.admin_service import AdminService
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.content_processor_service.request.content_request import ContentSubmissionRequest
+from processor_app.jobs.revalidator import SubmissionRevalidator
+from processor_app.metrics.sql_instrumentation import (
+    OTHER_FINGERPRINT, SQL_STATS, SqlStatementStats, fingerprint
+)
+from processor_app.repositories.processor_repository import ProcessorRepository
+from processor_app.validators import ContentValidator
+
+
+@pytest.fixture
+def sql_stats():
+    SQL_STATS.reset()
+    yield SQL_STATS
+    SQL_STATS.reset()
+
+
+@pytest.fixture
+async def content_repo(sql_stats):
+    # Not the shared sqlite_repo: this one needs the instrumented pool
+    repo = ProcessorRepository("sqlite+aiosqlite:///:memory:", instrument=True)
+    await repo.init_db()
+    yield ContentProcessorRepository(repo, search_enabled=False)
+    await repo.engine.dispose()
+
+
+class TestFingerprint:
+
+    def test_literals_and_placeholders_collapse(self):
+        assert fingerprint("SELECT * FROM t WHERE id = 'a''b' AND n > 42") == \
+            fingerprint("SELECT *  FROM t\nWHERE id = ? AND n > :limit_1")
+
+    def test_lists_of_any_length_collapse(self):
+        assert fingerprint("SELECT a FROM t WHERE id IN (?, ?, ?)") == "SELECT a FROM t WHERE id IN (?)"
+        assert fingerprint("INSERT INTO t (a, b) VALUES (?, ?), (?, ?)") == "INSERT INTO t (a, b) VALUES (?)..."
+
+    def test_casts_and_identifiers_are_kept(self):
+        assert fingerprint("SELECT t1.a::text FROM t1") == "SELECT t1.a::text FROM t1"
+
+
+class TestSqlStatementStats:
+
+    def test_top_orders_by_total_p99_and_count(self):
+        stats = SqlStatementStats(slow_query_ms=0)
+        for _ in range(10):
+            stats.record("SELECT a FROM frequent", 0.001)
+        stats.record("SELECT a FROM spiky", 0.002)
+        stats.record("SELECT a FROM spiky", 0.030)
+        for _ in range(3):
+            stats.record("SELECT a FROM steady", 0.005)
+
+        def order(order_by):
+            return [row['fingerprint'].rsplit(" ", 1)[1] for row in stats.top(order_by=order_by)]
+
+        assert order('total') == ["spiky", "steady", "frequent"]
+        assert order('p99') == ["spiky", "steady", "frequent"]
+        assert order('count') == ["frequent", "steady", "spiky"]
+        assert stats.top(limit=1, order_by='count')[0]['total_ms'] == pytest.approx(10.0)
+
+    def test_fingerprints_beyond_the_cap_share_one_row(self):
+        stats = SqlStatementStats(slow_query_ms=0, max_fingerprints=2)
+        for table in ("a", "b", "c", "d"):
+            stats.record(f"SELECT x FROM {table}", 0.001)
+
+        rows = {row['fingerprint']: row['count'] for row in stats.top()}
+        assert rows == {"SELECT x FROM a": 1, "SELECT x FROM b": 1, OTHER_FINGERPRINT: 2}
+
+    def test_slow_statements_are_logged(self, caplog):
+        stats = SqlStatementStats(slow_query_ms=10)
+
+        with caplog.at_level(logging.WARNING, logger="processor_app.metrics.sql_instrumentation"):
+            stats.record("SELECT fast FROM t", 0.001)
+            stats.record("SELECT slow FROM t WHERE id = 7", 0.050)
+
+        assert [record.getMessage() for record in caplog.records] == \
+            ["Slow SQL (50.0 ms): SELECT slow FROM t WHERE id = ?"]
+
+
+class TestEngineInstrumentation:
+
+    @pytest.mark.asyncio
+    async def test_repository_statements_and_checkouts_are_recorded(self, content_repo, sql_stats):
+        # The gauge is process wide; other tests' engines may still hold connections
+        in_use = sql_stats.connections_in_use
+        created = await content_repo.create(ContentSubmissionRequest(content="timed content 1"))
+        await content_repo.get_by_id(created.id)
+
+        fingerprints = [row['fingerprint'] for row in sql_stats.top(limit=100)]
+        assert any(item.startswith("INSERT INTO submissions ") for item in fingerprints)
+        assert any(item.startswith("SELECT ") and "FROM submissions" in item for item in fingerprints)
+        pool = sql_stats.pool()
+        assert pool['checkouts'] > 0
+        assert pool['connections_in_use'] == in_use
+
+    @pytest.mark.asyncio
+    async def test_failed_statements_do_not_skew_timings(self, content_repo, sql_stats):
+        async with content_repo.repo.get_session() as session:
+            with pytest.raises(Exception):
+                await session.execute(text("SELECT * FROM missing_table"))
+            await session.execute(text("SELECT 1"))
+
+        fingerprints = [row['fingerprint'] for row in sql_stats.top(limit=100)]
+        assert "SELECT ?" in fingerprints
+        assert not any("missing_table" in item for item in fingerprints)
+
+
+class TestAdminSqlEndpoints:
+
+    @pytest.fixture
+    def client(self, content_repo, monkeypatch):
+        monkeypatch.setattr(admin_route, 'ADMIN_TOKEN', 'secret')
+        app = FastAPI()
+        app.include_router(admin_route.router)
+        revalidator = SubmissionRevalidator(content_repo, ContentValidator())
+        app.state.admin_service = AdminService(content_repo, revalidator)
+        return AsgiClient(app)
+
+    @pytest.mark.asyncio
+    async def test_top_statements_and_reset(self, client, content_repo):
+        headers = {'X-Admin-Token': 'secret'}
+        await content_repo.create(ContentSubmissionRequest(content="listed content 1"))
+
+        status, _, body = await client.request('GET', '/api/admin/sql/top?limit=2&order_by=p99', headers=headers)
+        payload = json.loads(body)
+        assert status == 200
+        assert payload['order_by'] == 'p99'
+        assert 0 < len(payload['statements']) <= 2
+        assert payload['pool']['checkouts'] > 0
+
+        status, _, _ = await client.request('GET', '/api/admin/sql/top?order_by=mean', headers=headers)
+        assert status == 422
+
+        status, _, _ = await client.request('DELETE', '/api/admin/sql/stats', headers=headers)
+        assert status == 204
+        _, _, body = await client.request('GET', '/api/admin/sql/top', headers=headers)
+        assert json.loads(body)['statements'] == []
@@ -0,0 +1,106 @@
+import struct
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, AsyncMock
+from processor_app.consumers.submission_processor import SubmissionProcessor
+from processor_app.content_processor_service.schema import Submission, SubmissionStatus
+from processor_app.metrics.stage_trace import StageLatencyWindow, StageTrace
+from processor_app.serializers import BinaryMessageSerializer
+
+
+def _epoch_ms(dt: datetime) -> float:
+    return dt.replace(tzinfo=timezone.utc).timestamp() * 1000
+
+
+class TestStageTrace:
+
+    def test_marks_are_relative_to_created_at(self):
+        created_at = datetime(2024, 1, 1, 12, 0, 0)
+        trace = StageTrace(created_at)
+
+        trace.mark('published', _epoch_ms(created_at) + 15)
+        trace.mark('received', _epoch_ms(created_at + timedelta(seconds=2)))
+        trace.duration('validate', 0.0015)
+
+        assert trace.as_dict() == {'published': 15, 'received': 2000, 'validate_ms': 1.5}
+
+    def test_unknown_origin_skips_marks(self):
+        trace = StageTrace(None)
+        trace.mark('received')
+
+        assert trace.as_dict() == {}
+
+
+class TestStageLatencyWindow:
+
+    def test_percentiles_per_stage(self):
+        window = StageLatencyWindow(window_seconds=60, max_samples=1000)
+        for value in range(1, 101):
+            window.record('validate', value)
+
+        stats = window.percentiles()['validate']
+
+        assert stats['count'] == 100
+        assert stats['p50_ms'] == 51
+        assert stats['p99_ms'] == 99
+
+    def test_derived_stage_durations(self):
+        window = StageLatencyWindow(window_seconds=60, max_samples=1000)
+
+        window.record_trace({'published': 5, 'received': 1005, 'claimed': 1010, 'validate_ms': 0.2, 'completed': 1012})
+
+        stats = window.percentiles()
+        assert stats['scheduler_delay']['p50_ms'] == 1000
+        assert stats['claim']['p50_ms'] == 5
+        assert stats['end_to_end']['p50_ms'] == 1012
+
+    def test_expired_samples_are_dropped(self):
+        window = StageLatencyWindow(window_seconds=0, max_samples=1000)
+        window.record('validate', 1)
+
+        assert window.percentiles() == {}
+
+
+class TestProcessorTrace:
+
+    @pytest.mark.asyncio
+    async def test_trace_persisted_with_final_status(self):
+        repository = AsyncMock()
+        created_at = datetime.utcnow() - timedelta(seconds=3)
+        repository.get_by_id.return_value = Submission(
+            id="trace-1",
+            content="Trace content 12345",
+            status=SubmissionStatus.PENDING,
+            created_at=created_at
+        )
+        validator = Mock()
+        validator.validate.return_value = True
+        processor = SubmissionProcessor(repository, validator)
+
+        await processor.process_submission("trace-1", None, {'received': _epoch_ms(created_at) + 1000})
+
+        final_call = repository.update_status.call_args_list[-1]
+        trace = final_call.kwargs['trace']
+        assert trace['received'] == 1000
+        assert trace['claimed'] >= trace['received']
+        assert trace['completed'] >= trace['validated']
+        assert 'db_claim_ms' in trace and 'validate_ms' in trace
+
+
+class TestBinaryPublishedAt:
+
+    def test_published_at_round_trip(self):
+        serializer = BinaryMessageSerializer()
+
+        message = serializer.deserialize(serializer.serialize({'id': "s-1", 'content': "x", 'published_at': 1700000000123}))
+
+        assert message['published_at'] == 1700000000123
+
+    def test_decodes_schema_v1(self):
+        data = struct.pack('>BBBHBBI', 0xC5, 1, 1, 3, 0, 0, 2) + b"s-1hi"
+
+        message = BinaryMessageSerializer().deserialize(data)
+
+        assert message['id'] == "s-1"
+        assert bytes(message['content']) == b"hi"
+        assert 'published_at' not in message
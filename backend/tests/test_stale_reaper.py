@@ -0,0 +1,78 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock, AsyncMock
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.content_processor_service.schema import SubmissionStatus
+from processor_app.jobs.stale_reaper import StaleSubmissionReaper
+
+
+def _minutes_ago(minutes):
+    return datetime.utcnow() - timedelta(minutes=minutes)
+
+
+class TestStaleSubmissionReaper:
+
+    @pytest.mark.asyncio
+    async def test_resets_only_expired_claims(self, sqlite_repo, insert_submission):
+        producer = Mock()
+        producer.is_available.return_value = True
+        content_repo = ContentProcessorRepository(sqlite_repo, producer)
+        await insert_submission("stale", SubmissionStatus.PROCESSING, processing_started_at=_minutes_ago(10))
+        await insert_submission("active", SubmissionStatus.PROCESSING, processing_started_at=_minutes_ago(1))
+        await insert_submission("done", SubmissionStatus.PASSED, processing_started_at=_minutes_ago(10))
+        reaper = StaleSubmissionReaper(content_repo, timeout_minutes=5)
+
+        assert await reaper.reap_once() == 1
+
+        assert (await content_repo.get_by_id("stale")).status == SubmissionStatus.PENDING
+        assert (await content_repo.get_by_id("active")).status == SubmissionStatus.PROCESSING
+        assert (await content_repo.get_by_id("done")).status == SubmissionStatus.PASSED
+        producer.produce.assert_called_once_with("stale", "content stale 123")
+        assert reaper.reaped_total == 1
+        assert reaper.requeued_total == 1
+
+    @pytest.mark.asyncio
+    async def test_reset_to_failed(self, sqlite_repo, insert_submission):
+        content_repo = ContentProcessorRepository(sqlite_repo)
+        await insert_submission("stale", SubmissionStatus.PROCESSING, processing_started_at=_minutes_ago(10))
+        reaper = StaleSubmissionReaper(content_repo, timeout_minutes=5, reset_status=SubmissionStatus.FAILED)
+
+        await reaper.reap_once()
+
+        stale = await content_repo.get_by_id("stale")
+        assert stale.status == SubmissionStatus.FAILED
+        assert stale.processed_at is not None
+        assert reaper.requeued_total == 0
+
+    @pytest.mark.parametrize("reset_status", ["RETRY", "PASSED", "pending"])
+    def test_rejects_invalid_reset_status(self, reset_status):
+        with pytest.raises(ValueError, match="REAPER_RESET_STATUS"):
+            StaleSubmissionReaper(AsyncMock(), reset_status=reset_status)
+
+    def test_reset_status_from_config_string(self):
+        assert StaleSubmissionReaper(AsyncMock(), reset_status="FAILED").reset_status == SubmissionStatus.FAILED
+
+    @pytest.mark.asyncio
+    async def test_drains_in_batches(self):
+        repository = AsyncMock()
+        repository.reap_stale.side_effect = [["a", "b"], ["c"]]
+        reaper = StaleSubmissionReaper(repository, batch_size=2)
+
+        assert await reaper.reap_once() == 3
+        assert repository.reap_stale.call_count == 2
+        assert repository.requeue.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_start_and_shutdown(self):
+        repository = AsyncMock()
+        repository.reap_stale.return_value = []
+        reaper = StaleSubmissionReaper(repository, interval_seconds=0.01)
+
+        await reaper.start()
+        await asyncio.sleep(0.05)
+        assert await reaper.is_running()
+        await reaper.shutdown()
+
+        assert not await reaper.is_running()
+        assert reaper.runs_total >= 1
@@ -0,0 +1,176 @@
+import pytest
+import sqlalchemy
+from unittest.mock import Mock, AsyncMock, patch
+from sqlalchemy import select, func
+from processor_app.consumers.submission_processor import SubmissionProcessor
+from processor_app.content_processor_service.content_processor_repository import ContentProcessorRepository
+from processor_app.content_processor_service.content_digest import compute_digest
+from processor_app.content_processor_service.request.content_request import ContentSubmissionRequest
+from processor_app.content_processor_service.schema import Submission, SubmissionStatus, ContentBlob
+from processor_app.validators.content_validator import ContentValidator
+from processor_app.validators.validation_cache import ValidationCache
+
+
+class TestValidationCache:
+
+    @pytest.mark.asyncio
+    async def test_memory_hit_skips_repository(self):
+        repository = AsyncMock()
+        repository.get_cached_verdict.return_value = None
+        cache = ValidationCache(repository, max_size=10)
+
+        await cache.put("abc", "1", True)
+
+        assert await cache.get("abc", "1") is True
+        assert not repository.get_cached_verdict.called
+        repository.save_verdict.assert_called_with("abc", "1", True)
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_table(self):
+        repository = AsyncMock()
+        repository.get_cached_verdict.return_value = False
+        cache = ValidationCache(repository, max_size=10)
+
+        assert await cache.get("abc", "1") is False
+        assert await cache.get("abc", "1") is False
+        assert repository.get_cached_verdict.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self):
+        repository = AsyncMock()
+        repository.get_cached_verdict.return_value = None
+        cache = ValidationCache(repository, max_size=2)
+
+        await cache.put("a", "1", True)
+        await cache.put("b", "1", True)
+        await cache.get("a", "1")
+        await cache.put("c", "1", True)
+
+        assert ("b", "1") not in cache._entries
+        assert ("a", "1") in cache._entries
+
+    @pytest.mark.asyncio
+    async def test_persist_failure_is_not_fatal(self):
+        repository = AsyncMock()
+        repository.save_verdict.side_effect = Exception("DB Error")
+        cache = ValidationCache(repository, max_size=10)
+
+        await cache.put("abc", "1", True)
+
+        assert cache._entries[("abc", "1")] is True
+
+
+class TestCachedVerdictShortCircuit:
+
+    @pytest.mark.asyncio
+    async def test_cached_verdict_skips_validator(self):
+        repository = AsyncMock()
+        submission = Submission(
+            id="cached-1",
+            content="Some content 12345",
+            content_digest="digest",
+            status=SubmissionStatus.PENDING
+        )
+        repository.get_by_id.return_value = submission
+        validator = Mock()
+        validator.version = "1"
+        cache = Mock()
+        cache.get = AsyncMock(return_value=True)
+        processor = SubmissionProcessor(repository, validator, cache)
+
+        assert await processor.process_submission("cached-1", submission.content)
+
+        assert not validator.validate.called
+        assert repository.update_status.call_count == 1
+        assert repository.update_status.call_args[0][1] == SubmissionStatus.PASSED
+
+    @pytest.mark.asyncio
+    async def test_cache_miss_validates_and_stores(self):
+        repository = AsyncMock()
+        submission = Submission(
+            id="miss-1",
+            content="Some content 12345",
+            content_digest="digest",
+            status=SubmissionStatus.PENDING
+        )
+        repository.get_by_id.return_value = submission
+        validator = Mock()
+        validator.version = "1"
+        validator.validate.return_value = True
+        cache = Mock()
+        cache.get = AsyncMock(return_value=None)
+        cache.put = AsyncMock()
+        processor = SubmissionProcessor(repository, validator, cache)
+
+        await processor.process_submission("miss-1", submission.content)
+
+        assert validator.validate.called
+        cache.put.assert_called_with("digest", "1", True)
+
+
+class TestContentDigestStorage:
+
+    @pytest.mark.asyncio
+    async def test_create_stores_digest(self, sqlite_repo):
+        content_repo = ContentProcessorRepository(sqlite_repo)
+
+        created = await content_repo.create(ContentSubmissionRequest(content="Digest me 123"))
+        loaded = await content_repo.get_by_id(created.id)
+
+        assert loaded.content_digest == compute_digest("Digest me 123")
+        assert loaded.content == "Digest me 123"
+
+    @pytest.mark.asyncio
+    async def test_dedup_mode_shares_one_blob(self, sqlite_repo):
+        content_repo = ContentProcessorRepository(sqlite_repo, dedup_enabled=True)
+
+        first = await content_repo.create(ContentSubmissionRequest(content="Same content 123"))
+        second = await content_repo.create(ContentSubmissionRequest(content="Same content 123"))
+
+        assert first.content == "Same content 123"
+        assert (await content_repo.get_by_id(second.id)).content == "Same content 123"
+        assert [s.content for s in await content_repo.get_pending()] == ["Same content 123"] * 2
+
+        async with sqlite_repo.get_session() as session:
+            blob_count = (await session.execute(select(func.count()).select_from(ContentBlob))).scalar()
+            stored = (await session.execute(select(Submission._content))).scalars().all()
+        assert blob_count == 1
+        assert stored == [None, None]
+
+    @pytest.mark.asyncio
+    async def test_processor_does_not_reload_handed_in_content(self, sqlite_repo):
+        # Claim-checked content is batch-loaded by the consumer; the status lookup must not fetch the blob again
+        content_repo = ContentProcessorRepository(sqlite_repo, dedup_enabled=True)
+        created = await content_repo.create(ContentSubmissionRequest(content="Claimed content 123"))
+        processor = SubmissionProcessor(content_repo, ContentValidator())
+
+        hydrate = AsyncMock(wraps=ContentProcessorRepository._hydrate_content)
+        with patch.object(ContentProcessorRepository, '_hydrate_content', hydrate):
+            assert await processor.process_submission(created.id, "Claimed content 123") is True
+            assert not hydrate.called
+            assert (await content_repo.get_by_id(created.id)).status == SubmissionStatus.PASSED
+            assert hydrate.called
+
+    @pytest.mark.asyncio
+    async def test_status_lookup_refuses_content_access(self, sqlite_repo):
+        content_repo = ContentProcessorRepository(sqlite_repo)
+        created = await content_repo.create(ContentSubmissionRequest(content="Metadata only 123"))
+
+        loaded = await content_repo.get_by_id(created.id, with_content=False)
+
+        assert loaded.status == SubmissionStatus.PENDING
+        assert loaded.content_digest == compute_digest("Metadata only 123")
+        with pytest.raises(sqlalchemy.exc.SQLAlchemyError):
+            loaded.content
+
+    @pytest.mark.asyncio
+    async def test_verdict_round_trip(self, sqlite_repo):
+        content_repo = ContentProcessorRepository(sqlite_repo)
+        cache = ValidationCache(content_repo, max_size=10)
+        version = ContentValidator.version
+
+        assert await cache.get("digest", version) is None
+        await cache.put("digest", version, False)
+        await cache.put("digest", version, True)
+
+        assert await ValidationCache(content_repo, max_size=10).get("digest", version) is True
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+from processor_app.consumers.fastapi_poll import FastAPIPoll
+from processor_app.content_processor_service.schema import Submission, SubmissionStatus
+from processor_app.metrics.stage_trace import StageLatencyWindow
+from processor_app.worker import Worker, main
+
+
+def _consumer():
+    consumer = Mock()
+    consumer.start = AsyncMock()
+    consumer.drain = AsyncMock()
+    consumer.is_running = AsyncMock(return_value=True)
+    return consumer
+
+
+@pytest.fixture
+def patched_factory():
+    repository = Mock()
+    repository.init_db = AsyncMock()
+    with patch('processor_app.worker.Factory') as factory, patch('processor_app.worker.USE_KAFKA', True), \
+            patch('processor_app.worker.ContentProcessorRepository') as content_repository:
+        content_repository.return_value.backfill_status_counters = AsyncMock()
+        factory.get_repository.return_value = repository
+        factory.get_consumer.side_effect = lambda *_: _consumer()
+        yield factory
+
+
+class TestWorker:
+
+    @pytest.mark.asyncio
+    async def test_starts_one_consumer_per_loop(self, patched_factory):
+        worker = Worker(concurrency=3, health_port=0)
+
+        await worker.start()
+
+        assert len(worker.consumers) == 3
+        assert all(c.start.called for c in worker.consumers)
+        assert (await worker.health())["status"] == "ok"
+
+    @pytest.mark.asyncio
+    async def test_stop_drains_every_consumer(self, patched_factory):
+        worker = Worker(concurrency=2, health_port=0, drain_timeout=7)
+        run = asyncio.create_task(worker.run())
+        await asyncio.sleep(0.05)
+
+        worker.stop()
+        await run
+
+        for consumer in worker.consumers:
+            consumer.drain.assert_called_once_with(7)
+        assert (await worker.health())["status"] == "draining"
+
+    @pytest.mark.asyncio
+    async def test_health_endpoint_reports_stopped_consumer(self, patched_factory, unused_tcp_port):
+        worker = Worker(concurrency=2, health_port=unused_tcp_port, health_host="127.0.0.1")
+        await worker.start()
+        worker.consumers[1].is_running.return_value = False
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", unused_tcp_port)
+        writer.write(b"GET /health HTTP/1.0\r\n\r\n")
+        response = await reader.read()
+        writer.close()
+        await worker.drain()
+
+        head, _, body = response.partition(b"\r\n\r\n")
+        assert head.startswith(b"HTTP/1.0 503")
+        assert json.loads(body) == {"status": "degraded", "consumers": 2, "running": 1}
+
+    def test_polling_mode_runs_single_loop(self):
+        with patch('processor_app.worker.USE_KAFKA', False):
+            assert Worker(concurrency=4, health_port=0).concurrency == 1
+
+    @pytest.mark.asyncio
+    async def test_trace_stats_endpoint_reports_this_process(self, patched_factory, unused_tcp_port):
+        worker = Worker(concurrency=1, health_port=unused_tcp_port, health_host="127.0.0.1")
+        await worker.start()
+        window = StageLatencyWindow()
+        window.record('validate', 12.5)
+
+        with patch('processor_app.worker.STAGE_LATENCY', window):
+            reader, writer = await asyncio.open_connection("127.0.0.1", unused_tcp_port)
+            writer.write(b"GET /trace-stats HTTP/1.0\r\n\r\n")
+            response = await reader.read()
+            writer.close()
+        await worker.drain()
+
+        head, _, body = response.partition(b"\r\n\r\n")
+        assert head.startswith(b"HTTP/1.0 200")
+        assert json.loads(body)["stages"]["validate"]["p50_ms"] == 12.5
+
+    def test_uncoordinated_polling_refuses_several_processes(self):
+        with patch('processor_app.worker.USE_KAFKA', False), \
+                patch('processor_app.worker.POLL_COORDINATION', 'none'), \
+                patch('processor_app.worker.run_processes') as run_processes:
+            with pytest.raises(SystemExit):
+                main(['--processes', '2'])
+        run_processes.assert_not_called()
+
+    def test_coordinated_polling_runs_several_processes(self):
+        with patch('processor_app.worker.USE_KAFKA', False), \
+                patch('processor_app.worker.POLL_COORDINATION', 'lease'), \
+                patch('processor_app.worker.run_processes', return_value=0) as run_processes:
+            assert main(['--processes', '2', '--health-port', '0']) == 0
+        assert run_processes.call_args[0][0] == 2
+
+
+class TestConsumerDrain:
+
+    @pytest.mark.asyncio
+    async def test_poll_drain_waits_for_in_flight_submission(self):
+        repository = AsyncMock()
+        submission = Submission(id="drain-1", content="Drain me 123", status=SubmissionStatus.PENDING)
+        repository.get_pending.return_value = [submission]
+        repository.get_by_id.return_value = submission
+        validator = Mock()
+        validator.validate.return_value = True
+        consumer = FastAPIPoll(repository, validator, poll_interval=10, processing_delay=0.05)
+
+        await consumer.start()
+        await asyncio.sleep(0.01)
+        await consumer.drain(timeout=5)
+
+        assert not consumer._in_flight
+        final = repository.update_status.call_args_list[-1]
+        assert final[0][1] == SubmissionStatus.PASSED